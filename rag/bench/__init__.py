@@ -0,0 +1,3 @@
+"""
+Benchmarks for RAG system components.
+"""
@@ -0,0 +1,172 @@
+"""Chunking benchmark suite across all ChunkerFactory strategies.
+
+Every chunker runs on a synthetic corpus of increasing size. For each size the
+suite records throughput, peak Python memory and the chunk size distribution,
+and per chunker it estimates how run time scales with input size, so that a
+quadratic regression shows up as a scaling exponent close to 2.
+
+Run with:
+    python -m rag.bench.chunking --sizes 10000 100000 1000000 --output chunking.json
+    python -m rag.bench.chunking --max-exponent 1.5   # exit code 1 on super-linear scaling
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from rag.bench.corpora import CORPORA
+from rag.chunking.chunker_factory import ChunkerFactory
+from rag.core.models import Document
+
+# Corpus and constructor arguments used for each chunker type
+CHUNKER_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "token": {"corpus": "text", "kwargs": {"chunk_size": 1000, "chunk_overlap": 200}},
+    "recursive": {"corpus": "text", "kwargs": {"chunk_size": 1000, "chunk_overlap": 200}},
+    "markdown": {"corpus": "markdown", "kwargs": {}},
+    "html": {"corpus": "html", "kwargs": {}},
+    "page": {"corpus": "paged", "kwargs": {"min_page_size": 200}},
+}
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+def _percentile(sorted_values: Sequence[int], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return float(sorted_values[index])
+
+def chunk_size_distribution(sizes: List[int]) -> Dict[str, float]:
+    """Summarize chunk sizes (in characters)."""
+    ordered = sorted(sizes)
+    return {
+        "count": len(ordered),
+        "min": float(ordered[0]) if ordered else 0.0,
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": _percentile(ordered, 0.5),
+        "p95": _percentile(ordered, 0.95),
+        "max": float(ordered[-1]) if ordered else 0.0,
+    }
+
+def measure(chunker_type: str, size: int, repeat: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """Benchmark one chunker on one corpus size."""
+    config = CHUNKER_CONFIGS[chunker_type]
+    content = CORPORA[config["corpus"]](size, seed=seed)
+    source = f"bench.{config['corpus']}"
+    document = Document(id="bench", content=content, metadata={}, source=source)
+    chunker = ChunkerFactory.get_chunker(chunker_type, **config["kwargs"])
+
+    timings = []
+    chunks = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = chunker.chunk(document)
+        timings.append(time.perf_counter() - start)
+
+    # Memory is measured in a separate run since tracing slows down execution
+    tracemalloc.start()
+    try:
+        chunker.chunk(document)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "chunker": chunker_type,
+        "corpus": config["corpus"],
+        "characters": len(content),
+        "best_seconds": best,
+        "mean_seconds": sum(timings) / len(timings),
+        "chars_per_second": len(content) / best if best else None,
+        "peak_memory_bytes": peak,
+        "chunk_sizes": chunk_size_distribution([len(chunk.content) for chunk in chunks]),
+    }
+
+def scaling_exponent(results: List[Dict[str, Any]]) -> Optional[float]:
+    """Estimate k in time ~ size**k from the smallest and largest corpus.
+
+    Linear chunkers are close to 1, quadratic ones approach 2.
+    """
+    if len(results) < 2:
+        return None
+    smallest = min(results, key=lambda result: result["characters"])
+    largest = max(results, key=lambda result: result["characters"])
+    if smallest["best_seconds"] <= 0 or largest["characters"] == smallest["characters"]:
+        return None
+    return (math.log(largest["best_seconds"] / smallest["best_seconds"])
+            / math.log(largest["characters"] / smallest["characters"]))
+
+def run(chunkers: Optional[List[str]] = None, sizes: Optional[List[int]] = None,
+        repeat: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """Run the benchmark suite and return a JSON-serializable report."""
+    chunkers = chunkers or list(CHUNKER_CONFIGS)
+    sizes = sizes or DEFAULT_SIZES
+
+    report: Dict[str, Any] = {
+        "benchmark": "chunking",
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "repeat": repeat,
+        "chunkers": {},
+    }
+    for chunker_type in chunkers:
+        results = [measure(chunker_type, size, repeat, seed) for size in sizes]
+        report["chunkers"][chunker_type] = {
+            "results": results,
+            "scaling_exponent": scaling_exponent(results),
+        }
+    return report
+
+def check_scaling(report: Dict[str, Any], max_exponent: float) -> List[str]:
+    """Return the chunkers whose scaling exponent exceeds max_exponent."""
+    return [
+        chunker_type
+        for chunker_type, entry in report["chunkers"].items()
+        if entry["scaling_exponent"] is not None and entry["scaling_exponent"] > max_exponent
+    ]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Chunking benchmark suite")
+    parser.add_argument("--chunkers", nargs="+", choices=list(CHUNKER_CONFIGS), default=None)
+    parser.add_argument("--sizes", nargs="+", type=int, default=None,
+                        help="Corpus sizes in characters")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--max-exponent", type=float, default=None,
+                        help="Fail if any chunker scales worse than size**max_exponent")
+    args = parser.parse_args(argv)
+
+    report = run(args.chunkers, args.sizes, args.repeat, args.seed)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    for chunker_type, entry in report["chunkers"].items():
+        largest = entry["results"][-1]
+        exponent = entry["scaling_exponent"]
+        print(f"{chunker_type:>10}: {largest['chars_per_second'] / 1e6:8.2f} MB/s at "
+              f"{largest['characters']} chars, peak {largest['peak_memory_bytes'] / 1e6:.1f} MB, "
+              f"scaling exponent {exponent if exponent is None else round(exponent, 2)}",
+              file=sys.stderr)
+
+    if args.max_exponent is not None:
+        regressions = check_scaling(report, args.max_exponent)
+        if regressions:
+            print(f"Super-linear scaling detected: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
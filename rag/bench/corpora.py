@@ -0,0 +1,167 @@
+"""Synthetic corpora for benchmarks.
+
+All generators are deterministic for a given seed and produce roughly
+``size`` characters, so runs are comparable across machines and commits.
+"""
+
+import random
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from rag.core.models import Document
+
+VOCABULARY = [
+    "revenue", "balance", "quarter", "asset", "liability", "report", "the", "of",
+    "and", "income", "cash", "flow", "growth", "margin", "invoice", "customer",
+    "contract", "payment", "tax", "depreciation", "forecast", "budget", "audit",
+]
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(VOCABULARY) for _ in range(words))
+    return text.capitalize() + "."
+
+def _paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return " ".join(_sentence(rng, rng.randint(6, 18)) for _ in range(sentences))
+
+def generate_text(size: int, seed: int = 0) -> str:
+    """Plain text made of paragraphs separated by blank lines."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        paragraph = _paragraph(rng, rng.randint(2, 8))
+        parts.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(parts)
+
+def generate_markdown(size: int, seed: int = 0) -> str:
+    """Markdown with nested headers, lists and small tables."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    section = 0
+    while length < size:
+        section += 1
+        block = [f"# Chapter {section}", _paragraph(rng)]
+        for sub in range(1, rng.randint(2, 4)):
+            block.append(f"## Section {section}.{sub}")
+            block.append(_paragraph(rng))
+            block.append("\n".join(f"- {_sentence(rng, 5)}" for _ in range(3)))
+            if rng.random() < 0.3:
+                block.append("| Item | Amount |\n| --- | --- |\n" + "\n".join(
+                    f"| {rng.choice(VOCABULARY)} | {rng.randint(1, 10000)} |" for _ in range(4)
+                ))
+        text = "\n\n".join(block)
+        parts.append(text)
+        length += len(text) + 2
+    return "\n\n".join(parts)
+
+def generate_html(size: int, seed: int = 0) -> str:
+    """HTML with h1/h2/h3 headers and paragraphs."""
+    rng = random.Random(seed)
+    parts = ["<html><body>"]
+    length = 0
+    section = 0
+    while length < size:
+        section += 1
+        block = [f"<h1>Chapter {section}</h1>", f"<p>{_paragraph(rng)}</p>"]
+        for sub in range(1, rng.randint(2, 4)):
+            block.append(f"<h2>Section {section}.{sub}</h2>")
+            block.append(f"<p>{_paragraph(rng)}</p>")
+            block.append(f"<h3>Details</h3><p>{_paragraph(rng, 2)}</p>")
+        text = "\n".join(block)
+        parts.append(text)
+        length += len(text) + 1
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+def generate_paged_text(size: int, seed: int = 0, page_size: int = 2500) -> str:
+    """PDF-like text with pages separated by mixed page break markers."""
+    rng = random.Random(seed)
+    separators = ["\f", "\n\n---\n\n", "\n\nPage "]
+    parts = []
+    length = 0
+    page = 0
+    while length < size:
+        if page:
+            parts.append(separators[page % len(separators)])
+        words = []
+        page_length = 0
+        while page_length < page_size:
+            word = rng.choice(VOCABULARY)
+            words.append(word)
+            page_length += len(word) + 1
+        text = " ".join(words)
+        parts.append(text)
+        length += len(text)
+        page += 1
+    return "".join(parts)
+
+def generate_paged_document(pages: int, words_per_page: int = 400, seed: int = 0) -> Document:
+    """Generate a synthetic document with exactly ``pages`` pages."""
+    rng = random.Random(seed)
+    separators = ["\f", "\n\n---\n\n", "\n\nPage "]
+    parts = []
+    for page in range(pages):
+        if page:
+            parts.append(separators[page % len(separators)])
+        parts.append(" ".join(rng.choice(VOCABULARY) for _ in range(words_per_page)))
+    return Document(id="bench", content="".join(parts), metadata={}, source="bench.txt")
+
+ATTRIBUTES = [
+    "budget", "revenue", "margin", "forecast", "tax rate", "headcount", "audit score", "growth"
+]
+SYLLABLES = ["ka", "lo", "mir", "ven", "to", "sa", "rel", "dun", "pi", "gor", "na", "thu"]
+
+def _entity_name(rng: random.Random, taken: Set[str]) -> str:
+    while True:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if name not in taken:
+            taken.add(name)
+            return name
+
+def generate_labelled_corpus(documents: int = 5, pages: int = 10, facts_per_page: int = 2,
+                             words_per_page: int = 300, seed: int = 0
+                             ) -> Tuple[List[Document], List[Dict[str, Any]]]:
+    """Generate pages with known facts and one question per fact.
+
+    Every page hides ``facts_per_page`` sentences of the form "The budget of
+    Kalomir is 4711." in filler text. Entity names are unique, so each
+    question has exactly one page that answers it.
+
+    Returns:
+        Tuple of (pages, questions): one Document per page with "source" and
+        "page_number" (1-based) metadata, and dicts with "question",
+        "source" and "page"
+    """
+    rng = random.Random(seed)
+    taken: Set[str] = set()
+    corpus = []
+    questions = []
+    for document in range(documents):
+        source = f"report_{document + 1:03d}.txt"
+        for page in range(1, pages + 1):
+            words = [rng.choice(VOCABULARY) for _ in range(words_per_page)]
+            sentences = [
+                " ".join(words[i:i + 15]).capitalize() + "." for i in range(0, len(words), 15)
+            ]
+            for _ in range(facts_per_page):
+                entity = _entity_name(rng, taken)
+                attribute = rng.choice(ATTRIBUTES)
+                sentences.insert(rng.randint(0, len(sentences)),
+                                 f"The {attribute} of {entity} is {rng.randint(10, 99999)}.")
+                questions.append({"question": f"What is the {attribute} of {entity}?",
+                                  "source": source, "page": page})
+            corpus.append(Document(
+                id=f"{source}#{page}",
+                content=" ".join(sentences),
+                metadata={"source": source, "page_number": page},
+                source=source
+            ))
+    return corpus, questions
+
+CORPORA: Dict[str, Callable[..., str]] = {
+    "text": generate_text,
+    "markdown": generate_markdown,
+    "html": generate_html,
+    "paged": generate_paged_text,
+}
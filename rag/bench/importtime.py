@@ -0,0 +1,160 @@
+"""Start-up cost of the CLI, from ``python -X importtime``.
+
+Every module is imported in a fresh interpreter with ``-X importtime``; the
+per-module times it writes to stderr are parsed into a report of the total
+import time, the slowest modules and the heavy subsystems that were pulled
+in. The report also times a complete ``rag --help`` run.
+
+Run with:
+    python -m rag.bench.importtime --repeat 5 --output importtime.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_MODULES = ["rag.cli.main"]
+
+# Subsystems that take long to import and belong inside the commands using them
+HEAVY_MODULES = (
+    "chromadb",
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "litellm",
+    "openai",
+    "pdfplumber",
+    "onnxruntime",
+    "sentence_transformers",
+    "torch",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Parse ``-X importtime`` output.
+
+    Args:
+        output: stderr of an interpreter run with ``-X importtime``
+
+    Returns:
+        One entry per imported module, in import order, with its own and
+        cumulative import time in microseconds and its nesting depth
+    """
+    entries = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                # Nested imports are indented by two spaces per level
+                "depth": (len(indent) - 1) // 2,
+            })
+    return entries
+
+def heavy_imports(
+    entries: Sequence[Dict[str, Any]], heavy: Sequence[str] = HEAVY_MODULES
+) -> List[str]:
+    """Heavy top-level packages among the imported modules."""
+    imported = {entry["module"].split(".")[0] for entry in entries}
+    return [name for name in heavy if name in imported]
+
+def _run_python(args: List[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    # Importing litellm would otherwise fetch the model cost map over the network
+    env.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+def measure(module: str, repeat: int = 3, top: int = 15) -> Dict[str, Any]:
+    """Import time of a module in fresh interpreters.
+
+    Args:
+        module: Module to import
+        repeat: Interpreters to start; the fastest run is reported
+        top: Number of slowest modules to list
+
+    Returns:
+        JSON-serializable result of the module
+    """
+    runs = []
+    for _ in range(max(1, repeat)):
+        result = _run_python(["-X", "importtime", "-c", f"import {module}"])
+        runs.append(parse_importtime(result.stderr))
+    entries = min(runs, key=lambda run: _total_us(run, module))
+    slowest = sorted(entries, key=lambda entry: entry["self_us"], reverse=True)[:top]
+    return {
+        "module": module,
+        "total_seconds": _total_us(entries, module) / 1e6,
+        "runs_seconds": [_total_us(run, module) / 1e6 for run in runs],
+        "modules_imported": len(entries),
+        "heavy_imports": heavy_imports(entries),
+        "slowest_modules": [
+            {"module": entry["module"], "self_seconds": entry["self_us"] / 1e6,
+             "cumulative_seconds": entry["cumulative_us"] / 1e6}
+            for entry in slowest
+        ],
+    }
+
+def _total_us(entries: Sequence[Dict[str, Any]], module: str) -> int:
+    """Cumulative import time of the module's top-level package."""
+    package = module.split(".")[0]
+    return sum(entry["cumulative_us"] for entry in entries
+               if entry["depth"] == 0 and entry["module"].split(".")[0] == package)
+
+def time_command(args: List[str], repeat: int = 3) -> float:
+    """Fastest wall-clock seconds of a Python command, interpreter start included."""
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        _run_python(args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run(modules: Optional[List[str]] = None, repeat: int = 3, top: int = 15) -> Dict[str, Any]:
+    """Measure every module and the CLI help and return a JSON-serializable report."""
+    return {
+        "benchmark": "importtime",
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "modules": [measure(module, repeat, top) for module in modules or DEFAULT_MODULES],
+        "cli_help_seconds": time_command(["-m", "rag.cli.main", "--help"], repeat),
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Start-up cost of the rag CLI")
+    parser.add_argument("--modules", nargs="+", default=None,
+                        help="Modules to import (default: rag.cli.main)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.modules, args.repeat, args.top)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    for result in report["modules"]:
+        heavy = ", ".join(result["heavy_imports"]) or "none"
+        print(f"{result['module']}: {result['total_seconds'] * 1000:.0f} ms, "
+              f"{result['modules_imported']} modules, heavy: {heavy}", file=sys.stderr)
+    print(f"rag --help: {report['cli_help_seconds'] * 1000:.0f} ms", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
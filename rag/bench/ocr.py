@@ -0,0 +1,182 @@
+"""Local OCR benchmark against recorded Azure results.
+
+Runs TesseractOCRProcessor over a set of scans at one or more resolutions and
+reports throughput and, where a reference is available, the character and
+word error rates against Azure Document Intelligence. The reference is read
+from the OCR cache filled by previous `rag ingest --ocr` runs, so no network
+access is needed.
+
+Run with:
+    python -m rag.bench.ocr path/to/scans --dpi 200 300 --reference-cache data/ocr_cache.sqlite3
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+from rag.ingestion.ocr import OCR_FILE_EXTENSIONS
+from rag.ingestion.ocr_cache import OCRCache
+
+
+def edit_distance(reference: Sequence[Hashable], hypothesis: Sequence[Hashable]) -> int:
+    """Levenshtein distance between two sequences of characters or words.
+
+    Uses Hyyrö's bit-parallel algorithm with the whole DP column in one
+    Python integer, which keeps full pages (thousands of characters) fast.
+    """
+    if not reference:
+        return len(hypothesis)
+    if not hypothesis:
+        return len(reference)
+
+    match_masks: Dict[Hashable, int] = {}
+    for i, symbol in enumerate(reference):
+        match_masks[symbol] = match_masks.get(symbol, 0) | (1 << i)
+    mask = (1 << len(reference)) - 1
+    last = 1 << (len(reference) - 1)
+
+    positive, negative = mask, 0
+    distance = len(reference)
+    for symbol in hypothesis:
+        match = match_masks.get(symbol, 0)
+        vertical = match | negative
+        horizontal = ((((match & positive) + positive) & mask) ^ positive) | match
+        horizontal_positive = (negative | ~(horizontal | positive)) & mask
+        horizontal_negative = positive & horizontal
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+        horizontal_positive = ((horizontal_positive << 1) | 1) & mask
+        horizontal_negative = (horizontal_negative << 1) & mask
+        positive = (horizontal_negative | ~(vertical | horizontal_positive)) & mask
+        negative = horizontal_positive & vertical
+    return distance
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+def error_rates(reference: str, hypothesis: str) -> Dict[str, int]:
+    """Character and word edit counts of a hypothesis against a reference."""
+    reference, hypothesis = _normalize(reference), _normalize(hypothesis)
+    return {
+        "char_errors": edit_distance(reference, hypothesis),
+        "chars": len(reference),
+        "word_errors": edit_distance(reference.split(), hypothesis.split()),
+        "words": len(reference.split()),
+    }
+
+def load_reference(
+    cache: OCRCache, path: Path, model_id: str = "prebuilt-read"
+) -> Optional[Dict[int, str]]:
+    """Recorded Azure page texts of a file, keyed by page number."""
+    pages = cache.get_file(OCRCache.file_hash(path), model_id)
+    if pages is None:
+        return None
+    return {
+        page["page_number"]: "\n".join(line["content"] for line in page["lines"])
+        for page in pages
+    }
+
+def measure(paths: List[Path], dpi: int, references: Dict[str, Dict[int, str]],
+            max_workers: Optional[int] = None, lang: str = "eng") -> Dict[str, Any]:
+    """OCR all files at one resolution and compare them with the references."""
+    from rag.ingestion.local_ocr import TesseractOCRProcessor
+
+    processor = TesseractOCRProcessor(dpi=dpi, lang=lang, max_workers=max_workers)
+    totals = {"char_errors": 0, "chars": 0, "word_errors": 0, "words": 0}
+    pages = 0
+    start = time.perf_counter()
+    for response in processor.stream_pages(paths):
+        pages += 1
+        reference = references.get(response.source, {}).get(response.page_number)
+        if reference is not None:
+            for key, value in error_rates(reference, response.text).items():
+                totals[key] += value
+    seconds = time.perf_counter() - start
+
+    return {
+        "dpi": dpi,
+        "workers": processor.max_workers,
+        "pages": pages,
+        "seconds": seconds,
+        "pages_per_second": pages / seconds if seconds else None,
+        "compared_characters": totals["chars"],
+        "cer": totals["char_errors"] / totals["chars"] if totals["chars"] else None,
+        "wer": totals["word_errors"] / totals["words"] if totals["words"] else None,
+    }
+
+def run(paths: List[Path], dpis: List[int], cache: Optional[OCRCache] = None,
+        max_workers: Optional[int] = None, lang: str = "eng") -> Dict[str, Any]:
+    """Run the benchmark and return a JSON-serializable report."""
+    references = {}
+    if cache is not None:
+        for path in paths:
+            reference = load_reference(cache, path)
+            if reference is not None:
+                references[str(path)] = reference
+
+    return {
+        "benchmark": "ocr",
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "files": len(paths),
+        "files_with_reference": len(references),
+        "results": [measure(paths, dpi, references, max_workers, lang) for dpi in dpis],
+    }
+
+def _collect_files(inputs: List[str]) -> List[Path]:
+    paths = []
+    for value in inputs:
+        path = Path(value)
+        if path.is_dir():
+            paths.extend(sorted(
+                p for p in path.iterdir() if p.suffix.lower() in OCR_FILE_EXTENSIONS
+            ))
+        else:
+            paths.append(path)
+    return paths
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local OCR benchmark")
+    parser.add_argument("inputs", nargs="+", help="Scans or directories of scans")
+    parser.add_argument("--dpi", nargs="+", type=int, default=[300])
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--lang", default="eng", help="Tesseract language(s)")
+    parser.add_argument("--reference-cache", default=None,
+                        help="OCR cache with recorded Azure results to compare against")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    cache = OCRCache(args.reference_cache) if args.reference_cache else None
+    try:
+        report = run(_collect_files(args.inputs), args.dpi, cache, args.workers, args.lang)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    for result in report["results"]:
+        cer = "n/a" if result["cer"] is None else f"{result['cer']:.2%}"
+        wer = "n/a" if result["wer"] is None else f"{result['wer']:.2%}"
+        print(f"{result['dpi']:>4} DPI: {result['pages_per_second'] or 0:.2f} pages/s "
+              f"with {result['workers']} workers, CER {cer}, WER {wer}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
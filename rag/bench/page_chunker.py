@@ -0,0 +1,49 @@
+"""Throughput benchmark for PageWiseChunker on large multi-page documents.
+
+Run with:
+    python -m rag.bench.page_chunker --pages 1000 --repeat 5
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+from rag.bench.corpora import generate_paged_document
+from rag.chunking.page_wise_chunker import PageWiseChunker
+
+
+def run(pages: int = 1000, repeat: int = 5, words_per_page: int = 400) -> Dict[str, Any]:
+    """Chunk a generated document `repeat` times and report throughput."""
+    document = generate_paged_document(pages, words_per_page)
+    chunker = PageWiseChunker(min_page_size=100)
+
+    timings = []
+    chunk_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunk_count = len(chunker.chunk(document))
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {
+        "benchmark": "page_chunker",
+        "pages": pages,
+        "characters": len(document.content),
+        "chunks": chunk_count,
+        "best_seconds": best,
+        "mean_seconds": sum(timings) / len(timings),
+        "pages_per_second": pages / best if best else None,
+        "mb_per_second": len(document.content) / 1e6 / best if best else None,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--words-per-page", type=int, default=400)
+    args = parser.parse_args()
+    print(json.dumps(run(args.pages, args.repeat, args.words_per_page), indent=2))
+
+if __name__ == "__main__":
+    main()
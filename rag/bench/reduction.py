@@ -0,0 +1,177 @@
+"""Recall loss of embedding dimensionality reduction on our own data.
+
+Full-dimension vectors are taken from a collection's full vector sidecar or,
+for collections that store full vectors, from Chroma itself. A sample of them
+serves as queries: their exact top-k neighbours by cosine similarity are the
+reference, and the suite reports which fraction of them a reduced search
+finds, with and without re-scoring the candidates at full precision.
+
+Run with:
+    python -m rag.bench.reduction --dimensions 128 256 512 --output reduction.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from rag.embedding.reduction import REDUCTION_METHODS, create_reducer
+
+DEFAULT_DIMENSIONS = [128, 256, 512]
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores per row, best first."""
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+def _recall(found: np.ndarray, reference: np.ndarray) -> float:
+    hits = sum(len(np.intersect1d(row, expected)) for row, expected in zip(found, reference))
+    return hits / reference.size if reference.size else 0.0
+
+def measure(vectors: np.ndarray, reducer: Any, k: int = 10, queries: int = 200,
+            rescore_factor: int = 4, seed: int = 0) -> Dict[str, Any]:
+    """Recall@k of a reducer against exact full-dimension search.
+
+    Args:
+        vectors: (n, d) full-dimension vectors of the collection
+        reducer: Reducer to evaluate; unfitted reducers are fitted on vectors
+        k: Number of neighbours per query
+        queries: Number of collection vectors used as queries
+        rescore_factor: Candidates re-scored at full precision per result
+        seed: Seed for the query sample
+
+    Returns:
+        Recall with and without re-scoring and the size of the stored vectors
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    query_index = rng.choice(len(vectors), size=min(queries, len(vectors)), replace=False)
+    if not reducer.is_fitted:
+        reducer.fit(vectors)
+
+    full = _normalize(vectors)
+    reduced = reducer.transform(vectors)
+    rows = np.arange(len(query_index))
+
+    def search(matrix: np.ndarray, limit: int) -> np.ndarray:
+        scores = matrix[query_index] @ matrix.T
+        # A query vector is not its own neighbour
+        scores[rows, query_index] = -np.inf
+        return _top_k(scores, limit)
+
+    reference = search(full, k)
+    approximate = search(reduced, k)
+    candidates = search(reduced, k * rescore_factor)
+    full_scores = np.einsum("qd,qcd->qc", full[query_index], full[candidates])
+    rescored = np.take_along_axis(candidates, _top_k(full_scores, k), axis=1)
+
+    return {
+        "method": reducer.method,
+        "dimensions": reducer.dimensions,
+        "full_dimensions": vectors.shape[1],
+        "recall_at_k": _recall(approximate, reference),
+        "recall_at_k_rescored": _recall(rescored, reference),
+        "bytes_per_vector": reduced.shape[1] * reduced.itemsize,
+        "full_bytes_per_vector": vectors.shape[1] * vectors.itemsize,
+    }
+
+def load_vectors(persist_directory: str, collection_name: str = "rag_documents",
+                 limit: Optional[int] = None) -> np.ndarray:
+    """Load full-dimension vectors of a collection.
+
+    Prefers the full vector sidecar of a reduced collection and falls back
+    to the vectors stored in Chroma.
+    """
+    from rag.store.full_vector_store import FullVectorStore
+
+    sidecar = os.path.join(persist_directory, f"{collection_name}.full_vectors.sqlite3")
+    if os.path.exists(sidecar):
+        store = FullVectorStore(sidecar)
+        try:
+            batches = []
+            total = 0
+            for _, batch in store.iter_batches():
+                batches.append(batch)
+                total += len(batch)
+                if limit is not None and total >= limit:
+                    break
+            if not batches:
+                return np.empty((0, 0), dtype=np.float32)
+            return np.concatenate(batches)[:limit]
+        finally:
+            store.close()
+
+    from rag.store.chroma_store import ChromaStore
+    store = ChromaStore(persist_directory)
+    try:
+        embeddings = store.collection.get(include=["embeddings"], limit=limit)["embeddings"]
+        return np.asarray(embeddings, dtype=np.float32)
+    finally:
+        store.close()
+
+def run(vectors: np.ndarray, dimensions: Optional[List[int]] = None,
+        methods: Optional[List[str]] = None, k: int = 10, queries: int = 200,
+        rescore_factor: int = 4, seed: int = 0) -> Dict[str, Any]:
+    """Measure every method and dimension and return a JSON-serializable report."""
+    dimensions = [d for d in (dimensions or DEFAULT_DIMENSIONS) if d < vectors.shape[1]]
+    methods = methods or list(REDUCTION_METHODS)
+    return {
+        "benchmark": "reduction",
+        "created_at": datetime.now().isoformat(),
+        "vectors": len(vectors),
+        "k": k,
+        "queries": min(queries, len(vectors)),
+        "rescore_factor": rescore_factor,
+        "results": [
+            measure(vectors, create_reducer(method, dimension), k, queries, rescore_factor, seed)
+            for method in methods
+            for dimension in dimensions
+        ],
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Recall loss of embedding dimensionality reduction"
+    )
+    parser.add_argument("--store", default=os.path.join(os.getcwd(), "data", "chroma"),
+                        help="Chroma persist directory")
+    parser.add_argument("--dimensions", nargs="+", type=int, default=None)
+    parser.add_argument("--methods", nargs="+", choices=list(REDUCTION_METHODS), default=None)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Use at most this many stored vectors")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    vectors = load_vectors(args.store, limit=args.limit)
+    if len(vectors) <= args.k:
+        print(f"Need more than {args.k} stored vectors, found {len(vectors)}", file=sys.stderr)
+        return 1
+
+    report = run(vectors, args.dimensions, args.methods, args.k, args.queries, args.rescore_factor)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    for result in report["results"]:
+        print(f"{result['method']:>10} {result['dimensions']:>5}/{result['full_dimensions']} dims: "
+              f"recall@{args.k} {result['recall_at_k']:.3f}, "
+              f"re-scored {result['recall_at_k_rescored']:.3f}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""Retrieval benchmark: recall, rank and speed on a labelled query set.
+
+Every question of the query set names the source, and optionally the page,
+that answers it. For each combination of chunk size and store the suite
+chunks and ingests the pages, runs every question and reports recall@k for
+each requested k, the mean reciprocal rank (MRR) of the first matching chunk,
+p50/p95 query latency (embedding plus search), sequential queries per second,
+ingest time and memory.
+
+Without a query set, a generated corpus with known facts and the
+model-free hashing embedder are used, so a run needs no network or API key.
+
+Run with:
+    python -m rag.bench.retrieval --chunk-sizes 300 600 1200 --top-k 1 5 10 --output retrieval.json
+    python -m rag.bench.retrieval --queries queries.jsonl --documents path/to/docs --embedder local
+    python -m rag.bench.retrieval --min-recall 0.9   # exit code 1 if recall@max(k) is lower
+
+Query sets are JSON lines such as
+    {"question": "What was the Q3 revenue?", "source": "annual_report.pdf", "page": 12}
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from rag.bench.chunking import _percentile
+from rag.bench.corpora import generate_labelled_corpus
+from rag.chunking.chunker_factory import ChunkerFactory
+from rag.core.models import Document, VectorBatch
+
+STORES = ("memory", "chroma")
+DEFAULT_CHUNK_SIZES = [300, 600, 1200]
+DEFAULT_TOP_K = [1, 5, 10]
+
+# Chunks embedded and stored per batch
+INGEST_BATCH_SIZE = 256
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    """Read a query set of JSON lines with "question", "source" and an optional "page"."""
+    queries = []
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            query = json.loads(line)
+            if not query.get("question") or not query.get("source"):
+                raise ValueError(f"{path}:{line_number}: 'question' and 'source' are required")
+            queries.append(query)
+    return queries
+
+def load_pages(path: str) -> List[Document]:
+    """Load documents (one per page for PDFs) with their source and page metadata."""
+    from rag.ingestion.document_loader import DocumentLoader
+
+    pages = []
+    for index, document in enumerate(DocumentLoader().iter_documents(path, recursive=True)):
+        metadata = {
+            key: document.metadata[key]
+            for key in ("source", "page_number")
+            if key in document.metadata
+        }
+        pages.append(Document(id=str(index), content=document.page_content, metadata=metadata,
+                              source=metadata.get("source", "")))
+    return pages
+
+def chunk_pages(
+    pages: Sequence[Document], chunk_size: int, chunk_overlap: int
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Split pages with the recursive chunker; chunks keep source and page of their page."""
+    chunker = ChunkerFactory.get_chunker(
+        "recursive", chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    contents = []
+    metadatas = []
+    for page in pages:
+        for chunk in chunker.chunk(page):
+            contents.append(chunk.content)
+            metadatas.append(dict(page.metadata))
+    return contents, metadatas
+
+def is_match(metadata: Dict[str, Any], expected: Dict[str, Any]) -> bool:
+    """Whether a retrieved chunk comes from the expected source and page.
+
+    Expected sources may be file names or path suffixes of the stored source.
+    """
+    source = Path(str(metadata.get("source", ""))).as_posix()
+    expected_source = Path(str(expected["source"])).as_posix()
+    if source != expected_source and not source.endswith("/" + expected_source):
+        return False
+    page = expected.get("page")
+    return page is None or metadata.get("page_number") == int(page)
+
+def first_match_rank(results: List[Dict[str, Any]], expected: Dict[str, Any]) -> Optional[int]:
+    """1-based rank of the first matching result, None if none matches."""
+    for rank, result in enumerate(results, 1):
+        if is_match(result.get("metadata") or {}, expected):
+            return rank
+    return None
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of the process so far."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _open_store(store: str, directory: str):
+    if store == "memory":
+        from rag.store.memory_store import InMemoryVectorStore
+        return InMemoryVectorStore()
+    if store == "chroma":
+        from rag.store.chroma_store import ChromaStore
+        return ChromaStore(directory)
+    raise ValueError(f"Unsupported store: {store}. Supported stores: {', '.join(STORES)}")
+
+def _latency_ms(seconds: List[float]) -> Dict[str, float]:
+    ordered = sorted(seconds)
+    return {
+        "mean": 1000 * sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": 1000 * _percentile(ordered, 0.5),
+        "p95": 1000 * _percentile(ordered, 0.95),
+    }
+
+def measure(pages: Sequence[Document], queries: Sequence[Dict[str, Any]], embedding_model: Any,
+            chunk_size: int, chunk_overlap: int, store: str = "memory",
+            top_k: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Ingest the pages into one store configuration and run every query.
+
+    Args:
+        pages: Pages with "source" and "page_number" metadata
+        queries: Questions with their expected "source" and optional "page"
+        embedding_model: Object with embed_documents and embed_query
+        chunk_size: Characters per chunk
+        chunk_overlap: Characters shared by consecutive chunks
+        store: "memory" (exact search) or "chroma" (in a temporary directory)
+        top_k: Values of k for recall@k; each query retrieves max(top_k)
+
+    Returns:
+        Recall, MRR, latency, throughput and memory of the configuration
+    """
+    top_k = sorted(top_k or DEFAULT_TOP_K)
+    limit = top_k[-1]
+    directory = tempfile.mkdtemp(prefix="rag-bench-")
+    rss_before = _rss_bytes()
+    vector_store = _open_store(store, directory)
+    try:
+        start = time.perf_counter()
+        contents, metadatas = chunk_pages(pages, chunk_size, chunk_overlap)
+        chunk_seconds = time.perf_counter() - start
+        embed_seconds = 0.0
+        store_seconds = 0.0
+        vector_bytes = 0
+        for offset in range(0, len(contents), INGEST_BATCH_SIZE):
+            batch_contents = contents[offset:offset + INGEST_BATCH_SIZE]
+            start = time.perf_counter()
+            values = embedding_model.embed_documents(batch_contents)
+            embed_seconds += time.perf_counter() - start
+            batch = VectorBatch(
+                ids=[f"chunk-{offset + i}" for i in range(len(batch_contents))],
+                values=values,
+                metadatas=metadatas[offset:offset + INGEST_BATCH_SIZE]
+            )
+            vector_bytes += batch.values.nbytes
+            start = time.perf_counter()
+            vector_store.store_batch(batch, documents=batch_contents)
+            store_seconds += time.perf_counter() - start
+        rss_after_ingest = _rss_bytes()
+
+        ranks = []
+        embed_latencies = []
+        search_latencies = []
+        latencies = []
+        queries_start = time.perf_counter()
+        for query in queries:
+            start = time.perf_counter()
+            vector = embedding_model.embed_query(query["question"])
+            embedded = time.perf_counter()
+            results = vector_store.search_vectors(vector, top_k=limit)
+            end = time.perf_counter()
+            embed_latencies.append(embedded - start)
+            search_latencies.append(end - embedded)
+            latencies.append(end - start)
+            ranks.append(first_match_rank(results, query))
+        query_seconds = time.perf_counter() - queries_start
+    finally:
+        if hasattr(vector_store, "close"):
+            vector_store.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    count = len(ranks)
+    return {
+        "store": store,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "chunks": len(contents),
+        "recall_at_k": {
+            str(k): (
+                sum(1 for rank in ranks if rank is not None and rank <= k) / count
+                if count else 0.0
+            )
+            for k in top_k
+        },
+        "mrr": sum(1.0 / rank for rank in ranks if rank is not None) / count if count else 0.0,
+        "latency_ms": _latency_ms(latencies),
+        "embed_latency_ms": _latency_ms(embed_latencies),
+        "search_latency_ms": _latency_ms(search_latencies),
+        "queries_per_second": count / query_seconds if query_seconds else None,
+        "ingest_seconds": {"chunk": chunk_seconds, "embed": embed_seconds, "store": store_seconds},
+        "memory": {
+            "vector_bytes": vector_bytes,
+            "rss_bytes": rss_after_ingest,
+            "ingest_rss_growth_bytes": (
+                rss_after_ingest - rss_before
+                if rss_after_ingest is not None and rss_before is not None else None
+            ),
+            "peak_rss_bytes": _peak_rss_bytes(),
+        },
+    }
+
+def run(pages: Sequence[Document], queries: Sequence[Dict[str, Any]], embedding_model: Any,
+        chunk_sizes: Optional[List[int]] = None, top_k: Optional[List[int]] = None,
+        stores: Optional[List[str]] = None, overlap: float = 0.1,
+        embedder: Optional[str] = None, corpus: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Measure every chunk size and store and return a JSON-serializable report.
+
+    Args:
+        overlap: Chunk overlap as a fraction of the chunk size
+        embedder: Name of the embedder, recorded in the report
+        corpus: Description of the corpus, recorded in the report
+    """
+    chunk_sizes = chunk_sizes or DEFAULT_CHUNK_SIZES
+    top_k = sorted(top_k or DEFAULT_TOP_K)
+    stores = stores or ["memory"]
+    return {
+        "benchmark": "retrieval",
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "embedder": embedder or type(embedding_model).__name__,
+        "corpus": corpus or {},
+        "pages": len(pages),
+        "queries": len(queries),
+        "top_k": top_k,
+        "results": [
+            measure(pages, queries, embedding_model, chunk_size, int(chunk_size * overlap),
+                    store, top_k)
+            for store in stores
+            for chunk_size in chunk_sizes
+        ],
+    }
+
+def prepare(queries_path: Optional[str] = None, documents_path: Optional[str] = None,
+            documents: int = 5, pages: int = 10, facts_per_page: int = 2,
+            seed: int = 0) -> Tuple[List[Document], List[Dict[str, Any]], Dict[str, Any]]:
+    """Load a query set with its documents, or generate a labelled corpus.
+
+    Returns:
+        Tuple of (pages, queries, corpus description)
+    """
+    if queries_path:
+        if not documents_path:
+            raise ValueError("A query set needs the documents it refers to")
+        return (load_pages(documents_path), load_queries(queries_path),
+                {"queries": queries_path, "documents": documents_path})
+    corpus_pages, queries = generate_labelled_corpus(documents, pages, facts_per_page, seed=seed)
+    corpus = {"generated": True, "documents": documents, "pages_per_document": pages,
+              "facts_per_page": facts_per_page, "seed": seed}
+    return corpus_pages, queries, corpus
+
+def summary_lines(report: Dict[str, Any]) -> List[str]:
+    """One line per configuration for the terminal."""
+    k = report["top_k"][-1]
+    return [
+        f"{result['store']:>7} chunk {result['chunk_size']:>5}: {result['chunks']:>6} chunks, "
+        f"recall@{k} {result['recall_at_k'][str(k)]:.3f}, MRR {result['mrr']:.3f}, "
+        f"p50 {result['latency_ms']['p50']:.2f} ms, p95 {result['latency_ms']['p95']:.2f} ms, "
+        f"{result['queries_per_second'] or 0:.0f} q/s"
+        for result in report["results"]
+    ]
+
+def check_recall(report: Dict[str, Any], min_recall: float) -> List[str]:
+    """Return the configurations whose recall@max(k) is below min_recall."""
+    k = str(report["top_k"][-1])
+    return [
+        f"{result['store']}/{result['chunk_size']}"
+        for result in report["results"]
+        if result["recall_at_k"][k] < min_recall
+    ]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from rag.embedding.embeddings import EMBEDDERS, create_embedding_model
+
+    parser = argparse.ArgumentParser(description="Retrieval benchmark on a labelled query set")
+    parser.add_argument("--queries", help="JSON lines with question, source and page; a "
+                                          "generated corpus is used if not given")
+    parser.add_argument("--documents",
+                        help="File or directory of the documents the queries refer to")
+    parser.add_argument("--corpus-documents", type=int, default=5,
+                        help="Documents of the generated corpus")
+    parser.add_argument("--corpus-pages", type=int, default=10, help="Pages per generated document")
+    parser.add_argument("--facts-per-page", type=int, default=2,
+                        help="Questions per generated page")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-sizes", nargs="+", type=int, default=None)
+    parser.add_argument("--overlap", type=float, default=0.1,
+                        help="Chunk overlap as a fraction of the chunk size")
+    parser.add_argument("--top-k", nargs="+", type=int, default=None)
+    parser.add_argument("--stores", nargs="+", choices=list(STORES), default=None)
+    parser.add_argument("--embedder", choices=list(EMBEDDERS), default="hashing")
+    parser.add_argument("--min-recall", type=float, default=None,
+                        help="Exit with code 1 if a configuration's recall@max(k) is lower")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        pages, queries, corpus = prepare(args.queries, args.documents, args.corpus_documents,
+                                         args.corpus_pages, args.facts_per_page, args.seed)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    if not pages or not queries:
+        print("Need at least one page and one query", file=sys.stderr)
+        return 1
+
+    report = run(pages, queries, create_embedding_model(args.embedder), args.chunk_sizes,
+                 args.top_k, args.stores, args.overlap, embedder=args.embedder, corpus=corpus)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    for line in summary_lines(report):
+        print(line, file=sys.stderr)
+    if args.min_recall is not None:
+        failing = check_recall(report, args.min_recall)
+        if failing:
+            print(f"Recall below {args.min_recall}: {', '.join(failing)}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
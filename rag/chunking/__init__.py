@@ -3,12 +3,14 @@ Text chunking strategies and implementations.
 """
 
 from .chunker import BaseChunker
-from .token_chunker import TokenChunker
-from .recursive_character_chunker import RecursiveCharacterChunker
-from .markdown_chunker import MarkdownChunker
+from .chunker_factory import ChunkerFactory
+from .hierarchical_chunker import HierarchicalChunker
 from .html_chunker import HTMLChunker
+from .markdown_chunker import MarkdownChunker
 from .page_wise_chunker import PageWiseChunker
-from .chunker_factory import ChunkerFactory
+from .recursive_character_chunker import RecursiveCharacterChunker
+from .table_chunker import TableChunker
+from .token_chunker import TokenChunker
 
 __all__ = [
     "BaseChunker",
@@ -17,5 +19,7 @@ __all__ = [
     "MarkdownChunker",
     "HTMLChunker",
     "PageWiseChunker",
+    "TableChunker",
+    "HierarchicalChunker",
     "ChunkerFactory"
 ] 
\ No newline at end of file
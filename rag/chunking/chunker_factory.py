@@ -1,10 +1,14 @@
-from typing import Dict, Type, Optional
+from typing import Dict, Type
+
 from .chunker import BaseChunker
-from .token_chunker import TokenChunker
-from .recursive_character_chunker import RecursiveCharacterChunker
-from .markdown_chunker import MarkdownChunker
+from .hierarchical_chunker import HierarchicalChunker
 from .html_chunker import HTMLChunker
+from .markdown_chunker import MarkdownChunker
 from .page_wise_chunker import PageWiseChunker
+from .recursive_character_chunker import RecursiveCharacterChunker
+from .table_chunker import TableChunker
+from .token_chunker import TokenChunker
+
 
 class ChunkerFactory:
     """Factory for creating chunkers based on document type."""
@@ -15,7 +19,9 @@ class ChunkerFactory:
         "recursive": RecursiveCharacterChunker,
         "markdown": MarkdownChunker,
         "html": HTMLChunker,
-        "page": PageWiseChunker
+        "page": PageWiseChunker,
+        "table": TableChunker,
+        "hierarchical": HierarchicalChunker
     }
     
     @classmethod
@@ -0,0 +1,78 @@
+from typing import List, Optional, Tuple
+
+from ..core.models import Chunk, Document
+from .chunker import BaseChunker
+
+
+class HierarchicalChunker(BaseChunker):
+    """Two-level chunking strategy for small-to-big retrieval.
+
+    The document is first split into large parent chunks, and every parent is
+    split again into small child chunks. Children are meant to be embedded and
+    searched, parents are stored by id and handed to the LLM as context.
+    """
+
+    def __init__(self, chunk_size: int = 400, chunk_overlap: int = 50,
+                 parent_chunk_size: int = 2000, parent_chunker: Optional[BaseChunker] = None,
+                 child_chunker: Optional[BaseChunker] = None):
+        """
+        Initialize the chunker.
+
+        Args:
+            chunk_size: Maximum size of each child chunk
+            chunk_overlap: Overlap between child chunks
+            parent_chunk_size: Maximum size of each parent chunk
+            parent_chunker: Chunker creating the parent level. Defaults to a
+                RecursiveCharacterChunker with parent_chunk_size and no overlap.
+            child_chunker: Chunker creating the child level. Defaults to a
+                RecursiveCharacterChunker with chunk_size and chunk_overlap.
+        """
+        super().__init__(chunk_size, chunk_overlap)
+        from .recursive_character_chunker import RecursiveCharacterChunker
+        self.parent_chunk_size = parent_chunk_size
+        self.parent_chunker = parent_chunker or RecursiveCharacterChunker(
+            chunk_size=parent_chunk_size, chunk_overlap=0
+        )
+        self.child_chunker = child_chunker or RecursiveCharacterChunker(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+
+    def chunk(self, document: Document) -> List[Chunk]:
+        """Split document into parent chunks followed by their child chunks."""
+        parents, children = self.chunk_hierarchy(document)
+        return parents + children
+
+    def chunk_hierarchy(self, document: Document) -> Tuple[List[Chunk], List[Chunk]]:
+        """Split document into parent and child chunks.
+
+        Returns:
+            Tuple of (parents, children). Every child carries the id of its
+            parent in the ``parent_id`` metadata field.
+        """
+        parents = self.parent_chunker.chunk(document)
+        children = []
+
+        for parent_index, parent in enumerate(parents):
+            parent.metadata["hierarchy_level"] = "parent"
+            parent.metadata["parent_index"] = parent_index
+            parent_start = parent.metadata.get("start_index", 0)
+
+            parent_document = Document(
+                id=document.id,
+                content=parent.content,
+                metadata=document.metadata,
+                created_at=document.created_at,
+                updated_at=document.updated_at,
+                source=document.source
+            )
+            parent_children = self.child_chunker.chunk(parent_document)
+            for child in parent_children:
+                child.metadata = dict(child.metadata)
+                child.metadata["start_index"] = child.metadata.get("start_index", 0) + parent_start
+                child.metadata["end_index"] = child.metadata.get("end_index", 0) + parent_start
+                child.metadata["hierarchy_level"] = "child"
+                child.metadata["parent_id"] = parent.id
+                child.metadata["parent_index"] = parent_index
+            children.extend(parent_children)
+
+        return parents, children
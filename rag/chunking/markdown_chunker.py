@@ -25,8 +25,11 @@ class MarkdownChunker(BaseChunker):
             {"level": 3, "name": "h3"}
         ]
         
+        # MarkdownHeaderTextSplitter expects (markdown prefix, metadata key) tuples
         self.text_splitter = MarkdownHeaderTextSplitter(
-            headers_to_split_on=self.headers_to_split_on
+            headers_to_split_on=[
+                ("#" * header["level"], header["name"]) for header in self.headers_to_split_on
+            ]
         )
     
     def chunk(self, document: Document) -> List[Chunk]:
@@ -36,20 +39,23 @@ class MarkdownChunker(BaseChunker):
         
         # Convert to our Chunk model
         chunks = []
+        current_position = 0
         
         for i, md_doc in enumerate(markdown_docs):
             # Extract the content and metadata
             content = md_doc.page_content
             metadata = md_doc.metadata
             
-            # Find the position of this chunk in the original text
+            # Find the position of this chunk in the original text, searching
+            # from the previous chunk so repeated searches stay linear overall.
             # This is approximate since we don't have exact positions
-            chunk_start = document.content.find(content)
+            chunk_start = document.content.find(content, current_position)
             if chunk_start == -1:
                 # If we can't find the exact position, estimate it
-                chunk_start = i * 1000  # Rough estimate
+                chunk_start = current_position
             
             chunk_end = chunk_start + len(content)
+            current_position = chunk_end
             
             # Create our Chunk model
             chunk = self._create_chunk(
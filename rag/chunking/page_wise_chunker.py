@@ -1,79 +1,122 @@
-from typing import List, Dict, Any
-from .chunker import BaseChunker
-from ..core.models import Document, Chunk
+import re
 import uuid
+from typing import List, Optional, Tuple
+
+from ..core.models import Chunk, Document
+from .chunker import BaseChunker
+
+# Common page break markers
+DEFAULT_PAGE_MARKERS = ['\f', '\n\n---\n\n', '\n\n***\n\n', '\n\nPage ', '\n\n[Page']
 
 class PageWiseChunker(BaseChunker):
     """Page-based chunking strategy that splits documents at page boundaries."""
-    
-    def __init__(self, min_page_size: int = 100):
+
+    def __init__(self, min_page_size: int = 100, markers: Optional[List[str]] = None):
         """
         Initialize the chunker.
-        
+
         Args:
             min_page_size: Minimum size of a page to be considered valid.
                           Pages smaller than this will be merged with the next page.
+            markers: Page break markers to detect. Defaults to DEFAULT_PAGE_MARKERS.
         """
         super().__init__(chunk_size=0, chunk_overlap=0)  # Not used for this chunker
         self.min_page_size = min_page_size
-    
+        self.markers = markers or DEFAULT_PAGE_MARKERS
+        # One alternation finds all markers in a single pass. Longer markers come
+        # first so that overlapping markers resolve to the longest match.
+        self._marker_pattern = re.compile(
+            "|".join(re.escape(marker) for marker in sorted(self.markers, key=len, reverse=True))
+        )
+
     def chunk(self, document: Document) -> List[Chunk]:
         """Split document into chunks based on page boundaries."""
-        # Get page markers from document metadata if available
-        page_markers = document.metadata.get('page_markers', [])
+        content = document.content
+        if not content.strip():
+            return []
+
+        # Documents produced page by page (e.g. by AdvancedPDFLoader) already are
+        # a single page, so keep their page number instead of re-detecting pages
+        if "page_number" in document.metadata:
+            start_idx = len(content) - len(content.lstrip())
+            end_idx = len(content.rstrip())
+            page_number = document.metadata["page_number"]
+            return [self._create_page_chunk(document, start_idx, end_idx, page_number, page_number)]
+
+        pages = self._merge_small_pages(content, self._split_pages(document))
+
+        return [
+            self._create_page_chunk(document, start_idx, end_idx, first_page, last_page)
+            for start_idx, end_idx, first_page, last_page in pages
+        ]
+
+    def _split_pages(self, document: Document) -> List[Tuple[int, int]]:
+        """Return the (start, end) offsets of all pages in the document."""
+        content = document.content
+        # Use page markers from document metadata if available, without
+        # modifying the caller's metadata
+        page_markers = list(document.metadata.get('page_markers', []))
         if not page_markers:
-            # If no page markers, try to detect pages using common markers
-            content = document.content
-            # Common page break markers
-            markers = ['\f', '\n\n---\n\n', '\n\n***\n\n', '\n\nPage ', '\n\n[Page']
-            
-            current_pos = 0
-            for marker in markers:
-                while True:
-                    pos = content.find(marker, current_pos)
-                    if pos == -1:
-                        break
-                    page_markers.append(pos)
-                    current_pos = pos + len(marker)
-        
-        # Add start and end positions
-        page_markers = [0] + sorted(page_markers) + [len(document.content)]
-        
-        # Create chunks from pages
-        chunks = []
-        for i in range(len(page_markers) - 1):
-            start_idx = page_markers[i]
-            end_idx = page_markers[i + 1]
-            
-            # Extract page content
-            page_content = document.content[start_idx:end_idx].strip()
-            
-            # Skip empty pages or those below minimum size
-            if not page_content or len(page_content) < self.min_page_size:
-                continue
-            
-            # Create chunk for this page
-            chunk = self._create_chunk(
-                content=page_content,
-                document=document,
-                start_idx=start_idx,
-                end_idx=end_idx
-            )
-            
-            # Add page-specific metadata
-            chunk.metadata.update({
-                "chunk_type": "page",
-                "page_number": i + 1,
-                "page_markers": {
-                    "start": start_idx,
-                    "end": end_idx
-                }
-            })
-            
-            chunks.append(chunk)
-        
-        return chunks
-    
+            page_markers = [match.start() for match in self._marker_pattern.finditer(content)]
+
+        inner = [pos for pos in page_markers if 0 < pos < len(content)]
+        boundaries = sorted(set([0] + inner + [len(content)]))
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _merge_small_pages(self, content: str,
+                           pages: List[Tuple[int, int]]) -> List[Tuple[int, int, int, int]]:
+        """Merge pages below min_page_size into the following page.
+
+        Returns:
+            List of (start, end, first_page_number, last_page_number) tuples.
+            A trailing small page is merged into the preceding page.
+        """
+        merged: List[List[int]] = []
+        pending: Optional[List[int]] = None
+
+        for page_number, (start_idx, end_idx) in enumerate(pages, 1):
+            if pending is None:
+                pending = [start_idx, end_idx, page_number, page_number]
+            else:
+                pending[1] = end_idx
+                pending[3] = page_number
+
+            if len(content[pending[0]:pending[1]].strip()) >= self.min_page_size:
+                merged.append(pending)
+                pending = None
+
+        if pending is not None:
+            if merged:
+                merged[-1][1] = pending[1]
+                merged[-1][3] = pending[3]
+            elif content[pending[0]:pending[1]].strip():
+                merged.append(pending)
+
+        return [tuple(page) for page in merged]
+
+    def _create_page_chunk(self, document: Document, start_idx: int, end_idx: int,
+                           first_page: int, last_page: int) -> Chunk:
+        """Create a chunk covering one or more (merged) pages."""
+        chunk = self._create_chunk(
+            content=document.content[start_idx:end_idx].strip(),
+            document=document,
+            start_idx=start_idx,
+            end_idx=end_idx
+        )
+
+        # Add page-specific metadata
+        chunk.metadata.update({
+            "chunk_type": "page",
+            "page_number": first_page,
+            "page_end_number": last_page,
+            "merged_pages": last_page - first_page + 1,
+            "page_markers": {
+                "start": start_idx,
+                "end": end_idx
+            }
+        })
+        return chunk
+
     def _create_chunk(self, content: str, document: Document, start_idx: int, end_idx: int) -> Chunk:
         """Create a chunk with the given content and metadata."""
         return Chunk(
@@ -85,4 +128,4 @@ class PageWiseChunker(BaseChunker):
                 "end_index": end_idx,
                 "source": document.source
             }
-        ) 
\ No newline at end of file
+        )
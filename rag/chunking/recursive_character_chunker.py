@@ -45,7 +45,8 @@ class RecursiveCharacterChunker(BaseChunker):
                 chunk_start = current_position
             
             chunk_end = chunk_start + len(text_chunk)
-            current_position = chunk_end
+            # Overlapping chunks start before the end of the previous chunk
+            current_position = chunk_start + 1
             
             # Create our Chunk model
             chunk = self._create_chunk(
@@ -0,0 +1,190 @@
+import re
+from typing import List, Optional, Tuple
+
+from ..core.models import Chunk, Document
+from .chunker import BaseChunker
+
+# A Markdown table separator row, e.g. "| --- | :---: | ---: |"
+_SEPARATOR_ROW = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+
+
+class TableChunker(BaseChunker):
+    """Layout-aware chunking strategy that keeps Markdown tables together.
+
+    Markdown table blocks (as produced by ``AdvancedPDFLoader._process_table``)
+    are never cut in the middle of a row. Tables larger than ``chunk_size`` are
+    split into row groups and every group repeats the header and separator rows,
+    so each chunk stays self-describing. All other text is delegated to a regular
+    text chunker.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200,
+                 text_chunker: Optional[BaseChunker] = None, max_caption_length: int = 100):
+        """
+        Initialize the chunker.
+
+        Args:
+            chunk_size: Maximum size of each chunk. Table chunks always contain
+                at least one data row, even if that exceeds this size.
+            chunk_overlap: Overlap used by the default text chunker
+            text_chunker: Chunker used for the text between tables.
+                Defaults to a RecursiveCharacterChunker with the same sizes.
+            max_caption_length: A short line directly above a table (e.g. "Tables:"
+                or "Table 3: Revenue by segment") is treated as its caption and
+                repeated in every chunk of that table.
+        """
+        super().__init__(chunk_size, chunk_overlap)
+        if text_chunker is None:
+            from .recursive_character_chunker import RecursiveCharacterChunker
+            text_chunker = RecursiveCharacterChunker(
+                chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            )
+        self.text_chunker = text_chunker
+        self.max_caption_length = max_caption_length
+
+    def chunk(self, document: Document) -> List[Chunk]:
+        """Split document into text chunks and header-preserving table chunks."""
+        content = document.content
+        chunks: List[Chunk] = []
+        text_start = 0
+
+        tables = self._find_tables(content)
+        for table_index, (caption_start, table_start, table_end) in enumerate(tables):
+            chunks.extend(self._chunk_text(document, text_start, caption_start))
+            caption = content[caption_start:table_start].strip()
+            chunks.extend(self._chunk_table(document, table_index, caption, table_start, table_end))
+            text_start = table_end
+
+        chunks.extend(self._chunk_text(document, text_start, len(content)))
+
+        for i, chunk in enumerate(chunks):
+            chunk.metadata["chunk_index"] = i
+
+        return chunks
+
+    def _find_tables(self, content: str) -> List[Tuple[int, int, int]]:
+        """Locate Markdown table blocks.
+
+        Returns:
+            List of (caption_start, table_start, table_end) character offsets.
+            caption_start equals table_start if the table has no caption.
+        """
+        lines = content.splitlines(keepends=True)
+        offsets = []
+        position = 0
+        for line in lines:
+            offsets.append(position)
+            position += len(line)
+        offsets.append(position)
+
+        tables = []
+        i = 0
+        while i < len(lines) - 1:
+            separator = _SEPARATOR_ROW.match(lines[i + 1].rstrip("\r\n"))
+            if not (self._is_table_row(lines[i]) and separator):
+                i += 1
+                continue
+
+            end = i + 2
+            while end < len(lines) and self._is_table_row(lines[end]):
+                end += 1
+
+            caption_line = i - 1
+            while caption_line >= 0 and not lines[caption_line].strip():
+                caption_line -= 1
+            caption_start = offsets[i]
+            if caption_line >= 0:
+                caption = lines[caption_line].strip()
+                previous_table_end = tables[-1][2] if tables else 0
+                if (len(caption) <= self.max_caption_length
+                        and not self._is_table_row(lines[caption_line])
+                        and offsets[caption_line] >= previous_table_end):
+                    caption_start = offsets[caption_line]
+
+            # Exclude the trailing newline so it stays with the following text
+            table_end = offsets[end] - (len(lines[end - 1]) - len(lines[end - 1].rstrip("\r\n")))
+            tables.append((caption_start, offsets[i], table_end))
+            i = end
+
+        return tables
+
+    @staticmethod
+    def _is_table_row(line: str) -> bool:
+        """Check whether a line looks like a Markdown table row."""
+        return line.lstrip().startswith("|")
+
+    def _chunk_text(self, document: Document, start: int, end: int) -> List[Chunk]:
+        """Chunk a non-table text segment and map offsets back to the document."""
+        segment = document.content[start:end]
+        if not segment.strip():
+            return []
+
+        segment_document = Document(
+            id=document.id,
+            content=segment,
+            metadata=document.metadata,
+            created_at=document.created_at,
+            updated_at=document.updated_at,
+            source=document.source
+        )
+        chunks = self.text_chunker.chunk(segment_document)
+        for chunk in chunks:
+            chunk.metadata = dict(chunk.metadata)
+            chunk.metadata["start_index"] = chunk.metadata.get("start_index", 0) + start
+            chunk.metadata["end_index"] = chunk.metadata.get("end_index", len(segment)) + start
+            chunk.metadata["chunk_type"] = "text"
+        return chunks
+
+    def _chunk_table(self, document: Document, table_index: int, caption: str,
+                     start: int, end: int) -> List[Chunk]:
+        """Split a table into row groups that each repeat the header rows."""
+        table_text = document.content[start:end]
+        lines = table_text.splitlines(keepends=True)
+        header = "".join(lines[:2]).rstrip("\r\n")
+        rows = lines[2:]
+        prefix = f"{caption}\n{header}" if caption else header
+
+        # Group rows so that prefix + rows stays within chunk_size
+        groups: List[Tuple[int, int]] = []
+        group_start = 0
+        group_size = len(prefix)
+        for row_index, row in enumerate(rows):
+            row_size = len(row.rstrip("\r\n")) + 1
+            if row_index > group_start and group_size + row_size > self.chunk_size:
+                groups.append((group_start, row_index))
+                group_start = row_index
+                group_size = len(prefix)
+            group_size += row_size
+        groups.append((group_start, len(rows)))
+
+        row_offsets = [start + len(lines[0]) + len(lines[1])]
+        for row in rows:
+            row_offsets.append(row_offsets[-1] + len(row))
+
+        chunks = []
+        for part, (first_row, last_row) in enumerate(groups):
+            body = "".join(rows[first_row:last_row]).rstrip("\r\n")
+            content = f"{prefix}\n{body}" if body else prefix
+            chunk_start = start if part == 0 else row_offsets[first_row]
+            chunk_end = min(row_offsets[last_row], end)
+
+            chunk = self._create_chunk(
+                content=content,
+                document=document,
+                start_idx=chunk_start,
+                end_idx=chunk_end
+            )
+            chunk.metadata.update({
+                "chunk_type": "table",
+                "table_index": table_index,
+                "table_caption": caption,
+                "table_header": lines[0].strip(),
+                "table_row_start": first_row + 1,
+                "table_row_end": last_row,
+                "table_row_count": len(rows),
+                "table_part": part + 1,
+                "table_parts": len(groups)
+            })
+            chunks.append(chunk)
+
+        return chunks
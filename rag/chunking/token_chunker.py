@@ -33,10 +33,11 @@ class TokenChunker(BaseChunker):
             # Calculate end index for this chunk
             end_idx = min(start_idx + self.chunk_size, len(content))
             
-            # Find the last space before the end to avoid cutting words
+            # Find the last space before the end to avoid cutting words, but only
+            # if the chunk still ends after the overlap so the next chunk advances
             if end_idx < len(content):
                 last_space = content.rfind(' ', start_idx, end_idx)
-                if last_space != -1:
+                if last_space > start_idx + self.chunk_overlap:
                     end_idx = last_space
             
             # Create chunk
@@ -50,10 +51,11 @@ class TokenChunker(BaseChunker):
             chunks.append(chunk)
             
             # Move start index for next chunk, considering overlap
-            start_idx = end_idx - self.chunk_overlap
-            if start_idx >= end_idx:
-                # If we're not advancing, force advancement by at least one character
-                start_idx = end_idx + 1
+            next_start_idx = end_idx - self.chunk_overlap
+            if next_start_idx <= start_idx:
+                # If we're not advancing (overlap >= chunk size), continue without overlap
+                next_start_idx = end_idx
+            start_idx = next_start_idx
             
             chunk_idx += 1
             
@@ -1,42 +1,136 @@
-"""Main CLI module for the RAG system."""
+"""Main CLI module for the RAG system.
 
-import os
-from pathlib import Path
-from typing import Optional, List
-import uuid
+Subsystems such as chromadb, the document loaders, langchain and litellm take
+seconds to import, so every command imports only the ones it uses; `rag --help`
+and light commands start without them. `python -m rag.bench.importtime`
+reports the start-up cost.
+"""
+
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.markdown import Markdown
-from langchain.schema import Document
 
-from rag.core.config import Settings
-from rag.ingestion.document_loader import DocumentLoader
-from rag.store.chroma_store import ChromaStore
-from rag.embedding.embeddings import EmbeddingModel
-from rag.llm.llm_client import LLMClient
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+    from rag.core.config import Settings
+    from rag.embedding.embeddings import EmbeddingModel
+    from rag.ingestion.dedup import ChunkDeduplicator
+    from rag.store.chroma_store import ChromaStore
 
 app = typer.Typer(help="RAG System CLI")
 console = Console()
 
-def get_settings() -> Settings:
+def get_settings() -> "Settings":
     """Get application settings."""
+    from rag.core.config import Settings
     return Settings()
 
 @app.command()
 def ingest(
     path: str = typer.Argument(..., help="Path to document or directory to ingest"),
     chunk_size: int = typer.Option(1000, "--chunk-size", "-c", help="Size of text chunks"),
-    chunk_overlap: int = typer.Option(200, "--chunk-overlap", "-o", help="Overlap between chunks")
+    chunk_overlap: int = typer.Option(200, "--chunk-overlap", "-o", help="Overlap between chunks"),
+    dedup: bool = typer.Option(
+        True, "--dedup/--no-dedup", help="Drop duplicate and near-duplicate chunks"
+    ),
+    dedup_threshold: float = typer.Option(
+        0.85, "--dedup-threshold", help="Similarity above which chunks count as duplicates"
+    ),
+    hierarchical: bool = typer.Option(
+        False, "--hierarchical",
+        help="Index small child chunks and store their larger parent sections"
+    ),
+    parent_chunk_size: int = typer.Option(
+        2000, "--parent-chunk-size", help="Size of parent chunks with --hierarchical"
+    ),
+    pdf_workers: int = typer.Option(
+        1, "--pdf-workers", help="Worker processes for page-parallel PDF extraction"
+    ),
+    vision_connections: int = typer.Option(
+        8, "--vision-connections",
+        help="Pooled connections, and concurrent requests, of the vision model per process"
+    ),
+    ocr: bool = typer.Option(
+        False, "--ocr", help="OCR scanned PDFs and images with Azure Document Intelligence"
+    ),
+    ocr_backend: str = typer.Option(
+        "azure", "--ocr-backend", help="OCR backend with --ocr: azure or tesseract (local)"
+    ),
+    ocr_concurrency: Optional[int] = typer.Option(
+        None, "--ocr-concurrency",
+        help="Maximum concurrent OCR requests (azure) or worker processes (tesseract)"
+    ),
+    ocr_dpi: int = typer.Option(300, "--ocr-dpi", help="Render resolution for local OCR"),
+    ocr_cache: bool = typer.Option(
+        True, "--ocr-cache/--no-ocr-cache", help="Reuse cached OCR results for unchanged files"
+    ),
+    batch_size: int = typer.Option(
+        256, "--batch-size", help="Chunks deduplicated, embedded and stored per batch"
+    ),
+    embedder: str = typer.Option(
+        "openai", "--embedder",
+        help=(
+            "Embedding backend: openai, openai-async (concurrent, rate-limited requests) or "
+            "local (ONNX Runtime on the CPU). Use compatible ones for ingest and query."
+        ),
+    ),
+    embedding_threads: Optional[int] = typer.Option(
+        None, "--embedding-threads", help="CPU threads of the local embedder (default: all CPUs)"
+    ),
+    embedding_concurrency: int = typer.Option(
+        4, "--embedding-concurrency", help="Concurrent embedding requests with openai-async"
+    ),
+    embedding_tpm: int = typer.Option(
+        1_000_000, "--embedding-tpm",
+        help="Tokens per minute limit of the embedding model with openai-async"
+    ),
+    dimensions: Optional[int] = typer.Option(
+        None, "--dimensions",
+        help="Store embeddings reduced to this many dimensions (new collections only)"
+    ),
+    reduction: str = typer.Option(
+        "matryoshka", "--reduction",
+        help=(
+            "Reduction with --dimensions: matryoshka (leading dimensions, text-embedding-3-*) "
+            "or pca (fitted at ingest)"
+        ),
+    ),
 ):
-    """Ingest documents into the RAG system."""
+    """Ingest documents into the RAG system.
+
+    Documents are loaded lazily and their chunks are processed in batches, so
+    memory stays bounded for large inputs.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from rag.ingestion.dedup import ChunkDeduplicator
+    from rag.ingestion.document_loader import DocumentLoader
+    from rag.store.chroma_store import ChromaStore
+    from rag.store.parent_store import ParentStore
+    from rag.store.reduced_store import ReducedVectorStore
+
+    reduced_store = None
+    page_cache = None
     try:
         # Initialize components
         store = ChromaStore()
-        embedding_model = EmbeddingModel()
-        document_loader = DocumentLoader()
+        # Collections ingested with --dimensions keep their reducer, so later
+        # runs reduce the same way without repeating the option
+        reduced_store = ReducedVectorStore.open(
+            store, method=reduction if dimensions else None, dimensions=dimensions
+        )
+        vector_store = reduced_store or store
+        embedding_model = _create_embedding_model(
+            embedder, embedding_threads, embedding_concurrency, embedding_tpm
+        )
+        document_loader = DocumentLoader(
+            pdf_workers=pdf_workers, vision_max_connections=vision_connections
+        )
+        deduplicator = ChunkDeduplicator(threshold=dedup_threshold) if dedup else None
+        parent_store = ParentStore() if hierarchical else None
 
         # Load and process documents
         with Progress(
@@ -45,81 +139,223 @@ def ingest(
             console=console
         ) as progress:
             task = progress.add_task("Loading documents...", total=None)
-            documents = document_loader.load_documents(path)
+            if ocr:
+                # OCR pages are chunked as soon as the service returns them
+                if ocr_backend == "tesseract":
+                    from rag.ingestion.local_ocr import TesseractOCRProcessor
+                    ocr_processor = TesseractOCRProcessor(dpi=ocr_dpi, max_workers=ocr_concurrency)
+                elif ocr_backend == "azure":
+                    from rag.ingestion.ocr import AsyncAzureOCRProcessor
+                    from rag.ingestion.ocr_cache import OCRCache
+                    page_cache = OCRCache() if ocr_cache else None
+                    ocr_processor = AsyncAzureOCRProcessor(
+                        max_concurrency=ocr_concurrency, cache=page_cache
+                    )
+                else:
+                    raise ValueError(f"Unsupported OCR backend: {ocr_backend}. "
+                                     "Supported backends: azure, tesseract")
+                documents = document_loader.load_ocr_documents(path, ocr_processor)
+            else:
+                # Large text files arrive as several windowed documents
+                documents = document_loader.iter_documents(path)
             progress.update(task, completed=True)
-            console.print(f"[blue]Found {len(documents)} documents to process[/blue]")
 
-            task = progress.add_task("Chunking documents...", total=len(documents))
-            chunks = []
+            task = progress.add_task("Chunking, embedding and storing...", total=None)
+            batch = []
+            document_count = 0
+            chunk_count = 0
+            stored_count = 0
+            stored_characters = 0
+            parent_count = 0
             for i, doc in enumerate(documents, 1):
-                doc_chunks = document_loader.chunk_document(doc, chunk_size, chunk_overlap)
-                chunks.extend(doc_chunks)
-                console.print(f"[blue]Document {i}/{len(documents)}: Created {len(doc_chunks)} chunks[/blue]")
+                document_count = i
+                if hierarchical:
+                    doc_parents, doc_chunks = document_loader.chunk_document_hierarchical(
+                        doc, chunk_size, chunk_overlap, parent_chunk_size
+                    )
+                    parent_store.store_parents(
+                        ids=[parent.metadata["chunk_id"] for parent in doc_parents],
+                        contents=[parent.page_content for parent in doc_parents],
+                        metadatas=[parent.metadata for parent in doc_parents]
+                    )
+                    parent_count += len(doc_parents)
+                else:
+                    doc_chunks = document_loader.chunk_document(doc, chunk_size, chunk_overlap)
+                batch.extend(doc_chunks)
+                chunk_count += len(doc_chunks)
+                console.print(f"[blue]Document {i}: Created {len(doc_chunks)} chunks[/blue]")
                 progress.advance(task)
 
-            console.print(f"[blue]Total chunks created: {len(chunks)}[/blue]")
-            console.print(f"[blue]Average chunks per document: {len(chunks)/len(documents):.1f}[/blue]")
+                if len(batch) >= batch_size:
+                    stored = _ingest_batch(batch, vector_store, embedding_model, deduplicator)
+                    stored_count += len(stored)
+                    stored_characters += sum(len(chunk.page_content) for chunk in stored)
+                    batch = []
 
-            task = progress.add_task("Generating embeddings...", total=len(chunks))
-            vectors = []
-            for chunk in chunks:
-                vector = embedding_model.embed_text(chunk.page_content)
-                vectors.append(vector)
-                progress.advance(task)
+            if batch:
+                stored = _ingest_batch(batch, vector_store, embedding_model, deduplicator)
+                stored_count += len(stored)
+                stored_characters += sum(len(chunk.page_content) for chunk in stored)
+            if reduced_store is not None:
+                reduced_store.flush()
+                console.print(f"[blue]Stored {reduced_store.reducer.method} vectors with "
+                              f"{reduced_store.reducer.dimensions} dimensions[/blue]")
 
-            task = progress.add_task("Storing vectors...", total=len(chunks))
-            for chunk, vector in zip(chunks, vectors):
-                doc_id = str(uuid.uuid4())
-                store.store_vector(
-                    id=doc_id,
-                    vector=vector,
-                    content=chunk.page_content,
-                    metadata=chunk.metadata)
-                
-                progress.advance(task)
+            console.print(f"[blue]Total chunks created: {chunk_count}[/blue]")
+            average = chunk_count / max(document_count, 1)
+            console.print(f"[blue]Average chunks per document: {average:.1f}[/blue]")
 
-        console.print(f"[green]Successfully ingested {len(documents)} documents![/green]")
-        console.print(f"[green]Total chunks processed: {len(chunks)}[/green]")
-        console.print(f"[green]Average chunk size: {sum(len(c.page_content) for c in chunks)/len(chunks):.0f} characters[/green]")
+            if deduplicator is not None:
+                stats = deduplicator.stats
+                console.print(
+                    f"[blue]Deduplication: removed {stats.duplicate_chunks}/{stats.total_chunks} "
+                    f"chunks ({stats.saved_ratio:.1%}; {stats.exact_duplicates} exact, "
+                    f"{stats.near_duplicates} near), saved {stats.saved_embeddings} embeddings "
+                    f"and {stats.saved_characters} characters[/blue]"
+                )
+            if parent_store is not None:
+                parent_store.close()
+                console.print(f"[blue]Stored {parent_count} parent chunks[/blue]")
+            # Calls made in --pdf-workers processes are not included
+            from rag.llm.vision_model import vision_metrics
+            for metrics in vision_metrics():
+                console.print(
+                    f"[blue]Vision model {metrics['model']}: {metrics['calls']} calls "
+                    f"({metrics['errors']} failed), latency p50 {metrics['p50_seconds']:.2f}s, "
+                    f"p95 {metrics['p95_seconds']:.2f}s, max {metrics['max_seconds']:.2f}s[/blue]"
+                )
+
+        console.print(f"[green]Successfully ingested {document_count} documents![/green]")
+        console.print(f"[green]Total chunks processed: {stored_count}[/green]")
+        average = stored_characters / max(stored_count, 1)
+        console.print(f"[green]Average chunk size: {average:.0f} characters[/green]")
     except Exception as e:
         console.print(f"[red]Error during ingestion: {str(e)}[/red]")
         raise typer.Exit(1)
+    finally:
+        if page_cache is not None:
+            page_cache.close()
+        if reduced_store is not None:
+            # Vectors held back to fit PCA are already in the full vector
+            # sidecar; store them after an error too, so Chroma matches it
+            try:
+                reduced_store.flush()
+            except Exception as e:
+                console.print(f"[red]Error storing held back vectors: {str(e)}[/red]")
+            finally:
+                reduced_store.close()
+
+def _create_embedding_model(embedder: str, threads: Optional[int] = None,
+                            concurrency: int = 4, tokens_per_minute: int = 1_000_000):
+    """Create the embedding model selected with --embedder."""
+    from rag.embedding.embeddings import create_embedding_model
+    if embedder == "local":
+        return create_embedding_model("local", intra_op_threads=threads)
+    if embedder == "openai-async":
+        return create_embedding_model("openai-async", max_in_flight=concurrency,
+                                      tokens_per_minute=tokens_per_minute)
+    return create_embedding_model(embedder)
+
+def _ingest_batch(
+    chunks: List["Document"],
+    store: "ChromaStore",
+    embedding_model: "EmbeddingModel",
+    deduplicator: Optional["ChunkDeduplicator"] = None
+) -> List["Document"]:
+    """Deduplicate, embed and store a batch of chunks.
+
+    Returns:
+        The chunks that were stored
+    """
+    if deduplicator is not None:
+        chunks = deduplicator.deduplicate(chunks)
+        # Chunks stored with earlier batches may have gained duplicates
+        deduplicator.update_stored(store)
+
+    if not chunks:
+        return chunks
+    from rag.core.models import VectorBatch
+    # One batched call instead of a request or model run per chunk; the
+    # embeddings stay one float32 matrix until they reach the store
+    contents = [chunk.page_content for chunk in chunks]
+    vectors = VectorBatch(
+        ids=[chunk.metadata["chunk_id"] for chunk in chunks],
+        values=embedding_model.embed_documents(contents),
+        metadatas=[chunk.metadata for chunk in chunks]
+    )
+    store.store_batch(vectors, documents=contents)
+    return chunks
 
 @app.command()
 def query(
     text: str = typer.Argument(..., help="Query text"),
     top_k: int = typer.Option(5, "--top-k", "-k", help="Number of results to return"),
-    model: str = typer.Option("gpt-4o-mini", "--model", "-m", help="LLM model to use")
+    model: str = typer.Option("gpt-4o-mini", "--model", "-m", help="LLM model to use"),
+    expand_parents: bool = typer.Option(
+        False, "--expand-parents",
+        help="Search child chunks, then answer from their parent sections"
+    ),
+    embedder: str = typer.Option(
+        "openai", "--embedder",
+        help="Embedding backend used at ingestion: openai, openai-async or local"
+    ),
+    rescore: bool = typer.Option(
+        True, "--rescore/--no-rescore",
+        help="Re-rank candidates with full vectors in collections ingested with --dimensions"
+    ),
+    embed_worker: bool = typer.Option(
+        True, "--embed-worker/--no-embed-worker",
+        help="Embed with a running `rag embed-worker` instead of loading the model"
+    ),
+    server: Optional[str] = typer.Option(
+        None, "--server", envvar="RAG_SERVER",
+        help=(
+            "Send the query to `rag serve` at http://host:port or unix:///path instead of "
+            "answering it here"
+        ),
+    ),
+    trace: Optional[str] = typer.Option(
+        None, "--trace", envvar="RAG_TRACE",
+        help="Trace the query phases to: console, json (stderr), json:PATH or otel; comma-separated"
+    ),
 ):
     """Query the RAG system."""
-    try:
-        # Initialize components
-        store = ChromaStore()
-        embedding_model = EmbeddingModel()
-        llm_client = LLMClient(model_name=model)
+    from rich.markdown import Markdown
 
-        # Convert query to vector
-        query_vector = embedding_model.embed_text(text)
+    if trace:
+        from rag.core import tracing
+        tracing.configure(trace)
+    try:
+        if server:
+            # The server holds the store, embedder and LLM client; this
+            # process only sends the question
+            from rag.server.client import ServerClient
+            response = ServerClient(server).query(
+                text, top_k=top_k, model=model, expand_parents=expand_parents, rescore=rescore
+            )
+        else:
+            from rag.embedding.worker import RemoteEmbedder
+            from rag.server.service import QueryService
 
-        # Search for similar vectors
-        results = store.search_vectors(query_vector, top_k=top_k)
+            if embed_worker:
+                # Falls back to loading the model here when no worker serves it
+                embedding_model = RemoteEmbedder(
+                    embedder, fallback=lambda: _create_embedding_model(embedder)
+                )
+            else:
+                embedding_model = _create_embedding_model(embedder)
+            service = QueryService(embedding_model, model=model, reload_interval=None)
+            try:
+                response = service.query(
+                    text, top_k=top_k, expand_parents=expand_parents, rescore=rescore
+                )
+            finally:
+                service.close()
 
-        if not results:
+        if not response["results"]:
             console.print("[yellow]No relevant documents found.[/yellow]")
             return
 
-        # Convert results to Langchain Documents
-        context_docs = []
-        for result in results:
-            doc = Document(
-                page_content=result["content"],
-                metadata=result["metadata"]
-            )
-            context_docs.append(doc)
-
-        # Generate answer using LLM
-        response = llm_client.generate_answer(text, context_docs)
-
         # Display results
         console.print("\n[bold]Answer:[/bold]")
         console.print(Markdown(response["answer"]))
@@ -131,6 +367,129 @@ def query(
     except Exception as e:
         console.print(f"[red]Error during query: {str(e)}[/red]")
         raise typer.Exit(1)
+    finally:
+        if trace:
+            tracing.shutdown()
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on"),
+    port: int = typer.Option(8000, "--port", help="TCP port to listen on"),
+    socket_path: Optional[str] = typer.Option(
+        None, "--socket", help="Listen on this Unix socket instead of a TCP port"
+    ),
+    model: str = typer.Option(
+        "gpt-4o-mini", "--model", "-m", help="LLM model for queries that do not name one"
+    ),
+    embedder: str = typer.Option(
+        "openai", "--embedder",
+        help="Embedding backend used at ingestion: openai, openai-async or local"
+    ),
+    embedding_threads: Optional[int] = typer.Option(
+        None, "--embedding-threads", help="CPU threads of the local embedder (default: all CPUs)"
+    ),
+    max_concurrency: int = typer.Option(
+        8, "--max-concurrency", help="Queries processed at the same time"
+    ),
+    queue_timeout: float = typer.Option(
+        30.0, "--queue-timeout",
+        help="Seconds a query waits for a free slot before the server answers 503"
+    ),
+    reload_interval: float = typer.Option(
+        2.0, "--reload-interval", help="Seconds between checks for changes of the collection"
+    ),
+    metrics: bool = typer.Option(
+        True, "--metrics/--no-metrics",
+        help="Record span latency histograms and serve them at /metrics"
+    ),
+    trace: Optional[str] = typer.Option(
+        None, "--trace", envvar="RAG_TRACE",
+        help="Also export spans to: console, json (stderr), json:PATH or otel; comma-separated"
+    ),
+):
+    """Keep the store, embedder and LLM client open and answer queries over HTTP."""
+    import signal
+    import threading
+
+    from rag.core import tracing
+    from rag.server.server import create_server
+    from rag.server.service import QueryService
+
+    try:
+        histograms = tracing.add_exporter(tracing.LatencyHistograms()) if metrics else None
+        if trace:
+            tracing.configure(trace)
+        service = QueryService(
+            _create_embedding_model(embedder, embedding_threads),
+            model=model,
+            max_concurrency=max_concurrency,
+            queue_timeout=queue_timeout,
+            reload_interval=reload_interval
+        )
+        http_server = create_server(
+            service, host=host, port=port, socket_path=socket_path, metrics=histograms
+        )
+    except Exception as e:
+        console.print(f"[red]Error starting the server: {str(e)}[/red]")
+        raise typer.Exit(1) from e
+
+    if hasattr(signal, "SIGHUP"):
+        # kill -HUP reopens the collection, e.g. after ingesting elsewhere
+        signal.signal(
+            signal.SIGHUP,
+            lambda *_: threading.Thread(target=service.reload, args=(True,)).start(),
+        )
+    console.print(f"[green]Serving queries on {http_server.url} (Ctrl+C to stop)[/green]")
+    console.print(f"[green]Query it with: rag query \"...\" --server {http_server.url}[/green]")
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+        service.close()
+        tracing.shutdown()
+
+@app.command("embed-worker")
+def embed_worker(
+    embedder: str = typer.Option(
+        "local", "--embedder", help="Embedding backend to serve: openai, openai-async or local"
+    ),
+    embedding_threads: Optional[int] = typer.Option(
+        None, "--embedding-threads", help="CPU threads of the local embedder (default: all CPUs)"
+    ),
+    address: Optional[str] = typer.Option(
+        None, "--address",
+        help=(
+            "Socket path (pipe name on Windows), default from RAG_EMBED_WORKER_ADDRESS "
+            "or the temp directory"
+        ),
+    ),
+):
+    """Keep an embedding model loaded and serve it to `rag query` invocations."""
+    from rag.embedding.worker import EmbeddingWorker
+
+    try:
+        embedding_model = _create_embedding_model(embedder, embedding_threads)
+        # The first call initializes lazily loaded models
+        embedding_model.embed_query("warm-up")
+        worker = EmbeddingWorker(embedding_model, embedder, address=address)
+    except Exception as e:
+        console.print(f"[red]Error loading the embedding model: {str(e)}[/red]")
+        raise typer.Exit(1) from e
+
+    console.print(
+        f"[green]Serving the {embedder} embedder on {worker.address} (Ctrl+C to stop)[/green]"
+    )
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        console.print(f"[red]Error in the embedding worker: {str(e)}[/red]")
+        raise typer.Exit(1) from e
+    finally:
+        worker.close()
 
 @app.command()
 def clear(
@@ -144,10 +503,18 @@ def clear(
         if not confirm:
             console.print("Operation cancelled.")
             raise typer.Exit()
-    
+
+    from rag.store.chroma_store import ChromaStore
+    from rag.store.parent_store import ParentStore
+    from rag.store.reduced_store import ReducedVectorStore
+
     try:
         store = ChromaStore(settings.chroma_db_path)
         store.clear()
+        ReducedVectorStore.remove_files(store)
+        parent_store = ParentStore()
+        parent_store.clear()
+        parent_store.close()
         console.print(Panel("✅ All documents cleared successfully!", style="green"))
     except Exception as e:
         console.print(Panel(f"❌ Error: {str(e)}", style="red"))
@@ -161,6 +528,8 @@ def chunks(
     top_k: Optional[int] = typer.Option(None, "--top-k", "-k", help="Number of chunks to show (default: all chunks)")
 ):
     """Show chunks for a specific document."""
+    from rag.store.chroma_store import ChromaStore
+
     try:
         # Initialize components
         store = ChromaStore()
@@ -191,5 +560,70 @@ def chunks(
         console.print(f"[red]Error retrieving chunks: {str(e)}[/red]")
         raise typer.Exit(1)
 
+@app.command()
+def bench(
+    queries: Optional[str] = typer.Option(
+        None, "--queries",
+        help="JSON lines with question, source and page; a generated corpus is used if not given"
+    ),
+    documents: Optional[str] = typer.Option(
+        None, "--documents", help="File or directory of the documents the queries refer to"
+    ),
+    chunk_sizes: List[int] = typer.Option(
+        [300, 600, 1200], "--chunk-size",
+        help="Chunk size to compare; repeat the option for several"
+    ),
+    overlap: float = typer.Option(
+        0.1, "--overlap", help="Chunk overlap as a fraction of the chunk size"
+    ),
+    top_k: List[int] = typer.Option(
+        [1, 5, 10], "--top-k", "-k", help="k of recall@k; repeat the option for several"
+    ),
+    stores: List[str] = typer.Option(
+        ["memory"], "--store",
+        help="Store to compare: memory (exact search) or chroma; repeat the option for several"
+    ),
+    embedder: str = typer.Option(
+        "hashing", "--embedder",
+        help="Embedding backend: hashing (offline, no model), local, openai or openai-async"
+    ),
+    corpus_documents: int = typer.Option(
+        5, "--corpus-documents", help="Documents of the generated corpus"
+    ),
+    corpus_pages: int = typer.Option(10, "--corpus-pages", help="Pages per generated document"),
+    output: Optional[str] = typer.Option(
+        None, "--output", help="Write the JSON report to this file"
+    ),
+):
+    """Measure recall@k, MRR, latency and memory of retrieval configurations."""
+    import json
+
+    from rag.bench import retrieval
+
+    try:
+        pages, labelled_queries, corpus = retrieval.prepare(
+            queries, documents, documents=corpus_documents, pages=corpus_pages
+        )
+        if not pages or not labelled_queries:
+            raise ValueError("Need at least one page and one query")
+        console.print(
+            f"[green]Running {len(labelled_queries)} queries against {len(pages)} pages[/green]"
+        )
+        report = retrieval.run(
+            pages, labelled_queries, _create_embedding_model(embedder),
+            chunk_sizes=chunk_sizes, top_k=top_k, stores=stores, overlap=overlap,
+            embedder=embedder, corpus=corpus
+        )
+    except Exception as e:
+        console.print(f"[red]Error during benchmark: {str(e)}[/red]")
+        raise typer.Exit(1) from e
+
+    for line in retrieval.summary_lines(report):
+        console.print(line)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        console.print(f"[green]Report written to {output}[/green]")
+
 if __name__ == "__main__":
     app() 
\ No newline at end of file
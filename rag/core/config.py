@@ -16,6 +16,8 @@ class Settings(BaseSettings):
     AZURE_OCR_ENDPOINT: Optional[str] = None
     AZURE_OCR_KEY: Optional[str] = None
     AZURE_OCR_REGION: str = "westeurope"
+    AZURE_OCR_MAX_CONCURRENCY: int = 4
+    AZURE_OCR_PAGES_PER_REQUEST: int = 50
     
 
 
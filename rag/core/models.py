@@ -1,6 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
 from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
 
 @dataclass
 class Document:
@@ -38,18 +41,84 @@ class Chunk:
         self.content = content
         self.metadata = metadata or {}
 
-@dataclass
+@dataclass(eq=False)
 class Vector:
-    """Represents a vector embedding."""
+    """Represents a vector embedding.
+
+    The values are kept as a float32 NumPy array; arrays that already are
+    float32 are used without a copy.
+    """
     id: str
-    values: List[float]
+    values: np.ndarray
     metadata: Dict[str, Any]
 
-    def __init__(self, id: str, values: List[float], metadata: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        id: str,
+        values: Union[np.ndarray, Sequence[float]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
         self.id = id
-        self.values = values
+        self.values = np.asarray(values, dtype=np.float32)
         self.metadata = metadata or {}
 
+@dataclass(eq=False)
+class VectorBatch:
+    """A batch of embeddings stored as one contiguous (n, d) float32 matrix.
+
+    Embedders produce batches and stores consume them, so vectors travel from
+    the model to the store without being boxed into Python floats. Indexing a
+    batch returns a Vector whose values are a view of the matrix row.
+    """
+    ids: List[str]
+    values: np.ndarray
+    metadatas: List[Dict[str, Any]]
+
+    def __init__(self, ids: List[str], values: Union[np.ndarray, Sequence[Sequence[float]]],
+                 metadatas: Optional[List[Dict[str, Any]]] = None):
+        values = np.ascontiguousarray(values, dtype=np.float32)
+        if values.ndim == 1 and values.size == 0:
+            values = values.reshape(0, 0)
+        if values.ndim != 2:
+            raise ValueError(f"Expected an (n, d) matrix, got shape {values.shape}")
+        if len(ids) != values.shape[0]:
+            raise ValueError(f"Got {len(ids)} ids for {values.shape[0]} vectors")
+        if metadatas is not None and len(metadatas) != len(ids):
+            raise ValueError(f"Got {len(metadatas)} metadatas for {len(ids)} vectors")
+        self.ids = list(ids)
+        self.values = values
+        self.metadatas = list(metadatas) if metadatas is not None else [{} for _ in ids]
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[Vector]) -> "VectorBatch":
+        """Stack single vectors into a batch."""
+        if not vectors:
+            return cls([], np.empty((0, 0), dtype=np.float32))
+        return cls(
+            ids=[vector.id for vector in vectors],
+            values=np.stack([vector.values for vector in vectors]),
+            metadatas=[vector.metadata for vector in vectors]
+        )
+
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension."""
+        return self.values.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Vector:
+        return Vector(id=self.ids[index], values=self.values[index], metadata=self.metadatas[index])
+
+    def __iter__(self) -> Iterator[Vector]:
+        return (self[index] for index in range(len(self)))
+
+    def normalized(self) -> np.ndarray:
+        """Rows scaled to unit length, e.g. for cosine similarity by dot product."""
+        norms = np.linalg.norm(self.values, axis=1, keepdims=True)
+        return self.values / np.maximum(norms, np.float32(1e-12))
+
 @dataclass
 class Prompt:
     """Represents a prompt template with variables."""
@@ -0,0 +1,416 @@
+"""Tracing spans for the query path.
+
+Code marks its phases with ``span``:
+
+    with tracing.span("search", top_k=top_k):
+        results = store.search_vectors(query_vector, top_k)
+
+Spans nest by context, so a query's embed, search, rerank, prompt build and
+LLM spans end up as children of its root span. Finished spans go to the
+configured exporters:
+
+- ``ConsoleExporter`` prints each finished trace as an indented tree to stderr.
+- ``JSONExporter`` writes one JSON line per span.
+- ``OpenTelemetryExporter`` re-creates the spans with the OpenTelemetry API.
+- ``LatencyHistograms`` aggregates durations into Prometheus histograms.
+
+Without exporters, tracing is disabled and ``span`` returns a shared no-op
+object without creating anything, so instrumented code costs one function
+call per span.
+"""
+
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+logger = logging.getLogger("tracing")
+
+# Default latency buckets in seconds; LLM calls need the long tail
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_ids = itertools.count(1)
+
+
+class Span:
+    """A finished or running span."""
+
+    __slots__ = (
+        "name", "attributes", "trace_id", "span_id", "parent_id", "start_ns", "duration", "_start"
+    )
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else self.span_id
+        self.start_ns = time.time_ns()
+        self.duration = 0.0
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Add an attribute, e.g. a result count known only at the end."""
+        self.attributes[key] = value
+
+    @property
+    def end_ns(self) -> int:
+        return self.start_ns + int(self.duration * 1e9)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_current: ContextVar[Optional[Span]] = ContextVar("rag_current_span", default=None)
+_exporters: List[Any] = []
+_exporters_lock = threading.Lock()
+
+
+class _SpanContext:
+    __slots__ = ("span", "_token")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.span = Span(name, attributes, _current.get())
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current.set(self.span)
+        self.span._start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        self.span.duration = time.perf_counter() - self.span._start
+        if exc_type is not None:
+            self.span.attributes["error"] = exc_type.__name__
+        _current.reset(self._token)
+        _export(self.span)
+
+
+def enabled() -> bool:
+    """Whether any exporter is configured."""
+    return bool(_exporters)
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Context manager timing a phase as a child of the current span.
+
+    Args:
+        name: Span name, e.g. "embed" or "llm.total"
+        **attributes: Attributes recorded with the span
+
+    Returns:
+        Context manager yielding the Span, or a no-op while disabled
+    """
+    if not _exporters:
+        return _NOOP_SPAN
+    return _SpanContext(name, attributes)
+
+
+def record_span(name: str, start: float, end: Optional[float] = None, **attributes: Any) -> None:
+    """Record a span measured by the caller, e.g. the time to an LLM's first token.
+
+    Args:
+        name: Span name
+        start: time.perf_counter() at the start
+        end: time.perf_counter() at the end, defaults to now
+        **attributes: Attributes recorded with the span
+    """
+    if not _exporters:
+        return
+    now = time.perf_counter()
+    finished = Span(name, attributes, _current.get())
+    finished.duration = (now if end is None else end) - start
+    finished.start_ns -= int((now - start) * 1e9)
+    _export(finished)
+
+
+def _export(finished: Span) -> None:
+    for exporter in list(_exporters):
+        try:
+            exporter.export(finished)
+        except Exception as e:
+            logger.warning(
+                f"Exporting span {finished.name} with {type(exporter).__name__} failed: {e}"
+            )
+
+
+def add_exporter(exporter: Any) -> Any:
+    """Send finished spans to an exporter, enabling tracing."""
+    with _exporters_lock:
+        _exporters.append(exporter)
+    return exporter
+
+
+def remove_exporter(exporter: Any) -> None:
+    """Stop sending spans to an exporter."""
+    with _exporters_lock:
+        if exporter in _exporters:
+            _exporters.remove(exporter)
+
+
+def shutdown() -> None:
+    """Flush and remove all exporters, disabling tracing."""
+    with _exporters_lock:
+        exporters = list(_exporters)
+        _exporters.clear()
+    for exporter in exporters:
+        close = getattr(exporter, "shutdown", None)
+        if close is not None:
+            close()
+
+
+def configure(spec: Optional[str]) -> List[Any]:
+    """Add exporters from a comma-separated specification.
+
+    Args:
+        spec: Any of "console", "json" (stderr), "json:PATH" and "otel",
+            e.g. "console,json:traces.jsonl"; the RAG_TRACE environment
+            variable is used if None
+
+    Returns:
+        The added exporters
+    """
+    spec = os.getenv("RAG_TRACE") if spec is None else spec
+    exporters = []
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        kind, _, argument = item.partition(":")
+        if kind == "console":
+            exporters.append(ConsoleExporter())
+        elif kind == "json":
+            exporters.append(JSONExporter(argument or None))
+        elif kind == "otel":
+            exporters.append(OpenTelemetryExporter())
+        else:
+            raise ValueError(
+                f"Unsupported trace exporter: {kind}. Supported exporters: console, json, otel"
+            )
+    for exporter in exporters:
+        add_exporter(exporter)
+    return exporters
+
+
+class _TraceBuffer:
+    """Collects the spans of each trace until its root span ends."""
+
+    def __init__(self):
+        self._traces: Dict[int, List[Span]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, finished: Span) -> Optional[List[Span]]:
+        """Add a span; returns the whole trace, by start time, once its root ended."""
+        with self._lock:
+            spans = self._traces.setdefault(finished.trace_id, [])
+            spans.append(finished)
+            if finished.parent_id is not None:
+                return None
+            del self._traces[finished.trace_id]
+        return sorted(spans, key=lambda item: item.start_ns)
+
+
+class ConsoleExporter:
+    """Print every finished trace as an indented tree of durations."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+        self._buffer = _TraceBuffer()
+
+    def export(self, finished: Span) -> None:
+        spans = self._buffer.add(finished)
+        if spans is None:
+            return
+        depths = {}
+        lines = []
+        for item in spans:
+            depth = depths.get(item.parent_id, -1) + 1
+            depths[item.span_id] = depth
+            attributes = " ".join(f"{key}={value}" for key, value in item.attributes.items())
+            lines.append(f"{'  ' * depth}{item.name:<{max(1, 24 - 2 * depth)}} "
+                         f"{item.duration * 1000:9.1f} ms  {attributes}".rstrip())
+        print("\n".join(lines), file=self.stream or sys.stderr)
+
+
+class JSONExporter:
+    """Write one JSON object per finished span, to a file or stderr."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8") if path else None
+        self._lock = threading.Lock()
+
+    def export(self, finished: Span) -> None:
+        line = json.dumps(finished.to_dict(), default=str)
+        with self._lock:
+            stream = self._file or sys.stderr
+            stream.write(line + "\n")
+            stream.flush()
+
+    def shutdown(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class OpenTelemetryExporter:
+    """Re-create finished traces as OpenTelemetry spans.
+
+    Spans go to the tracer provider configured for the process, e.g. by
+    ``opentelemetry-instrument``. Without one, and if the SDK and the OTLP
+    exporter are installed, a provider exporting over OTLP is set up, which
+    reads the standard OTEL_EXPORTER_OTLP_* environment variables.
+    """
+
+    def __init__(self, tracer: Any = None):
+        """
+        Args:
+            tracer: OpenTelemetry tracer, defaults to the global "rag" tracer
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryExporter requires opentelemetry-api. Install it with "
+                "`pip install rag-system[tracing]`."
+            ) from e
+        self._trace = trace
+        self._provider = None
+        if tracer is None:
+            self._provider = _default_otel_provider(trace)
+            tracer = trace.get_tracer("rag")
+        self.tracer = tracer
+        self._buffer = _TraceBuffer()
+
+    def export(self, finished: Span) -> None:
+        # OpenTelemetry needs a parent before its children, so traces are
+        # sent once complete, in start order
+        spans = self._buffer.add(finished)
+        if spans is None:
+            return
+        created = {}
+        for item in spans:
+            parent = created.get(item.parent_id)
+            context = self._trace.set_span_in_context(parent) if parent is not None else None
+            attributes = {key: value if isinstance(value, (bool, int, float, str)) else str(value)
+                          for key, value in item.attributes.items()}
+            created[item.span_id] = self.tracer.start_span(
+                item.name, context=context, start_time=item.start_ns, attributes=attributes
+            )
+        for item in spans:
+            created[item.span_id].end(end_time=item.end_ns)
+
+    def shutdown(self) -> None:
+        provider = self._provider or self._trace.get_tracer_provider()
+        flush = getattr(provider, "force_flush", None)
+        if flush is not None:
+            flush()
+
+
+def _default_otel_provider(trace: Any) -> Any:
+    """Set up an OTLP-exporting provider if the process has none."""
+    if not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        return None
+    try:
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning("No OpenTelemetry tracer provider is configured and the SDK or the OTLP "
+                       "exporter is missing; spans are dropped")
+        return None
+    provider = TracerProvider(resource=Resource.create({"service.name": "rag"}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+class LatencyHistograms:
+    """Cumulative latency histograms of spans, by span name."""
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        metric: str = "rag_span_duration_seconds",
+    ):
+        """
+        Args:
+            buckets: Upper bounds of the buckets in seconds
+            metric: Prometheus metric name
+        """
+        self.buckets = sorted(buckets)
+        self.metric = metric
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def export(self, finished: Span) -> None:
+        self.observe(finished.name, finished.duration)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Count a duration."""
+        with self._lock:
+            counts = self._counts.setdefault(name, [0] * (len(self.buckets) + 1))
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[name] = self._sums.get(name, 0.0) + seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Count and sum of the durations per span name."""
+        with self._lock:
+            return {
+                name: {"count": sum(counts), "sum": self._sums[name]}
+                for name, counts in self._counts.items()
+            }
+
+    def render(self) -> str:
+        """Histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {self.metric} Duration of traced spans of the RAG query path",
+            f"# TYPE {self.metric} histogram",
+        ]
+        with self._lock:
+            for name in sorted(self._counts):
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip(self.buckets, self._counts[name]):
+                    cumulative += count
+                    lines.append(
+                        f'{self.metric}_bucket{{span="{label}",le="{bound:g}"}} {cumulative}'
+                    )
+                cumulative += self._counts[name][-1]
+                lines.append(f'{self.metric}_bucket{{span="{label}",le="+Inf"}} {cumulative}')
+                lines.append(f'{self.metric}_sum{{span="{label}"}} {self._sums[name]:.6f}')
+                lines.append(f'{self.metric}_count{{span="{label}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
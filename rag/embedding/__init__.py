@@ -1,6 +1,28 @@
 """
 Embedding generation components.
+
+Components are imported on first access, so that importing the package does
+not load sentence-transformers or ONNX Runtime.
 """
 
-from .embedder import BaseEmbedder
-from .text_embedder import TextEmbedder 
\ No newline at end of file
+from importlib import import_module
+
+_EXPORTS = {
+    "BaseEmbedder": ".embedder",
+    "TextEmbedder": ".text_embedder",
+    "LocalEmbeddingEngine": ".local_embedder",
+    "HashingEmbedder": ".hashing_embedder",
+    "AsyncEmbeddingClient": ".async_client",
+    "QueryMicroBatcher": ".micro_batcher",
+    "EmbeddingWorker": ".worker",
+    "RemoteEmbedder": ".worker",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
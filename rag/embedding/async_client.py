@@ -0,0 +1,381 @@
+"""Async client for the OpenAI embeddings API.
+
+The client keeps up to ``max_in_flight`` requests running and sizes each
+request adaptively: batches grow additively while responses arrive faster than
+``target_latency`` and are halved when they are slower or throttled (AIMD).
+A token bucket keeps the estimated tokens per minute below the account limit,
+and throttled or failed requests are retried with jittered exponential backoff,
+honouring the server's Retry-After. A 429 pauses all requests of the client,
+not just the throttled one, so a rate limit slows an ingest run down instead
+of failing it.
+
+The token bucket, the in-flight limit and the HTTP connections belong to the
+client and run on its own event loop thread, so the limits hold across calls,
+e.g. the per-batch embed_documents calls of an ingest run.
+
+Embeddings are requested base64-encoded and decoded straight into float32
+arrays.
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import httpx
+import numpy as np
+
+logger = logging.getLogger("async_embedding_client")
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text, about four characters per token."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Token bucket limiting the tokens sent per minute.
+
+    The bucket starts full and refills continuously. A request larger than
+    the whole bucket waits until the bucket is full and then drains it.
+    """
+
+    def __init__(self, tokens_per_minute: int, capacity: Optional[int] = None):
+        """
+        Args:
+            tokens_per_minute: Refill rate
+            capacity: Burst size, defaults to one minute of tokens
+        """
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = float(capacity or tokens_per_minute)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given time, e.g. after a 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until the tokens are available and take them."""
+        tokens = min(float(tokens), self.capacity)
+        # The lock keeps waiting requests in order
+        async with self._lock:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class AdaptiveBatchSizer:
+    """Additive-increase, multiplicative-decrease batch size toward a target latency."""
+
+    def __init__(self, initial: int = 64, minimum: int = 1, maximum: int = 2048,
+                 target_latency: float = 2.0, increase: int = 16):
+        """
+        Args:
+            initial: Texts in the first batches
+            minimum: Smallest batch size
+            maximum: Largest batch size, 2048 is the API limit
+            target_latency: Request latency in seconds the batches grow toward
+            increase: Texts added after each fast response
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = min(self.maximum, max(self.minimum, initial))
+        self.target_latency = target_latency
+        self.increase = increase
+
+    def record(self, latency: float, batch_size: int) -> None:
+        """Adapt the size to the latency of a finished request."""
+        if latency > self.target_latency:
+            self.size = max(self.minimum, min(self.size, batch_size) // 2)
+        elif batch_size >= self.size:
+            # Only full-size batches show whether a larger one would be fast enough
+            self.size = min(self.maximum, self.size + self.increase)
+
+    def throttled(self) -> None:
+        """Halve the size after a rate limit response."""
+        self.size = max(self.minimum, self.size // 2)
+
+
+class AsyncEmbeddingClient:
+    """Embeddings API client with adaptive batching and rate limiting.
+
+    Offers the embed_documents/embed_query interface of EmbeddingModel and
+    returns float32 arrays.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "text-embedding-ada-002",
+        base_url: Optional[str] = None,
+        dimensions: Optional[int] = None,
+        max_in_flight: int = 4,
+        tokens_per_minute: int = 1_000_000,
+        target_latency: float = 2.0,
+        initial_batch_size: int = 64,
+        max_batch_size: int = 2048,
+        max_batch_tokens: int = 250_000,
+        max_retries: int = 6,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+        timeout: float = 60.0
+    ):
+        """
+        Args:
+            api_key: OpenAI API key. If not provided, will use OPENAI_API_KEY env var
+            model: Embedding model, by default the one of EmbeddingModel
+            base_url: API base URL, defaults to OPENAI_BASE_URL or the OpenAI API
+            dimensions: Output dimensions for text-embedding-3 models
+            max_in_flight: Maximum concurrent requests
+            tokens_per_minute: Token limit of the account for the model
+            target_latency: Request latency in seconds batches are sized for
+            initial_batch_size: Texts in the first requests
+            max_batch_size: Maximum texts per request
+            max_batch_tokens: Maximum estimated tokens per request
+            max_retries: Retries per request
+            retry_delay: Base delay in seconds for the exponential backoff
+            max_retry_delay: Upper bound of a single backoff delay
+            timeout: Request timeout in seconds
+        """
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError(
+                "OpenAI API key must be provided or set in OPENAI_API_KEY environment variable"
+            )
+        self.model = model
+        self.base_url = (base_url or os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1").rstrip("/")
+        self.dimensions = dimensions
+        self.max_in_flight = max(1, max_in_flight)
+        self.tokens_per_minute = tokens_per_minute
+        self.max_batch_tokens = max_batch_tokens
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.timeout = timeout
+        self.sizer = AdaptiveBatchSizer(
+            initial_batch_size, maximum=max_batch_size, target_latency=target_latency
+        )
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "texts": 0, "tokens": 0}
+        # Shared by all calls; used only on the client's event loop
+        self.bucket = TokenBucket(tokens_per_minute)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """The client's event loop, started in a daemon thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="async-embedding-client", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            limits = httpx.Limits(
+                max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight
+            )
+            self._http = httpx.AsyncClient(base_url=self.base_url, headers=headers,
+                                           timeout=self.timeout, limits=limits)
+        return self._http
+
+    def close(self) -> None:
+        """Close the connections and stop the event loop thread."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._http is not None:
+            asyncio.run_coroutine_threadsafe(self._http.aclose(), loop).result()
+            self._http = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+    def _next_batch(self, texts: Sequence[str], start: int) -> Tuple[int, int]:
+        """End index and estimated tokens of the batch starting at start."""
+        end = start
+        tokens = 0
+        limit = min(len(texts), start + self.sizer.size)
+        while end < limit:
+            text_tokens = estimate_tokens(texts[end])
+            if end > start and tokens + text_tokens > self.max_batch_tokens:
+                break
+            tokens += text_tokens
+            end += 1
+        return end, tokens
+
+    async def embed_documents_async(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts with concurrent, adaptively sized requests.
+
+        Runs on the client's event loop, also when awaited from another one.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimension), in the order of texts
+        """
+        loop = self._event_loop()
+        if asyncio.get_running_loop() is loop:
+            return await self._embed(list(texts))
+        future = asyncio.run_coroutine_threadsafe(self._embed(list(texts)), loop)
+        return await asyncio.wrap_future(future)
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+
+        client = self._client()
+        batches: Dict[int, np.ndarray] = {}
+        tasks = []
+        started: Set[int] = set()
+        try:
+            start = 0
+            while start < len(texts):
+                await self._semaphore.acquire()
+                # Sized when a slot frees up, so it reflects the latest responses
+                end, tokens = self._next_batch(texts, start)
+                try:
+                    await self.bucket.acquire(tokens)
+                except BaseException:
+                    self._semaphore.release()
+                    raise
+                tasks.append(asyncio.ensure_future(
+                    self._embed_batch(client, texts[start:end], tokens, start, batches, started)
+                ))
+                start = end
+                failed = [task for task in tasks if task.done() and task.exception() is not None]
+                if failed:
+                    await failed[0]
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # A task cancelled before it ran never released its slot
+            for _ in range(len(tasks) - len(started)):
+                self._semaphore.release()
+
+        return np.concatenate([batches[start] for start in sorted(batches)])
+
+    async def _embed_batch(self, client: httpx.AsyncClient, texts: List[str], tokens: int,
+                           start: int, batches: Dict[int, np.ndarray], started: Set[int]) -> None:
+        """Send one batch, retrying throttled and transient failures.
+
+        Releases the semaphore slot acquired for it; ``start`` is added to
+        ``started`` so the caller can tell which tasks never ran.
+        """
+        started.add(start)
+        payload: Dict[str, Any] = {"model": self.model, "input": texts, "encoding_format": "base64"}
+        if self.dimensions:
+            payload["dimensions"] = self.dimensions
+        try:
+            for attempt in range(self.max_retries + 1):
+                request_start = time.monotonic()
+                retry_after = None
+                try:
+                    response = await client.post("/embeddings", json=payload)
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        response.raise_for_status()
+                        self.sizer.record(time.monotonic() - request_start, len(texts))
+                        batches[start] = _decode_embeddings(response.json())
+                        self.stats["requests"] += 1
+                        self.stats["texts"] += len(texts)
+                        self.stats["tokens"] += tokens
+                        return
+                    error = f"HTTP {response.status_code}"
+                    retry_after = _retry_after(response)
+                    if response.status_code == 429:
+                        self.stats["throttled"] += 1
+                        self.sizer.throttled()
+                except (httpx.TransportError, httpx.TimeoutException) as e:
+                    error = f"{type(e).__name__}: {e}"
+
+                if attempt >= self.max_retries:
+                    raise RuntimeError(
+                        f"Embedding request failed after {attempt + 1} attempts: {error}"
+                    )
+                # Exponential backoff with jitter so concurrent requests do not retry in lockstep
+                delay = self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+                if retry_after is not None:
+                    delay = retry_after + random.uniform(0, self.retry_delay)
+                    self.bucket.pause(retry_after)
+                delay = min(delay, self.max_retry_delay)
+                self.stats["retries"] += 1
+                logger.warning(f"Embedding request of {len(texts)} texts failed ({error}), "
+                               f"retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+        finally:
+            self._semaphore.release()
+
+    def embed_documents(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts; blocking wrapper around embed_documents_async.
+
+        Must not be called from a coroutine running on the client's event loop.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._embed(list(texts)), self._event_loop())
+        return future.result()
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a single query as a float32 vector."""
+        return self.embed_documents([text])[0]
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """Embed a single text string."""
+        return self.embed_query(text)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Delay requested by the server in seconds, if any."""
+    milliseconds = response.headers.get("retry-after-ms")
+    if milliseconds is not None:
+        try:
+            return float(milliseconds) / 1000
+        except ValueError:
+            pass
+    seconds = response.headers.get("retry-after")
+    if seconds is not None:
+        try:
+            return float(seconds)
+        except ValueError:
+            return None
+    return None
+
+
+def _decode_embeddings(body: Dict[str, Any]) -> np.ndarray:
+    """Embeddings of a response as a float32 matrix in input order."""
+    data = sorted(body["data"], key=lambda item: item["index"])
+    rows = [
+        np.frombuffer(base64.b64decode(item["embedding"]), dtype="<f4")
+        if isinstance(item["embedding"], str) else np.asarray(item["embedding"], dtype=np.float32)
+        for item in data
+    ]
+    return np.stack(rows).astype(np.float32, copy=False)
@@ -1,7 +1,11 @@
-from typing import Dict, Any
-from ..core.interfaces import IEmbedder
-from ..core.models import Vector
 import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..core.interfaces import IEmbedder
+from ..core.models import Vector, VectorBatch
+
 
 class BaseEmbedder(IEmbedder):
     """Base class for embedding generators."""
@@ -13,7 +17,20 @@ class BaseEmbedder(IEmbedder):
         """Generate embeddings for text."""
         raise NotImplementedError("Subclasses must implement embed()")
     
-    def _create_vector(self, values: list[float], metadata: Dict[str, Any]) -> Vector:
+    def embed_batch(
+        self, texts: List[str], metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> VectorBatch:
+        """Generate embeddings for several texts.
+
+        Subclasses should override this with a batched model call; the default
+        embeds one text at a time.
+        """
+        metadatas = metadatas or [{} for _ in texts]
+        return VectorBatch.from_vectors(
+            [self.embed(text, metadata) for text, metadata in zip(texts, metadatas)]
+        )
+
+    def _create_vector(self, values: np.ndarray, metadata: Dict[str, Any]) -> Vector:
         """Create a new vector with metadata."""
         return Vector(
             id=str(uuid.uuid4()),
@@ -1,7 +1,8 @@
-from typing import List
+from typing import Any, List
 
 from langchain_openai import OpenAIEmbeddings
 
+
 class EmbeddingModel:
     """Handles text embedding operations."""
 
@@ -18,4 +19,36 @@ class EmbeddingModel:
         
     def embed_text(self, text: str) -> List[float]:
         """Embed a single text string."""
-        return self.embed_query(text) 
\ No newline at end of file
+        return self.embed_query(text)
+
+# Embedding backends selectable with --embedder
+EMBEDDERS = ("openai", "openai-async", "local", "hashing")
+
+def create_embedding_model(embedder: str = "openai", **options: Any):
+    """Create an embedding model by backend name.
+
+    Args:
+        embedder: "openai" for the OpenAI API, "openai-async" for the same
+            API with concurrent, rate-limited requests, "local" for the ONNX
+            Runtime engine on the CPU or "hashing" for the model-free
+            HashingEmbedder used in offline benchmarks
+        **options: Arguments of AsyncEmbeddingClient, LocalEmbeddingEngine
+            or HashingEmbedder
+
+    Returns:
+        Object with embed_documents, embed_query and embed_text
+    """
+    if embedder == "openai":
+        return EmbeddingModel()
+    if embedder == "openai-async":
+        from .async_client import AsyncEmbeddingClient
+        return AsyncEmbeddingClient(**options)
+    if embedder == "local":
+        from .local_embedder import LocalEmbeddingEngine
+        return LocalEmbeddingEngine(**options)
+    if embedder == "hashing":
+        from .hashing_embedder import HashingEmbedder
+        return HashingEmbedder(**options)
+    raise ValueError(
+        f"Unsupported embedder: {embedder}. Supported embedders: {', '.join(EMBEDDERS)}"
+    )
@@ -0,0 +1,71 @@
+"""Feature-hashing embedder that needs no model, network or API key.
+
+Words and word bigrams are hashed into a fixed number of dimensions with a
+random sign, weighted by 1 + log(count) and normalized. Texts that share
+words get similar vectors, which is lexical rather than semantic similarity,
+but deterministic and fast enough for benchmarks, tests and offline runs.
+"""
+
+import re
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+DEFAULT_HASHING_DIMENSION = 1024
+
+_WORD = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """Embeds texts by hashing their words and bigrams into a float32 vector.
+
+    Offers the embed_documents/embed_query interface of EmbeddingModel and
+    returns float32 arrays like LocalEmbeddingEngine.
+    """
+
+    def __init__(self, dimension: int = DEFAULT_HASHING_DIMENSION, bigrams: bool = True):
+        """
+        Args:
+            dimension: Length of the vectors
+            bigrams: Also hash pairs of consecutive words, so word order
+                contributes a little
+        """
+        if dimension < 1:
+            raise ValueError("dimension must be positive")
+        self._dimension = dimension
+        self.bigrams = bigrams
+
+    @property
+    def dimension(self) -> int:
+        """Length of the embedding vectors."""
+        return self._dimension
+
+    def _features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        if self.bigrams:
+            return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+        return words
+
+    def embed_documents(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts into an (n, dimension) float32 matrix of unit rows."""
+        matrix = np.zeros((len(texts), self._dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = {}
+            for feature in self._features(text):
+                # crc32 is stable across processes, unlike hash()
+                digest = zlib.crc32(feature.encode("utf-8"))
+                counts[digest] = counts.get(digest, 0) + 1
+            for digest, count in counts.items():
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                matrix[row, digest % self._dimension] += sign * (1.0 + np.log(count))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, np.float32(1e-12))
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a single query into a (dimension,) float32 vector."""
+        return self.embed_documents([text])[0]
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """Embed a single text into a (dimension,) float32 vector."""
+        return self.embed_query(text)
@@ -0,0 +1,190 @@
+"""Local embedding engine for CPU-only ingestion.
+
+Texts are tokenized in one call, sorted by token count and run through an ONNX
+Runtime session in batches of similar length, so hardly any compute is spent on
+padding. By default the int8-quantized export of the model is used. Embeddings
+are mean-pooled, normalized and returned as one float32 NumPy matrix in input
+order. Requires the ``onnxruntime`` and ``tokenizers`` packages
+(``pip install rag-system[local]``).
+"""
+
+import importlib.util
+import logging
+import os
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger("local_embedder")
+
+DEFAULT_LOCAL_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# ONNX exports published in the sentence-transformers model repositories
+ONNX_MODEL_FILE = "onnx/model.onnx"
+QUANTIZED_ONNX_MODEL_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+class LocalEmbeddingEngine:
+    """Batched sentence embeddings with ONNX Runtime on the CPU.
+
+    Offers the embed_documents/embed_query interface of EmbeddingModel, but
+    returns float32 arrays instead of lists.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_LOCAL_MODEL,
+        model_path: Optional[Union[str, Path]] = None,
+        quantized: bool = True,
+        onnx_file: Optional[str] = None,
+        batch_size: int = 64,
+        max_length: int = 256,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: int = 1,
+        normalize: bool = True,
+        session: Optional[Any] = None,
+        tokenizer: Optional[Any] = None
+    ):
+        """
+        Args:
+            model_name: Hugging Face repository of the model, used when no
+                model_path is given
+            model_path: Local directory with tokenizer.json and the ONNX file
+            quantized: Use the int8-quantized ONNX export
+            onnx_file: ONNX file relative to the model directory, overrides
+                quantized
+            batch_size: Texts per inference batch
+            max_length: Maximum tokens per text; longer texts are truncated
+            intra_op_threads: Threads used within an operator, defaults to the
+                number of CPUs
+            inter_op_threads: Threads used across operators
+            normalize: L2-normalize the embeddings, so that the dot product is
+                the cosine similarity
+            session: Prepared ONNX Runtime session, mainly for tests
+            tokenizer: Prepared ``tokenizers.Tokenizer``, mainly for tests
+        """
+        if session is None or tokenizer is None:
+            missing = [package for package in ("onnxruntime", "tokenizers", "huggingface_hub")
+                       if importlib.util.find_spec(package) is None]
+            if missing:
+                raise ImportError(
+                    f"LocalEmbeddingEngine requires {', '.join(missing)}. Install it with "
+                    "`pip install rag-system[local]`."
+                )
+        self.model_name = model_name
+        self.model_path = Path(model_path) if model_path else None
+        self.onnx_file = onnx_file or (QUANTIZED_ONNX_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.intra_op_threads = max(1, intra_op_threads or os.cpu_count() or 1)
+        self.inter_op_threads = max(1, inter_op_threads)
+        self.normalize = normalize
+
+        if session is None or tokenizer is None:
+            tokenizer_file, model_file = self._resolve_files()
+        if tokenizer is None:
+            from tokenizers import Tokenizer
+            tokenizer = Tokenizer.from_file(tokenizer_file)
+        if session is None:
+            session = self._create_session(model_file)
+
+        # Padding is done per length bucket in _run_batch
+        tokenizer.no_padding()
+        tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer = tokenizer
+        self.session = session
+        self._input_names = {model_input.name for model_input in session.get_inputs()}
+        padding_id = tokenizer.token_to_id("[PAD]")
+        self._pad_id = padding_id if padding_id is not None else 0
+        self._dimension: Optional[int] = None
+
+    def _resolve_files(self) -> Tuple[str, str]:
+        """Paths of the tokenizer and the ONNX model, downloaded if needed."""
+        if self.model_path is not None:
+            return str(self.model_path / "tokenizer.json"), str(self.model_path / self.onnx_file)
+
+        from huggingface_hub import hf_hub_download
+        return (
+            hf_hub_download(self.model_name, "tokenizer.json"),
+            hf_hub_download(self.model_name, self.onnx_file),
+        )
+
+    def _create_session(self, model_file: str) -> Any:
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        logger.info(f"Loading {model_file} with {self.intra_op_threads} intra-op threads")
+        return ort.InferenceSession(
+            model_file, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension."""
+        if self._dimension is None:
+            self._dimension = self._run_batch([self.tokenizer.encode("")]).shape[1]
+        return self._dimension
+
+    def embed_documents(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts in batches of similar length.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            C-contiguous float32 array of shape (len(texts), dimension), in
+            the order of texts
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        encodings = self.tokenizer.encode_batch(list(texts))
+        lengths = np.fromiter(
+            (len(encoding.ids) for encoding in encodings), dtype=np.int64, count=len(encodings)
+        )
+        order = np.argsort(lengths, kind="stable")
+
+        embeddings = None
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start:start + self.batch_size]
+            batch = self._run_batch([encodings[i] for i in indices])
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+                self._dimension = batch.shape[1]
+            embeddings[indices] = batch
+        return embeddings
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a single query as a float32 vector."""
+        return self.embed_documents([text])[0]
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """Embed a single text string."""
+        return self.embed_query(text)
+
+    def _run_batch(self, encodings: List[Any]) -> np.ndarray:
+        """Pad a batch to its longest text, run the model and pool the tokens."""
+        max_tokens = max(1, max(len(encoding.ids) for encoding in encodings))
+        input_ids = np.full((len(encodings), max_tokens), self._pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), max_tokens), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, :len(encoding.ids)] = encoding.ids
+            attention_mask[row, :len(encoding.ids)] = 1
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        output = np.asarray(self.session.run(None, feeds)[0], dtype=np.float32)
+
+        if output.ndim == 3:
+            # Mean pooling over the tokens that are not padding
+            mask = attention_mask[:, :, None].astype(np.float32)
+            output = (output * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            output /= np.maximum(np.linalg.norm(output, axis=1, keepdims=True), 1e-12)
+        return np.ascontiguousarray(output, dtype=np.float32)
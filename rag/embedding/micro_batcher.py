@@ -0,0 +1,155 @@
+"""Micro-batching of concurrent query embeddings.
+
+When the query path is served to many clients, every question would cost its
+own embedding call. ``QueryMicroBatcher`` sits in front of an embedder: callers
+submit single queries, a background thread collects the queries that arrive
+within ``max_wait`` seconds (or while the previous batch is being embedded),
+embeds them with one ``embed_documents`` call and hands each caller its row.
+
+A query arriving at an idle batcher waits at most ``max_wait``, so under low
+load the latency is that of a single call; under load the batches grow up to
+``max_batch_size``.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("micro_batcher")
+
+# Sentinel that stops the worker thread
+_STOP = object()
+
+
+class QueryMicroBatcher:
+    """Coalesce concurrent embed_query calls into batched embed_documents calls."""
+
+    def __init__(self, embedder: Any, max_batch_size: int = 64, max_wait: float = 0.002):
+        """
+        Args:
+            embedder: Object with ``embed_documents(texts)``, e.g. EmbeddingModel
+                or LocalEmbeddingEngine
+            max_batch_size: Maximum queries per embedding call
+            max_wait: Seconds to wait for further queries after the first one
+        """
+        self.embedder = embedder
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"queries": 0, "batches": 0, "max_batch_size": 0}
+        self._thread = threading.Thread(target=self._run, name="query-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> "Future[np.ndarray]":
+        """Queue a query and return a future of its embedding."""
+        future: "Future[np.ndarray]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("QueryMicroBatcher is closed")
+            self._queue.put((text, future))
+        return future
+
+    def embed_query(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        """Embed a query, batched with concurrent callers."""
+        return self.submit(text).result(timeout)
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """Embed a single text string."""
+        return self.embed_query(text)
+
+    async def embed_query_async(self, text: str) -> np.ndarray:
+        """Embed a query from a coroutine without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def embed_documents(self, texts: List[str]) -> Any:
+        """Embed a batch directly; document batches need no coalescing."""
+        return self.embedder.embed_documents(texts)
+
+    def _collect(self, first: Tuple[str, Future]) -> Tuple[List[Tuple[str, Future]], bool]:
+        """Gather further queries for the batch started by ``first``.
+
+        Returns:
+            The batch and whether the batcher was closed meanwhile
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                # Take what is already queued without waiting, then wait
+                # for stragglers until the deadline
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopped = self._collect(first)
+            try:
+                self._embed(batch)
+            except Exception as e:
+                # A failed batch must neither leave its callers waiting nor
+                # stop the thread serving later queries
+                logger.warning(f"Embedding a batch of {len(batch)} queries failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _embed(self, batch: List[Tuple[str, Future]]) -> None:
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        # Identical concurrent questions are embedded once
+        rows: Dict[str, int] = {}
+        for text, _ in batch:
+            rows.setdefault(text, len(rows))
+        embeddings = self.embedder.embed_documents(list(rows))
+        if len(embeddings) != len(rows):
+            raise ValueError(
+                f"Embedder returned {len(embeddings)} embeddings for {len(rows)} queries"
+            )
+        # Every row is converted before any caller gets its result
+        results = [np.asarray(embeddings[rows[text]], dtype=np.float32) for text, _ in batch]
+
+        self.stats["queries"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(rows))
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def close(self) -> None:
+        """Embed the queued queries and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        # Queries submitted before closing are queued ahead of the stop marker
+        self._thread.join()
+
+    def __enter__(self) -> "QueryMicroBatcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
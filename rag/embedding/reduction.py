@@ -0,0 +1,146 @@
+"""Embedding dimensionality reduction.
+
+Two reducers map full embeddings to fewer dimensions before they are stored:
+
+- ``MatryoshkaReducer`` keeps the leading dimensions. Models trained with
+  Matryoshka representation learning, such as OpenAI's ``text-embedding-3-*``,
+  concentrate the information there, so 256 or 512 of 1536 dimensions keep
+  most of the retrieval quality.
+- ``PCAReducer`` projects onto the principal components of a sample of the
+  collection's own embeddings, which also works for other models.
+
+Both return L2-normalized float32 vectors, so that Chroma's L2 distance ranks
+like cosine similarity. A fitted reducer is saved next to the collection with
+``save`` and restored with ``load_reducer``; queries must be reduced with the
+same reducer as the stored vectors.
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+REDUCTION_METHODS = ("matryoshka", "pca")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.ascontiguousarray(matrix / np.maximum(norms, np.float32(1e-12)), dtype=np.float32)
+
+
+class MatryoshkaReducer:
+    """Truncate embeddings to their leading dimensions."""
+
+    method = "matryoshka"
+
+    def __init__(self, dimensions: int):
+        """
+        Args:
+            dimensions: Number of leading dimensions to keep
+        """
+        if dimensions < 1:
+            raise ValueError("dimensions must be positive")
+        self.dimensions = dimensions
+
+    @property
+    def is_fitted(self) -> bool:
+        """Truncation needs no training data."""
+        return True
+
+    def fit(self, matrix: np.ndarray) -> "MatryoshkaReducer":
+        """Nothing to learn."""
+        return self
+
+    def transform(self, matrix: np.ndarray) -> np.ndarray:
+        """Reduce a vector (d,) or a matrix (n, d)."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.shape[-1] < self.dimensions:
+            raise ValueError(f"Cannot truncate {matrix.shape[-1]}-dim embeddings "
+                             f"to {self.dimensions} dimensions")
+        return _normalize(matrix[..., :self.dimensions])
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the reducer configuration."""
+        with open(path, "wb") as file:
+            np.savez(file, method=self.method, dimensions=self.dimensions)
+
+
+class PCAReducer:
+    """Project embeddings onto their principal components."""
+
+    method = "pca"
+
+    def __init__(self, dimensions: int, mean: Optional[np.ndarray] = None,
+                 components: Optional[np.ndarray] = None):
+        """
+        Args:
+            dimensions: Number of principal components to keep
+            mean: Mean of the training embeddings, set by fit
+            components: (dimensions, d) projection matrix, set by fit
+        """
+        if dimensions < 1:
+            raise ValueError("dimensions must be positive")
+        self.dimensions = dimensions
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32)
+        self.components = None
+        if components is not None:
+            self.components = np.ascontiguousarray(components, dtype=np.float32)
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.components is not None
+
+    def fit(self, matrix: np.ndarray) -> "PCAReducer":
+        """Learn the projection from a sample of embeddings.
+
+        With fewer samples than requested dimensions only as many components
+        as samples are kept.
+
+        Args:
+            matrix: (n, d) training embeddings
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[0] < 2:
+            raise ValueError("PCA needs at least two embeddings to fit")
+        mean = matrix.mean(axis=0)
+        # Right singular vectors of the centered data are the principal axes
+        _, _, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+        self.dimensions = min(self.dimensions, vt.shape[0])
+        self.mean = mean.astype(np.float32)
+        self.components = np.ascontiguousarray(vt[:self.dimensions], dtype=np.float32)
+        return self
+
+    def transform(self, matrix: np.ndarray) -> np.ndarray:
+        """Reduce a vector (d,) or a matrix (n, d)."""
+        if not self.is_fitted:
+            raise ValueError("PCAReducer must be fitted before use")
+        matrix = np.asarray(matrix, dtype=np.float32)
+        return _normalize((matrix - self.mean) @ self.components.T)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the fitted projection."""
+        if not self.is_fitted:
+            raise ValueError("PCAReducer must be fitted before saving")
+        with open(path, "wb") as file:
+            np.savez(file, method=self.method, dimensions=self.dimensions,
+                     mean=self.mean, components=self.components)
+
+
+def create_reducer(method: str, dimensions: int):
+    """Create an unfitted reducer by method name ("matryoshka" or "pca")."""
+    if method == "matryoshka":
+        return MatryoshkaReducer(dimensions)
+    if method == "pca":
+        return PCAReducer(dimensions)
+    raise ValueError(f"Unsupported reduction method: {method}. "
+                     f"Supported methods: {', '.join(REDUCTION_METHODS)}")
+
+
+def load_reducer(path: Union[str, Path]):
+    """Load a reducer saved with ``save``."""
+    with np.load(path) as data:
+        method = str(data["method"])
+        dimensions = int(data["dimensions"])
+        if method == "pca":
+            return PCAReducer(dimensions, mean=data["mean"], components=data["components"])
+        return create_reducer(method, dimensions)
@@ -1,30 +1,62 @@
-from typing import Dict, Any
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
 import numpy as np
 from sentence_transformers import SentenceTransformer
+
+from ..core.models import Vector, VectorBatch
 from .embedder import BaseEmbedder
-from ..core.models import Vector
+
+# Models loaded in this process, by name
+_MODELS: Dict[str, SentenceTransformer] = {}
+_MODELS_LOCK = threading.Lock()
+
+def _load_model(model_name: str) -> SentenceTransformer:
+    """Load a model once per process and share it between embedders."""
+    with _MODELS_LOCK:
+        if model_name not in _MODELS:
+            _MODELS[model_name] = SentenceTransformer(model_name)
+        return _MODELS[model_name]
 
 class TextEmbedder(BaseEmbedder):
     """Text embedding generator using sentence-transformers."""
     
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         super().__init__(model_name)
-        self.model = SentenceTransformer(model_name)
+        self.model = _load_model(model_name)
     
     def embed(self, text: str, metadata: Dict[str, Any]) -> Vector:
         """Generate embeddings for text using sentence-transformers."""
-        # Generate embedding
+        # Generate embedding, kept as a float32 array
         embedding = self.model.encode(text, convert_to_numpy=True)
         
-        # Convert to list for storage
-        embedding_list = embedding.tolist()
-        
         # Create vector with metadata
         return self._create_vector(
-            values=embedding_list,
+            values=embedding,
             metadata={
                 **metadata,
                 "text_length": len(text),
                 "embedding_type": "text"
             }
-        ) 
\ No newline at end of file
+        )
+
+    def embed_batch(self, texts: List[str], metadatas: Optional[List[Dict[str, Any]]] = None,
+                    batch_size: int = 64) -> VectorBatch:
+        """Generate embeddings for several texts with batched model calls."""
+        metadatas = metadatas or [{} for _ in texts]
+        embeddings = self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        return VectorBatch(
+            ids=[str(uuid.uuid4()) for _ in texts],
+            values=embeddings,
+            metadatas=[
+                {
+                    **metadata,
+                    "model_name": self.model_name,
+                    "embedding_dim": embeddings.shape[1],
+                    "text_length": len(text),
+                    "embedding_type": "text"
+                }
+                for text, metadata in zip(texts, metadatas)
+            ]
+        )
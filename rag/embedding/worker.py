@@ -0,0 +1,314 @@
+"""Long-lived embedding worker shared by CLI invocations and API processes.
+
+Loading an embedding model dominates the start-up of a short ``rag query``.
+``EmbeddingWorker`` loads the model once and serves embedding requests over a
+local socket (a named pipe on Windows). ``RemoteEmbedder`` is the client side:
+it offers the embed_documents/embed_query interface and sends requests to
+the worker. When no worker is running, or it serves another embedder, the
+client loads the model in-process instead.
+
+Requests are pickled, so only the user who started the worker may connect:
+the socket is created with 0600 permissions, and clients must present a
+random key that the worker writes to a 0600 file in the user's home
+directory on first start.
+
+Start a worker with:
+    rag embed-worker --embedder local
+"""
+
+import logging
+import os
+import secrets
+import sys
+import tempfile
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from .micro_batcher import QueryMicroBatcher
+
+logger = logging.getLogger("embedding_worker")
+
+# Errors meaning that no usable worker is reachable
+_CONNECTION_ERRORS = (OSError, EOFError, ConnectionError)
+
+
+def default_worker_address() -> str:
+    """Socket path (or pipe name) of the embedding worker.
+
+    Can be set with the RAG_EMBED_WORKER_ADDRESS environment variable.
+    """
+    address = os.getenv("RAG_EMBED_WORKER_ADDRESS")
+    if address:
+        return address
+    if sys.platform == "win32":
+        return r"\\.\pipe\rag-embed-worker"
+    return os.path.join(tempfile.gettempdir(), f"rag-embed-worker-{os.getuid()}.sock")
+
+
+def default_authkey_path() -> str:
+    """File with the worker key, RAG_EMBED_WORKER_AUTHKEY_FILE or ~/.rag/embed-worker.key."""
+    return os.getenv("RAG_EMBED_WORKER_AUTHKEY_FILE") or os.path.join(
+        os.path.expanduser("~"), ".rag", "embed-worker.key"
+    )
+
+
+def default_authkey(create: bool = False) -> Optional[bytes]:
+    """Key that clients must present to use the worker.
+
+    Taken from the RAG_EMBED_WORKER_AUTHKEY environment variable or read from
+    default_authkey_path().
+
+    Args:
+        create: Generate a random key and write it to a file only the user
+            can read if there is none yet, as the worker does on first start
+
+    Returns:
+        The key, or None if there is none and create is False
+    """
+    key = os.getenv("RAG_EMBED_WORKER_AUTHKEY")
+    if key:
+        return key.encode()
+    path = default_authkey_path()
+    try:
+        with open(path, "rb") as file:
+            return file.read().strip()
+    except FileNotFoundError:
+        if not create:
+            return None
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    key = secrets.token_hex(32).encode()
+    try:
+        descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another worker created it meanwhile
+        with open(path, "rb") as file:
+            return file.read().strip()
+    with os.fdopen(descriptor, "wb") as file:
+        file.write(key)
+    return key
+
+
+class EmbeddingWorker:
+    """Serve an embedder loaded once to local clients.
+
+    Every connection is handled in its own thread. Concurrent single queries
+    are coalesced by a QueryMicroBatcher.
+    """
+
+    def __init__(self, embedder: Any, embedder_name: str, address: Optional[str] = None,
+                 authkey: Optional[bytes] = None, max_wait: float = 0.002):
+        """
+        Args:
+            embedder: Loaded embedder with embed_documents
+            embedder_name: Backend name clients ask for, e.g. "local"
+            address: Socket path or pipe name, see default_worker_address
+            authkey: Shared key of worker and clients, by default the one of
+                default_authkey, generated on first start
+            max_wait: Seconds single queries wait for others to batch with
+        """
+        self.embedder = embedder
+        self.embedder_name = embedder_name
+        self.address = address or default_worker_address()
+        self.authkey = authkey or default_authkey(create=True)
+        self.batcher = QueryMicroBatcher(embedder, max_wait=max_wait)
+        self.listener: Optional[Listener] = None
+        self.ready = threading.Event()
+        self._closing = False
+
+    def serve_forever(self) -> None:
+        """Accept connections until close() is called."""
+        self._remove_stale_socket()
+        if sys.platform == "win32":
+            self.listener = Listener(self.address, authkey=self.authkey)
+        else:
+            # Created without group or other permissions, so no other user
+            # can even reach the handshake
+            umask = os.umask(0o177)
+            try:
+                self.listener = Listener(self.address, authkey=self.authkey)
+            finally:
+                os.umask(umask)
+            os.chmod(self.address, 0o600)
+        logger.info(f"Embedding worker for '{self.embedder_name}' listening on {self.address}")
+        self.ready.set()
+        try:
+            while not self._closing:
+                try:
+                    connection = self.listener.accept()
+                except Exception as e:
+                    if self._closing:
+                        break
+                    # E.g. a client with a wrong key; keep serving the others
+                    logger.warning(f"Rejected connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+        finally:
+            self.close()
+
+    def _remove_stale_socket(self) -> None:
+        """Remove the socket file of a worker that did not shut down cleanly."""
+        if sys.platform == "win32" or not os.path.exists(self.address):
+            return
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except _CONNECTION_ERRORS:
+            os.remove(self.address)
+            return
+        raise RuntimeError(f"An embedding worker is already listening on {self.address}")
+
+    def _handle(self, connection: Connection) -> None:
+        with connection:
+            while True:
+                try:
+                    request = connection.recv()
+                except _CONNECTION_ERRORS:
+                    return
+                if self._closing:
+                    # Closing the connection sends the client to its fallback
+                    return
+                try:
+                    response = self._respond(request)
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                try:
+                    connection.send(response)
+                except _CONNECTION_ERRORS:
+                    return
+
+    def _respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if request.get("embedder") != self.embedder_name:
+            return {"ok": False, "error": f"This worker serves the '{self.embedder_name}' embedder"}
+        operation = request.get("op")
+        if operation == "ping":
+            return {"ok": True}
+        if operation == "embed_query":
+            return {"ok": True, "embeddings": self.batcher.embed_query(request["text"])}
+        if operation == "embed_documents":
+            embeddings = self.embedder.embed_documents(request["texts"])
+            return {"ok": True, "embeddings": np.asarray(embeddings, dtype=np.float32)}
+        return {"ok": False, "error": f"Unknown operation: {operation}"}
+
+    def close(self) -> None:
+        """Stop accepting connections and remove the socket."""
+        if self._closing:
+            return
+        self._closing = True
+        if self.listener is not None:
+            listener, self.listener = self.listener, None
+            # Wake up a blocking accept; without a key the connection does
+            # not wait for a handshake that may no longer be served
+            try:
+                Client(self.address).close()
+            except _CONNECTION_ERRORS:
+                pass
+            listener.close()
+        self.batcher.close()
+
+
+class RemoteEmbedder:
+    """Embedder client that prefers a running EmbeddingWorker.
+
+    The worker is looked up on first use. Without a worker, or if it fails,
+    requests are served by an in-process embedder created with ``fallback``.
+    """
+
+    def __init__(self, embedder_name: str, fallback: Callable[[], Any],
+                 address: Optional[str] = None, authkey: Optional[bytes] = None):
+        """
+        Args:
+            embedder_name: Backend name, which the worker must serve
+            fallback: Creates the in-process embedder when it is needed
+            address: Worker socket path or pipe name
+            authkey: Shared key of worker and clients; without one, and
+                without a key file, no worker is used
+        """
+        self.embedder_name = embedder_name
+        self.fallback = fallback
+        self.address = address or default_worker_address()
+        self.authkey = authkey or default_authkey()
+        self._connection: Optional[Connection] = None
+        self._local: Optional[Any] = None
+        self._use_worker = True
+        self._lock = threading.Lock()
+
+    @property
+    def uses_worker(self) -> bool:
+        """Whether requests go to a worker, checking for one if needed."""
+        with self._lock:
+            return self._connect() is not None
+
+    def _connect(self) -> Optional[Connection]:
+        if self._connection is None and self._use_worker:
+            if self.authkey is None:
+                # No worker was ever started by this user
+                self._use_worker = False
+                return None
+            try:
+                connection = Client(self.address, authkey=self.authkey)
+                connection.send({"op": "ping", "embedder": self.embedder_name})
+                response = connection.recv()
+            except Exception as e:
+                # Also covers AuthenticationError when the keys differ
+                logger.info(f"No embedding worker at {self.address} ({e}), "
+                            "loading the model in-process")
+                self._use_worker = False
+                return None
+            if not response.get("ok"):
+                logger.info(f"Embedding worker not usable: {response.get('error')}")
+                connection.close()
+                self._use_worker = False
+                return None
+            self._connection = connection
+        return self._connection
+
+    def _request(self, request: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Send a request to the worker; None if the caller must fall back."""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            try:
+                connection.send({**request, "embedder": self.embedder_name})
+                response = connection.recv()
+            except _CONNECTION_ERRORS as e:
+                logger.warning(f"Embedding worker connection lost ({e}), "
+                               "loading the model in-process")
+                self._connection = None
+                self._use_worker = False
+                return None
+        if not response["ok"]:
+            raise RuntimeError(f"Embedding worker error: {response['error']}")
+        return response["embeddings"]
+
+    def _local_embedder(self) -> Any:
+        if self._local is None:
+            self._local = self.fallback()
+        return self._local
+
+    def embed_documents(self, texts: Any) -> Any:
+        """Embed texts in the worker, or in-process without one."""
+        embeddings = self._request({"op": "embed_documents", "texts": list(texts)})
+        if embeddings is None:
+            return self._local_embedder().embed_documents(texts)
+        return embeddings
+
+    def embed_query(self, text: str) -> Any:
+        """Embed a single query in the worker, or in-process without one."""
+        embedding = self._request({"op": "embed_query", "text": text})
+        if embedding is None:
+            return self._local_embedder().embed_query(text)
+        return embedding
+
+    def embed_text(self, text: str) -> Any:
+        """Embed a single text string."""
+        return self.embed_query(text)
+
+    def close(self) -> None:
+        """Close the worker connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
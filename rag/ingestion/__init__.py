@@ -1,15 +1,27 @@
 """
 Document ingestion and parsing components.
+
+Components are imported on first access, so that importing the package does
+not load the PDF, OCR and vision stacks.
 """
 
-from .file_parser import BaseFileParser, ParserRegistry
-from .markdown_parser import MarkdownParser 
-from .ocr import AzureOCRProcessor
+from importlib import import_module
+
+_EXPORTS = {
+    "BaseFileParser": ".file_parser",
+    "ParserRegistry": ".file_parser",
+    "MarkdownParser": ".markdown_parser",
+    "AzureOCRProcessor": ".ocr",
+    "AsyncAzureOCRProcessor": ".ocr",
+    "TesseractOCRProcessor": ".local_ocr",
+    "LoaderRegistry": ".loader_registry",
+}
 
-__all__ = [
-    "BaseFileParser",
-    "ParserRegistry",
-    "MarkdownParser",
-    "AzureOCRProcessor"
-]
+__all__ = list(_EXPORTS)
 
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
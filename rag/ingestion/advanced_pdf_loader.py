@@ -1,12 +1,26 @@
-from typing import List, Dict, Any, Optional, Union, Iterator
-from pathlib import Path, PurePath
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
-import base64
+from itertools import islice
+from pathlib import Path, PurePath
+from typing import Any, Dict, Iterator, List, Optional, Union
+
 import pdfplumber
-from PIL import Image
-from langchain_core.documents import Document
+import pypdfium2 as pdfium
 from langchain_community.document_loaders.pdf import BasePDFLoader
-from rag.llm.vision_model import create_vision_model, VisionModel
+from langchain_core.documents import Document
+from PIL import Image
+
+from rag.ingestion.pdf_triage import (
+    VISION_PAGE_CLASSES,
+    classify_page,
+    measure_ink_coverage,
+    profile_page,
+)
+from rag.llm.vision_model import VisionModel, create_vision_model
+
+# Pages with fewer words are candidates for a full-page vision description
+SPARSE_PAGE_WORDS = 100
 
 class AdvancedPDFLoader(BasePDFLoader):
     """Advanced PDF loader that handles text, tables, and images with optional vision model support."""
@@ -17,7 +31,11 @@ class AdvancedPDFLoader(BasePDFLoader):
         include_images: bool = True,
         include_tables: bool = True,
         vision_model: Optional[VisionModel] = None,
-        headers: Optional[dict] = None
+        headers: Optional[dict] = None,
+        max_workers: int = 1,
+        pages_per_task: int = 8,
+        extraction_mode: str = "tiered",
+        max_image_pixels_per_page: int = 50_000_000
     ):
         """Initialize the loader.
         
@@ -27,18 +45,34 @@ class AdvancedPDFLoader(BasePDFLoader):
             include_tables: Whether to process tables
             vision_model: Optional vision model for image descriptions
             headers: Optional headers for web requests
+            max_workers: Number of worker processes. 1 processes pages
+                sequentially in the current process.
+            pages_per_task: Number of consecutive pages handled per worker task
+            extraction_mode: "tiered" extracts text with a cheap PDFium pass and only
+                runs table extraction and image scans on pages that need them.
+                "full" runs pdfplumber's layout extraction on every page.
+            max_image_pixels_per_page: Upper bound on the source pixels of embedded
+                images described per page; further images on the page are skipped.
         """
+        if extraction_mode not in ("tiered", "full"):
+            raise ValueError(
+                f"Unsupported extraction mode: {extraction_mode}. Supported modes: tiered, full"
+            )
         super().__init__(file_path, headers=headers)
         self.include_images = include_images
         self.include_tables = include_tables
         self.vision_model = vision_model
+        self.max_workers = max(1, max_workers)
+        self.pages_per_task = max(1, pages_per_task)
+        self.extraction_mode = extraction_mode
+        self.max_image_pixels_per_page = max_image_pixels_per_page
 
     def _process_image(self, image: Image.Image) -> Dict[str, Any]:
-        """Process an image and get its description if vision model is available."""
-        img_byte_arr = BytesIO()
-        image.save(img_byte_arr, format='JPEG' if image.mode == 'RGB' else 'PNG')
-        image_b64 = base64.b64encode(img_byte_arr.getvalue()).decode("utf-8")
-        
+        """Get the description of an image from the vision model.
+
+        The image is only encoded by the vision model, once, at the resolution
+        the model actually uses.
+        """
         description = ""
         if self.vision_model:
             try:
@@ -47,10 +81,69 @@ class AdvancedPDFLoader(BasePDFLoader):
                 print(f"Error getting image description: {e}")
         
         return {
-            "image_base64": image_b64,
             "description": description
         }
 
+    def _describe_images(self, images: Iterator[Image.Image], page_num: int) -> List[str]:
+        """Describe the images of a page and close each one once it is encoded.
+
+        Vision models with ``describe_images`` receive all images of the page
+        at once and send the requests concurrently.
+        """
+        def closing(images: Iterator[Image.Image]) -> Iterator[Image.Image]:
+            for img_num, image in enumerate(images, 1):
+                print(f"Processing image {img_num} on page {page_num + 1}")
+                try:
+                    yield image
+                finally:
+                    image.close()
+
+        describe_images = getattr(self.vision_model, "describe_images", None)
+        if describe_images is not None:
+            try:
+                return describe_images(closing(images))
+            except Exception as e:
+                print(f"Error getting image descriptions: {e}")
+                return []
+        return [self._process_image(image)["description"] for image in closing(images)]
+
+    def _iter_page_images(
+        self, page: Any, page_num: int, sparse_page: bool
+    ) -> Iterator[Image.Image]:
+        """Lazily yield the images of a page that should be described.
+
+        Images are opened one at a time and only decoded by the consumer.
+        Embedded images are skipped once their total pixel count exceeds
+        ``max_image_pixels_per_page``, which bounds the memory used per page.
+        """
+        # Process page as image if text is sparse, otherwise process embedded images
+        if sparse_page:
+            try:
+                print(f"Converting page {page_num + 1} to image due to sparse text")
+                yield page.to_image().original
+            except Exception as e:
+                print(f"Error converting page {page_num + 1} to image: {str(e)}")
+            return
+
+        print(f"Found {len(page.images)} embedded images on page {page_num + 1}")
+        pixel_budget = self.max_image_pixels_per_page
+        for img_num, img in enumerate(page.images, 1):
+            try:
+                # Image.open only reads the header; pixels are decoded on use
+                image = Image.open(BytesIO(img['stream'].get_data()))
+            except Exception as e:
+                print(f"Error processing image {img_num} on page {page_num + 1}: {str(e)}")
+                continue
+
+            pixels = image.width * image.height
+            if pixels > pixel_budget:
+                print(f"Skipping image {img_num} on page {page_num + 1}: per-page image memory "
+                      f"cap of {self.max_image_pixels_per_page} pixels reached")
+                image.close()
+                continue
+            pixel_budget -= pixels
+            yield image
+
     def _process_table(self, table: List[List[str]]) -> str:
         """Convert a table to a readable text format."""
         if not table:
@@ -59,98 +152,39 @@ class AdvancedPDFLoader(BasePDFLoader):
         # Convert table to markdown format
         markdown_table = []
         # Add header
-        markdown_table.append("| " + " | ".join(str(cell) for cell in table[0]) + " |")
+        header = " | ".join(self._format_cell(cell) for cell in table[0])
+        markdown_table.append("| " + header + " |")
         markdown_table.append("| " + " | ".join(["---"] * len(table[0])) + " |")
         # Add rows
         for row in table[1:]:
-            markdown_table.append("| " + " | ".join(str(cell) for cell in row) + " |")
+            markdown_table.append("| " + " | ".join(self._format_cell(cell) for cell in row) + " |")
         
         return "\n".join(markdown_table)
 
+    @staticmethod
+    def _format_cell(cell: Any) -> str:
+        """Format a table cell so that every table row stays on a single line."""
+        if cell is None:
+            return ""
+        return " ".join(str(cell).split()).replace("|", "\\|")
+
     # Please look at the BaseLoader. There it is stated that this method shall
     # be implemented in all the existing subclasses. Do not implement the load method!!!!!!
     def lazy_load(self) -> Iterator[Document]:
         """Lazily load and process the PDF file page by page.
         
+        With ``max_workers > 1`` page ranges are processed in worker processes,
+        but documents are still yielded in page order.
+
         Yields:
             Document objects containing text, tables, and images for each page.
         """
         try:
-            with pdfplumber.open(self.file_path) as pdf:
-                print(f"Processing PDF: {self.file_path}")
-                print(f"Total pages: {len(pdf.pages)}")
-                
-                for page_num, page in enumerate(pdf.pages):
-                    print(f"\nProcessing page {page_num + 1}/{len(pdf.pages)}")
-                    
-                    # Extract text
-                    text_content = page.extract_text() or ""                    
-                    word_count = len(text_content.split())
-                    print(f"Extracted {word_count} words from page {page_num + 1}")
-                    
-                    # Initialize metadata
-                    file_name_path = Path(self.file_path)
-                    metadata = {
-                        "source": str(self.source),
-                        "file_name": file_name_path.name,
-                        "page_number": page_num + 1,
-                        "content_type": "text",
-                        "has_tables": False,
-                        "has_images": False,
-                        "image_count": 0
-                    }
-                    
-                    if self.include_tables:
-                        tables = page.extract_tables()
-                        if tables:
-                            print(f"Found {len(tables)} tables on page {page_num + 1}")
-                            table_texts = [self._process_table(table) for table in tables]
-                            text_content += "\n\nTables:\n" + "\n\n".join(table_texts)
-                            metadata["has_tables"] = True
-                        else:
-                            print(f"No tables found on page {page_num + 1}")
-                                        
-                    if self.include_images or word_count < 100:
-                        image_descriptions = []
-                        processed_images = []
-                        
-                        # Process page as image if text is sparse, otherwise process embedded images
-                        images_to_process = []
-                        if word_count < 100:
-                            try:
-                                print(f"Converting page {page_num + 1} to image due to sparse text")
-                                images_to_process.append(page.to_image().original)
-                            except Exception as e:
-                                print(f"Error converting page {page_num + 1} to image: {str(e)}")
-                        elif page.images:
-                            print(f"Found {len(page.images)} embedded images on page {page_num + 1}")
-                            for img_num, img in enumerate(page.images, 1):
-                                try:
-                                    images_to_process.append(Image.open(BytesIO(img['stream'].get_data())))
-                                except Exception as e:
-                                    print(f"Error processing image {img_num} on page {page_num + 1}: {str(e)}")
-                        
-                        for img_num, image in enumerate(images_to_process, 1):
-                            print(f"Processing image {img_num}/{len(images_to_process)} on page {page_num + 1}")
-                            processed = self._process_image(image)
-                            if processed["description"]:
-                                print(f"Generated description for image {img_num}")
-                                image_descriptions.append(processed["description"])
-                            processed_images.append(processed)
-                        
-                        if image_descriptions:
-                            print(f"Added {len(image_descriptions)} image descriptions to page {page_num + 1}")
-                            text_content += "\n\n" + "\n".join(image_descriptions)
-                            metadata["has_images"] = True
-                            metadata["image_count"] = len(processed_images)
-                    
-                    if text_content.strip():
-                        yield Document(
-                            page_content=text_content.strip(),
-                            metadata=metadata
-                        )
-                    else:
-                        print(f"No content extracted from page {page_num + 1}")
+            print(f"Processing PDF: {self.file_path}")
+            if self.max_workers > 1:
+                yield from self._parallel_load()
+            else:
+                yield from self._load_page_range(0, None)
         
         except Exception as e:
             print(f"Error processing PDF {self.file_path}: {str(e)}")
@@ -158,13 +192,196 @@ class AdvancedPDFLoader(BasePDFLoader):
             print(f"Traceback: {traceback.format_exc()}")
             raise
 
+    def _load_page_range(self, start: int, end: Optional[int]) -> Iterator[Document]:
+        """Open the PDF and process the pages in [start, end)."""
+        with pdfplumber.open(self.file_path) as pdf:
+            pdfium_pdf = None
+            if self.extraction_mode == "tiered":
+                pdfium_pdf = pdfium.PdfDocument(self.file_path)
+            try:
+                total_pages = len(pdf.pages)
+                if start == 0:
+                    print(f"Total pages: {total_pages}")
+                end = total_pages if end is None else min(end, total_pages)
+
+                for page_num in range(start, end):
+                    document = self._process_page(
+                        pdf.pages[page_num], pdfium_pdf, page_num, total_pages
+                    )
+                    if document is not None:
+                        yield document
+            finally:
+                if pdfium_pdf is not None:
+                    pdfium_pdf.close()
+
+    def _parallel_load(self) -> Iterator[Document]:
+        """Process page ranges in worker processes and yield pages in order.
+
+        Each worker opens the file independently. At most ``2 * max_workers``
+        ranges are in flight; finished ranges wait in the reorder buffer until
+        all earlier ranges were yielded, which keeps memory bounded.
+        """
+        pdf = pdfium.PdfDocument(self.file_path)
+        total_pages = len(pdf)
+        pdf.close()
+        print(f"Total pages: {total_pages} ({self.max_workers} workers, "
+              f"{self.pages_per_task} pages per task)")
+        ranges = iter(
+            (start, min(start + self.pages_per_task, total_pages))
+            for start in range(0, total_pages, self.pages_per_task)
+        )
+        options = self._worker_options()
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for page_range in islice(ranges, 2 * self.max_workers):
+                pending.append(executor.submit(_load_pages_in_worker, options, *page_range))
+
+            while pending:
+                documents = pending.popleft().result()
+                for page_range in islice(ranges, 1):
+                    pending.append(executor.submit(_load_pages_in_worker, options, *page_range))
+                yield from documents
+
+    def _worker_options(self) -> Dict[str, Any]:
+        """Arguments needed to recreate this loader in a worker process."""
+        return {
+            "file_path": self.file_path,
+            "web_path": self.web_path,
+            "include_images": self.include_images,
+            "include_tables": self.include_tables,
+            "vision_model": self.vision_model,
+            "max_workers": 1,
+            "pages_per_task": self.pages_per_task,
+            "extraction_mode": self.extraction_mode,
+            "max_image_pixels_per_page": self.max_image_pixels_per_page,
+        }
+
+    def _process_page(self, page: Any, pdfium_pdf: Optional[pdfium.PdfDocument],
+                      page_num: int, total_pages: int) -> Optional[Document]:
+        """Extract text, tables and image descriptions from a single page.
+
+        In tiered mode the text comes from PDFium's character stream and the
+        page profile decides whether pdfplumber's table extraction and the
+        embedded image scan are needed at all. Pages with little text are
+        classified from their ink coverage: blank pages are dropped and only
+        scans and graphics are rendered for the vision model. In full mode pdfplumber's
+        layout-based extraction runs for every page.
+        """
+        print(f"\nProcessing page {page_num + 1}/{total_pages}")
+
+        # Extract text
+        profile = None
+        page_class = None
+        if pdfium_pdf is not None:
+            pdfium_page = pdfium_pdf[page_num]
+            try:
+                profile = profile_page(pdfium_page, page_num + 1)
+                if profile.word_count < SPARSE_PAGE_WORDS:
+                    profile.ink_coverage = measure_ink_coverage(pdfium_page)
+            finally:
+                pdfium_page.close()
+            text_content = profile.text
+            page_class = classify_page(profile, min_words=SPARSE_PAGE_WORDS)
+        else:
+            text_content = page.extract_text() or ""
+        word_count = len(text_content.split())
+        print(f"Extracted {word_count} words from page {page_num + 1}")
+
+        if page_class == "blank":
+            print(f"Skipping blank page {page_num + 1} (ink coverage {profile.ink_coverage})")
+            return None
+
+        check_tables = self.include_tables and (profile is None or profile.likely_has_tables())
+        check_images = profile is None or profile.image_count > 0
+        if profile is not None:
+            print(f"Page {page_num + 1}: fast text pass, {profile.path_count} vector paths, "
+                  f"{profile.image_count} images -> table extraction "
+                  f"{'needed' if check_tables else 'skipped'}, image scan "
+                  f"{'needed' if check_images else 'skipped'}")
+
+        # Initialize metadata
+        file_name_path = Path(self.file_path)
+        metadata = {
+            "source": str(self.source),
+            "file_name": file_name_path.name,
+            "page_number": page_num + 1,
+            "content_type": "text",
+            "has_tables": False,
+            "has_images": False,
+            "image_count": 0,
+            "extraction_mode": self.extraction_mode,
+            "vision_decision": "skipped"
+        }
+        if page_class is not None:
+            metadata["page_class"] = page_class
+        if profile is not None and profile.ink_coverage is not None:
+            metadata["ink_coverage"] = round(profile.ink_coverage, 4)
+
+        if check_tables:
+            tables = page.extract_tables()
+            if tables:
+                print(f"Found {len(tables)} tables on page {page_num + 1}")
+                table_texts = [self._process_table(table) for table in tables]
+                text_content += "\n\nTables:\n" + "\n\n".join(table_texts)
+                metadata["has_tables"] = True
+            else:
+                print(f"No tables found on page {page_num + 1}")
+
+        # In tiered mode only pages whose content is not captured by the text
+        # layer are rendered; in full mode every page with little text is
+        if page_class is not None:
+            sparse_page = page_class in VISION_PAGE_CLASSES
+            if page_class != "text":
+                print(f"Page {page_num + 1} classified as {page_class} -> full-page vision "
+                      f"{'needed' if sparse_page else 'skipped'}")
+        else:
+            sparse_page = word_count < SPARSE_PAGE_WORDS
+        # Images are only useful if they can be described
+        describe_images = self.include_images and check_images and page.images
+        if self.vision_model and (sparse_page or describe_images):
+            image_descriptions = []
+            metadata["vision_decision"] = "page" if sparse_page else "images"
+
+            images = self._iter_page_images(page, page_num, sparse_page)
+            descriptions = self._describe_images(images, page_num)
+            image_count = len(descriptions)
+            for img_num, description in enumerate(descriptions, 1):
+                if description:
+                    print(f"Generated description for image {img_num}")
+                    image_descriptions.append(description)
+
+            if image_descriptions:
+                print(f"Added {len(image_descriptions)} image descriptions to page {page_num + 1}")
+                text_content += "\n\n" + "\n".join(image_descriptions)
+                metadata["has_images"] = True
+                metadata["image_count"] = image_count
+
+        if text_content.strip():
+            return Document(
+                page_content=text_content.strip(),
+                metadata=metadata
+            )
+        print(f"No content extracted from page {page_num + 1}")
+        return None
+
+def _load_pages_in_worker(options: Dict[str, Any], start: int, end: int) -> List[Document]:
+    """Worker process entry point: recreate the loader and process a page range."""
+    options = dict(options)
+    web_path = options.pop("web_path")
+    loader = AdvancedPDFLoader(**options)
+    # Keep the original URL as source for files downloaded by the parent process
+    loader.web_path = web_path
+    return list(loader._load_page_range(start, end))
+
 # Example usage:
 def load_pdf_for_rag(
     file_path: Union[str, PurePath],
     vision_model: Optional[Any] = None,
     include_images: bool = True,
     include_tables: bool = True,
-    headers: Optional[dict] = None
+    headers: Optional[dict] = None,
+    max_workers: int = 1
 ) -> List[Document]:
     """
     Load a PDF file and prepare it for RAG.
@@ -175,6 +392,7 @@ def load_pdf_for_rag(
         include_images: Whether to process images
         include_tables: Whether to process tables
         headers: Optional headers for web requests
+        max_workers: Number of worker processes for page-parallel extraction
     
     Returns:
         List of Document objects ready for RAG
@@ -184,7 +402,8 @@ def load_pdf_for_rag(
         include_images=include_images,
         include_tables=include_tables,
         vision_model=vision_model,
-        headers=headers
+        headers=headers,
+        max_workers=max_workers
     )
     return loader.load()
 
@@ -0,0 +1,263 @@
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain.schema import Document as LangchainDocument
+
+# Mersenne prime used for the universal hash family (a * x + b) mod p.
+# With x < 2**32 and a < p every product fits into an unsigned 64 bit integer.
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class DedupStats:
+    """Summary of what chunk deduplication saved."""
+    total_chunks: int = 0
+    unique_chunks: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    total_characters: int = 0
+    saved_characters: int = 0
+
+    @property
+    def duplicate_chunks(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+    @property
+    def saved_embeddings(self) -> int:
+        """Number of embedding calls (and stored vectors) avoided."""
+        return self.duplicate_chunks
+
+    @property
+    def saved_ratio(self) -> float:
+        return self.duplicate_chunks / self.total_chunks if self.total_chunks else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_chunks": self.total_chunks,
+            "unique_chunks": self.unique_chunks,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "saved_embeddings": self.saved_embeddings,
+            "total_characters": self.total_characters,
+            "saved_characters": self.saved_characters,
+            "saved_ratio": self.saved_ratio
+        }
+
+
+@dataclass
+class DuplicateReferences:
+    """Duplicates of one canonical chunk found since its metadata was last written."""
+    count: int = 0
+    sources: List[str] = field(default_factory=list)
+
+    def add(self, reference: str, max_references: int) -> None:
+        self.count += 1
+        if len(self.sources) < max_references and reference not in self.sources:
+            self.sources.append(reference)
+
+    def apply(self, metadata: Dict[str, Any], max_references: int) -> None:
+        """Add the duplicates to the ``duplicate_count`` and ``duplicate_sources`` metadata.
+
+        Sources are stored as a "; "-separated string because the vector
+        store only accepts scalar metadata values. At most max_references
+        distinct sources are kept, while the count includes every duplicate.
+        """
+        stored = metadata.get("duplicate_sources")
+        sources = stored.split("; ") if stored else []
+        for reference in self.sources:
+            if len(sources) >= max_references:
+                break
+            if reference not in sources:
+                sources.append(reference)
+        metadata["duplicate_sources"] = "; ".join(sources)
+        metadata["duplicate_count"] = metadata.get("duplicate_count", 0) + self.count
+
+
+class ChunkDeduplicator:
+    """Near-duplicate chunk detection using MinHash signatures and LSH buckets.
+
+    Every chunk is reduced to a MinHash signature over word shingles. The
+    signature is split into bands, and chunks sharing any band bucket become
+    candidates, so each lookup only compares against a handful of chunks instead
+    of the whole collection. Candidates whose estimated Jaccard similarity reaches
+    ``threshold`` are dropped; the first occurrence stays as the canonical chunk
+    and records the number of its duplicates and up to ``max_references`` of
+    their sources in its metadata.
+
+    The index is kept between calls to ``deduplicate``, so chunks of later
+    batches are also matched against canonical chunks of earlier batches. It
+    holds the chunk id and signature of every canonical chunk, not the chunk
+    itself; duplicates of chunks stored with earlier batches are written to
+    the store by ``update_stored``.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 5, seed: int = 1, max_references: int = 20):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity to treat chunks as duplicates
+            num_perm: Number of hash permutations in a MinHash signature
+            bands: Number of LSH bands; must divide num_perm. More bands find
+                less similar candidates at the cost of more comparisons.
+            shingle_size: Number of words per shingle
+            seed: Seed for the hash permutations
+            max_references: Sources of duplicates recorded per canonical chunk;
+                a boilerplate chunk repeated thousands of times keeps its
+                full count but only this many sources
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_references = max_references
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+        self._exact: Dict[bytes, int] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._signatures: List[np.ndarray] = []
+        self._ids: List[str] = []
+        self._updated: Dict[str, DuplicateReferences] = {}
+        self.stats = DedupStats()
+
+    def deduplicate(self, chunks: List[LangchainDocument]) -> List[LangchainDocument]:
+        """Return the canonical chunks, dropping exact and near duplicates.
+
+        Canonical chunks get ``duplicate_count`` and ``duplicate_sources``
+        metadata referencing the dropped duplicates. Duplicates of canonical
+        chunks from earlier batches are collected for ``update_stored``.
+        """
+        unique_chunks = []
+        references: Dict[int, DuplicateReferences] = {}
+        batch_start = len(self._ids)
+        for chunk in chunks:
+            self.stats.total_chunks += 1
+            self.stats.total_characters += len(chunk.page_content)
+
+            index = self._find_canonical(chunk)
+            if index is None:
+                unique_chunks.append(chunk)
+                self.stats.unique_chunks += 1
+            else:
+                if index < batch_start:
+                    found = self._updated.setdefault(self._ids[index], DuplicateReferences())
+                else:
+                    found = references.setdefault(index, DuplicateReferences())
+                found.add(self._reference(chunk), self.max_references)
+                self.stats.saved_characters += len(chunk.page_content)
+
+        # Written once per canonical and batch rather than once per duplicate
+        for index, found in references.items():
+            found.apply(unique_chunks[index - batch_start].metadata, self.max_references)
+
+        return unique_chunks
+
+    def pop_updated(self) -> Dict[str, DuplicateReferences]:
+        """Duplicates of canonical chunks of earlier batches found since the last call.
+
+        When batches are stored as they are deduplicated, these chunks were
+        already stored and their duplicate metadata needs to be updated.
+
+        Returns:
+            New duplicates by the ``chunk_id`` of their canonical chunk
+        """
+        updated = self._updated
+        self._updated = {}
+        return updated
+
+    def update_stored(self, store: Any) -> int:
+        """Add the duplicates found by ``pop_updated`` to the stored canonical chunks.
+
+        Args:
+            store: Store with get_metadatas and update_metadatas, e.g. ChromaStore
+
+        Returns:
+            Number of stored chunks updated
+        """
+        updated = self.pop_updated()
+        if not updated:
+            return 0
+        metadatas = store.get_metadatas(list(updated))
+        for chunk_id, metadata in metadatas.items():
+            updated[chunk_id].apply(metadata, self.max_references)
+        if metadatas:
+            store.update_metadatas(list(metadatas), list(metadatas.values()))
+        return len(metadatas)
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text."""
+        words = _WORD.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            shingles = {" ".join(words)}
+        else:
+            shingles = {
+                " ".join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            }
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        # Values are below 2**31, so the kept signatures take half the memory
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _find_canonical(self, chunk: LangchainDocument) -> Optional[int]:
+        """Find the index of the canonical chunk for a chunk or register it as a new canonical."""
+        normalized = " ".join(chunk.page_content.lower().split())
+        digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+        if digest in self._exact:
+            self.stats.exact_duplicates += 1
+            return self._exact[digest]
+
+        signature = self.signature(chunk.page_content)
+        band_keys = [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+        candidates = set()
+        for band, key in enumerate(band_keys):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best_index, best_similarity = None, 0.0
+        for index in candidates:
+            similarity = float(np.mean(self._signatures[index] == signature))
+            if similarity > best_similarity:
+                best_index, best_similarity = index, similarity
+
+        if best_index is not None and best_similarity >= self.threshold:
+            self.stats.near_duplicates += 1
+            self._exact[digest] = best_index
+            return best_index
+
+        index = len(self._ids)
+        self._ids.append(str(chunk.metadata.get("chunk_id", index)))
+        self._signatures.append(signature)
+        self._exact[digest] = index
+        for band, key in enumerate(band_keys):
+            self._buckets[band].setdefault(key, []).append(index)
+        return None
+
+    @staticmethod
+    def _reference(duplicate: LangchainDocument) -> str:
+        """Source reference of a dropped duplicate, with its page if known."""
+        reference = str(duplicate.metadata.get("source", "unknown"))
+        if "page_number" in duplicate.metadata:
+            reference += f"#page={duplicate.metadata['page_number']}"
+        return reference
@@ -1,118 +1,238 @@
-import os
-from pathlib import Path
-from typing import List, Optional, Union
 import uuid
 from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
+
+from langchain_core.documents import Document as LangchainDocument
 
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredMarkdownLoader,
-)
-from langchain.schema import Document as LangchainDocument
+from rag.chunking import BaseChunker, ChunkerFactory, HierarchicalChunker
+from rag.core.models import Chunk
+from rag.core.models import Document as RagDocument
 
-from rag.core.models import Document as RagDocument, Chunk
-from rag.chunking import ChunkerFactory
-from rag.llm.vision_model import create_vision_model
-from .advanced_pdf_loader import AdvancedPDFLoader
+from .loader_registry import LoaderRegistry, default_registry
+
+if TYPE_CHECKING:
+    from .local_ocr import TesseractOCRProcessor
+    from .ocr import AsyncAzureOCRProcessor
 
 class DocumentLoader:
     """Handles loading and processing of various document types."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        pdf_workers: int = 1,
+        text_window_size: int = 1_000_000,
+        registry: Optional[LoaderRegistry] = None,
+        vision_max_connections: int = 8
+    ):
+        """
+        Args:
+            pdf_workers: Number of worker processes used to extract PDF pages
+            text_window_size: Maximum characters per document for streamed
+                text, log and Markdown files
+            registry: Loader registry, defaults to the built-in loaders
+            vision_max_connections: Connection pool size of the shared vision
+                model used to describe PDF images
+        """
         # We'll create the appropriate chunker when needed
         self.chunker = None
+        self.pdf_workers = pdf_workers
+        self.text_window_size = text_window_size
+        self.registry = registry or default_registry()
+        self.vision_max_connections = vision_max_connections
 
     def load_documents(
         self, path: Union[str, Path], recursive: bool = False
     ) -> List[LangchainDocument]:
         """Load documents from the given path."""
-        path = Path(path)
-        documents = []
+        return list(self.iter_documents(path, recursive))
+
+    def iter_documents(
+        self, path: Union[str, Path], recursive: bool = False
+    ) -> Iterator[LangchainDocument]:
+        """Lazily load documents from the given path.
 
+        Files are loaded one at a time and large text files are streamed in
+        windows, so only the document being processed is held in memory.
+        """
+        path = Path(path)
         if path.is_file():
-            documents.extend(self._load_single_file(path))
+            yield from self._iter_single_file(path)
         elif path.is_dir():
             pattern = "**/*" if recursive else "*"
             for file_path in path.glob(pattern):
                 if file_path.is_file():
-                    documents.extend(self._load_single_file(file_path))
+                    yield from self._iter_single_file(file_path)
+
+    def load_ocr_documents(
+        self,
+        path: Union[str, Path],
+        processor: Optional[Union["AsyncAzureOCRProcessor", "TesseractOCRProcessor"]] = None,
+        recursive: bool = False
+    ) -> Iterator[LangchainDocument]:
+        """OCR scanned documents and yield one document per page.
 
-        return documents
+        Files are processed concurrently, by the OCR service or by local
+        workers, and pages are yielded as soon as they are recognized, so they
+        can be chunked while the remaining files are still being processed.
+
+        Args:
+            path: File or directory with PDFs or images
+            processor: Azure or local OCR processor, Azure from the settings if not given
+            recursive: Include subdirectories
+        """
+        from .ocr import OCR_FILE_EXTENSIONS, AsyncAzureOCRProcessor
+
+        path = Path(path)
+        if path.is_dir():
+            pattern = "**/*" if recursive else "*"
+            file_paths = [
+                file_path for file_path in sorted(path.glob(pattern))
+                if file_path.is_file() and file_path.suffix.lower() in OCR_FILE_EXTENSIONS
+            ]
+        else:
+            file_paths = [path]
+
+        processor = processor or AsyncAzureOCRProcessor()
+        for response in processor.stream_pages(file_paths):
+            source = Path(response.source)
+            yield LangchainDocument(
+                page_content=response.text,
+                metadata={
+                    "source": str(source),
+                    "file_name": source.name,
+                    "page_number": response.page_number,
+                    "content_type": "ocr",
+                    "ocr_confidence": response.confidence
+                }
+            )
 
     def _load_single_file(self, file_path: Path) -> List[LangchainDocument]:
         """Load a single file based on its extension."""
+        return list(self._iter_single_file(file_path))
+
+    def _iter_single_file(self, file_path: Path) -> Iterator[LangchainDocument]:
+        """Lazily load a single file based on its extension."""
         loader = self._get_loader(file_path)
         if loader:
-            return loader.load()
-        return []
+            yield from loader.lazy_load()
 
     def _get_loader(self, file_path: Path):
-        """Get the appropriate loader for the file type."""
-        suffix = file_path.suffix.lower()
-        if suffix == ".pdf":
-            # return PyPDFLoader(str(file_path))
-            vision_model = create_vision_model(
-                api_key=os.getenv("OPENAI_API_KEY"),
-                model_name="gpt-4.1-nano",
-                max_tokens=300,
-            )
-
-            return AdvancedPDFLoader(
-                file_path=file_path,
-                vision_model=vision_model,
-                include_images=True,
-                include_tables=True
-            )
-        elif suffix == ".txt":
-            return TextLoader(str(file_path))
-        elif suffix == ".md":
-            return UnstructuredMarkdownLoader(str(file_path))
-        return None
+        """Get the appropriate loader for the file type from the registry."""
+        return self.registry.get_loader(
+            file_path,
+            pdf_workers=self.pdf_workers,
+            text_window_size=self.text_window_size,
+            vision_max_connections=self.vision_max_connections
+        )
 
     def chunk_document(
         self, document: LangchainDocument, chunk_size: int = 1000, chunk_overlap: int = 200
     ) -> List[LangchainDocument]:
         """Split a document into chunks using the appropriate chunker."""
-        # Get the source file path from metadata
         source_path = document.metadata.get('source', '')
+        self.chunker = self._get_chunker(document, chunk_size, chunk_overlap)
         
-        # Create the appropriate chunker based on the file type
-        self.chunker = ChunkerFactory.get_chunker_for_file(
-            source_path,
+        print(f"Using chunker: {self.chunker.__class__.__name__} for document: {source_path}")
+
+        # Use our custom chunker
+        chunks = self.chunker.chunk(self._to_rag_document(document))
+
+        return self._to_langchain_chunks(document, chunks, self.chunker.__class__.__name__)
+
+    def chunk_document_hierarchical(
+        self,
+        document: LangchainDocument,
+        chunk_size: int = 400,
+        chunk_overlap: int = 50,
+        parent_chunk_size: int = 2000,
+    ) -> Tuple[List[LangchainDocument], List[LangchainDocument]]:
+        """Split a document into parent chunks and the child chunks to embed.
+
+        The parent level uses the chunker that would be picked for the file
+        (e.g. one parent per PDF page), the child level splits every parent
+        into small chunks that reference it through ``parent_id``.
+
+        Returns:
+            Tuple of (parents, children)
+        """
+        source_path = document.metadata.get('source', '')
+        parent_chunker = self._get_chunker(document, parent_chunk_size, 0)
+        self.chunker = HierarchicalChunker(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            parent_chunk_size=parent_chunk_size,
+            parent_chunker=parent_chunker
+        )
+
+        print(f"Using chunker: {self.chunker.__class__.__name__} "
+              f"({parent_chunker.__class__.__name__} parents) for document: {source_path}")
+
+        parents, children = self.chunker.chunk_hierarchy(self._to_rag_document(document))
+        chunker_name = self.chunker.__class__.__name__
+        return (
+            self._to_langchain_chunks(document, parents, chunker_name),
+            self._to_langchain_chunks(document, children, chunker_name)
+        )
+
+    def _get_chunker(
+        self, document: LangchainDocument, chunk_size: int, chunk_overlap: int
+    ) -> BaseChunker:
+        """Create the appropriate chunker for a document."""
+        # Pages with tables use the table-aware chunker so rows keep their header
+        if document.metadata.get("has_tables"):
+            return ChunkerFactory.get_chunker(
+                "table",
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            )
+        # Otherwise choose based on the file type
+        return ChunkerFactory.get_chunker_for_file(
+            document.metadata.get('source', ''),
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap
         )
-        
-        print(f"Using chunker: {self.chunker.__class__.__name__} for document: {source_path}")
-        
-        # Convert LangchainDocument to our RagDocument
-        rag_document = RagDocument(
+
+    @staticmethod
+    def _to_rag_document(document: LangchainDocument) -> RagDocument:
+        """Convert a LangchainDocument to our RagDocument."""
+        return RagDocument(
             id=str(uuid.uuid4()),
             content=document.page_content,
             metadata=document.metadata,
-            source=source_path,
+            source=document.metadata.get('source', ''),
             created_at=datetime.now(),
             updated_at=datetime.now()
         )
-        
-        # Use our custom chunker
-        chunks = self.chunker.chunk(rag_document)
-        
-        # Convert our Chunks back to LangchainDocuments
+
+    @staticmethod
+    def _to_langchain_chunks(
+        document: LangchainDocument, chunks: List[Chunk], chunker_name: str
+    ) -> List[LangchainDocument]:
+        """Convert our Chunks back to LangchainDocuments."""
+        # Chunk offsets are relative to the document; streamed windows start
+        # further into the file
+        offset = document.metadata.get("window_start", 0)
         langchain_chunks = []
         for chunk in chunks:
+            # Keep chunk-level metadata (e.g. table metadata) that the vector
+            # store can hold, without overriding the document's own metadata
+            chunk_metadata = {
+                key: value for key, value in chunk.metadata.items()
+                if key not in document.metadata and isinstance(value, (str, int, float, bool))
+            }
             langchain_chunk = LangchainDocument(
                 page_content=chunk.content,
                 metadata={
                     **document.metadata,
+                    **chunk_metadata,
                     "chunk_id": chunk.id,
                     "document_id": chunk.document_id,
-                    "start_index": chunk.metadata.get("start_index", 0),
-                    "end_index": chunk.metadata.get("end_index", 0),
-                    "chunker_type": self.chunker.__class__.__name__
+                    "start_index": chunk.metadata.get("start_index", 0) + offset,
+                    "end_index": chunk.metadata.get("end_index", 0) + offset,
+                    "chunker_type": chunker_name
                 }
             )
             langchain_chunks.append(langchain_chunk)
         
-        return langchain_chunks 
\ No newline at end of file
+        return langchain_chunks
@@ -0,0 +1,64 @@
+"""Factories for the built-in document loaders.
+
+Each factory imports its loader when called, see loader_registry.
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+
+def pdf_loader(
+    file_path: Path, pdf_workers: int = 1, vision_max_connections: int = 8, **options: Any
+):
+    """PDF pages with tables and image descriptions.
+
+    All PDFs share the process-wide vision model and its connection pool.
+    """
+    from rag.llm.vision_model import get_vision_model
+
+    from .advanced_pdf_loader import AdvancedPDFLoader
+
+    vision_model = get_vision_model(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model_name="gpt-4.1-nano",
+        max_tokens=300,
+        max_connections=vision_max_connections,
+    )
+    return AdvancedPDFLoader(
+        file_path=file_path,
+        vision_model=vision_model,
+        include_images=True,
+        include_tables=True,
+        max_workers=pdf_workers
+    )
+
+def text_loader(file_path: Path, text_window_size: int = 1_000_000, **options: Any):
+    """Plain text and log files, streamed in windows."""
+    from .streaming_loader import StreamingTextLoader
+    return StreamingTextLoader(file_path, window_size=text_window_size)
+
+def markdown_loader(file_path: Path, text_window_size: int = 1_000_000, **options: Any):
+    """Markdown files, streamed in windows cut before headings."""
+    from .streaming_loader import StreamingMarkdownLoader
+    return StreamingMarkdownLoader(file_path, window_size=text_window_size)
+
+def html_loader(file_path: Path, **options: Any):
+    """HTML files, kept as HTML for header-based chunking."""
+    from langchain_community.document_loaders import TextLoader
+    return TextLoader(str(file_path), encoding="utf-8")
+
+def csv_loader(file_path: Path, **options: Any):
+    """CSV files, one document per row."""
+    from langchain_community.document_loaders import CSVLoader
+    return CSVLoader(str(file_path), encoding="utf-8")
+
+def docx_loader(file_path: Path, **options: Any):
+    """Word documents with tables as Markdown."""
+    from .office_loaders import DocxLoader
+    return DocxLoader(file_path)
+
+def xlsx_loader(file_path: Path, **options: Any):
+    """Excel workbooks as Markdown tables per block of rows."""
+    from .office_loaders import XlsxLoader
+    return XlsxLoader(file_path)
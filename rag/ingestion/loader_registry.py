@@ -0,0 +1,132 @@
+"""Registry mapping file types to document loader factories.
+
+Loader factories are registered as "module:attribute" strings and imported on
+first use, so the PDF, vision and Office stacks are only imported when a file
+of that type is actually loaded. A factory is called with the file path and
+the loader options of DocumentLoader (e.g. ``pdf_workers``) and returns a
+langchain document loader; factories ignore options they do not use.
+
+Other packages can add loaders through the ``rag.loaders`` entry point group,
+with the file extension (e.g. ".eml") as entry point name.
+"""
+
+import mimetypes
+from importlib import import_module
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+LoaderFactory = Callable[..., Any]
+
+ENTRY_POINT_GROUP = "rag.loaders"
+
+class LoaderRegistry:
+    """Registry for document loader factories by extension and MIME type."""
+
+    def __init__(self):
+        self._by_extension: Dict[str, Union[str, LoaderFactory]] = {}
+        self._by_mime_type: Dict[str, Union[str, LoaderFactory]] = {}
+        self._entry_points_loaded = False
+
+    def register(
+        self,
+        factory: Union[str, LoaderFactory],
+        extensions: Optional[List[str]] = None,
+        mime_types: Optional[List[str]] = None
+    ) -> None:
+        """Register a loader factory.
+
+        Args:
+            factory: Callable or "module:attribute" path, imported on first use
+            extensions: File extensions including the dot, e.g. [".docx"]
+            mime_types: MIME types, e.g. ["application/pdf"]
+        """
+        for extension in extensions or []:
+            self._by_extension[extension.lower()] = factory
+        for mime_type in mime_types or []:
+            self._by_mime_type[mime_type.lower()] = factory
+
+    @property
+    def extensions(self) -> List[str]:
+        """Registered file extensions."""
+        self._load_entry_points()
+        return sorted(self._by_extension)
+
+    def get_factory(
+        self, file_path: Union[str, Path], mime_type: Optional[str] = None
+    ) -> Optional[LoaderFactory]:
+        """Find the loader factory for a file.
+
+        The file extension takes precedence; otherwise the given MIME type or
+        the one guessed from the file name is used.
+
+        Returns:
+            The (imported) factory, or None if the file type is not supported
+        """
+        self._load_entry_points()
+        extension = Path(file_path).suffix.lower()
+        key, table = extension, self._by_extension
+        if extension not in self._by_extension:
+            mime_type = (mime_type or mimetypes.guess_type(str(file_path))[0] or "").lower()
+            key, table = mime_type, self._by_mime_type
+            if mime_type not in self._by_mime_type:
+                return None
+
+        factory = table[key]
+        if isinstance(factory, str):
+            spec, factory = factory, _import_factory(factory)
+            # Cache the imported factory for every type it was registered for
+            for registered in (self._by_extension, self._by_mime_type):
+                for name, value in registered.items():
+                    if value == spec:
+                        registered[name] = factory
+        return factory
+
+    def get_loader(
+        self, file_path: Union[str, Path], mime_type: Optional[str] = None, **options: Any
+    ) -> Optional[Any]:
+        """Create the loader for a file, or return None if the type is not supported."""
+        factory = self.get_factory(file_path, mime_type)
+        if factory is None:
+            return None
+        return factory(Path(file_path), **options)
+
+    def _load_entry_points(self) -> None:
+        """Register loaders of installed plugin packages, once."""
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            self.register(entry_point.value, extensions=[entry_point.name])
+
+def _import_factory(path: str) -> LoaderFactory:
+    module_name, _, attribute = path.partition(":")
+    return getattr(import_module(module_name), attribute)
+
+def create_default_registry() -> LoaderRegistry:
+    """Create a registry with the built-in loaders."""
+    registry = LoaderRegistry()
+    factories = "rag.ingestion.loader_factories"
+    registry.register(f"{factories}:pdf_loader", [".pdf"], ["application/pdf"])
+    registry.register(f"{factories}:text_loader", [".txt", ".log"], ["text/plain"])
+    registry.register(f"{factories}:markdown_loader", [".md", ".markdown"], ["text/markdown"])
+    registry.register(f"{factories}:html_loader", [".html", ".htm"], ["text/html"])
+    registry.register(f"{factories}:csv_loader", [".csv"], ["text/csv"])
+    registry.register(
+        f"{factories}:docx_loader", [".docx"],
+        ["application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
+    )
+    registry.register(
+        f"{factories}:xlsx_loader", [".xlsx"],
+        ["application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"]
+    )
+    return registry
+
+_default_registry: Optional[LoaderRegistry] = None
+
+def default_registry() -> LoaderRegistry:
+    """Process-wide registry used by DocumentLoader unless another one is given."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = create_default_registry()
+    return _default_registry
@@ -0,0 +1,211 @@
+"""Local OCR with Tesseract for offline processing.
+
+Pages are rendered with PDFium and recognized by Tesseract in a pool of worker
+processes, one Tesseract thread per worker, so a batch of scans keeps every
+core busy without any network access. Requires the ``pytesseract`` package
+(``pip install rag-system[ocr]``) and the Tesseract binary.
+"""
+
+import importlib.util
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pypdfium2 as pdfium
+from PIL import Image
+
+from rag.core.interfaces import IOCRProcessor
+from rag.ingestion.ocr import OCRLine, OCRResponse, _responses_to_text
+
+logger = logging.getLogger("local_ocr")
+
+
+class TesseractOCRProcessor(IOCRProcessor):
+    """OCR processor running Tesseract locally in worker processes."""
+
+    def __init__(
+        self,
+        dpi: int = 300,
+        lang: str = "eng",
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 2,
+        config: str = "",
+        tesseract_cmd: Optional[str] = None
+    ):
+        """
+        Args:
+            dpi: Resolution at which PDF pages are rendered for recognition
+            lang: Tesseract language(s), e.g. "deu+eng"
+            max_workers: Worker processes, defaults to the number of CPUs
+            pages_per_task: Pages recognized per worker task
+            config: Additional Tesseract command line options
+            tesseract_cmd: Path to the Tesseract binary if it is not on PATH
+        """
+        if importlib.util.find_spec("pytesseract") is None:
+            raise ImportError(
+                "TesseractOCRProcessor requires pytesseract. Install it with "
+                "`pip install pytesseract` and install the Tesseract binary."
+            )
+        self.dpi = dpi
+        self.lang = lang
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.pages_per_task = max(1, pages_per_task)
+        self.config = config
+        self.tesseract_cmd = tesseract_cmd
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the recognition settings, e.g. for caching or reports."""
+        return f"tesseract-{self.lang}-{self.dpi}dpi"
+
+    def _options(self) -> Dict[str, Any]:
+        return {
+            "dpi": self.dpi,
+            "lang": self.lang,
+            "config": self.config,
+            "tesseract_cmd": self.tesseract_cmd,
+        }
+
+    def _tasks(self, file_paths: List[Path]) -> Iterator[Tuple[Path, int, int]]:
+        for path in file_paths:
+            total_pages = _count_pages(path)
+            for start in range(0, total_pages, self.pages_per_task):
+                yield path, start, min(start + self.pages_per_task, total_pages)
+
+    def stream_pages(self, file_paths: Iterable[Union[str, Path]]) -> Iterator[OCRResponse]:
+        """Recognize documents and yield their pages in order.
+
+        At most ``2 * max_workers`` tasks are in flight; finished tasks wait
+        until all earlier pages were yielded.
+
+        Args:
+            file_paths: PDFs or images (multi-frame TIFFs yield one page per frame)
+
+        Yields:
+            OCRResponse per page, with the document path as source
+        """
+        paths = [Path(file_path) for file_path in file_paths]
+        for path in paths:
+            if not path.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+
+        tasks = self._tasks(paths)
+        options = self._options()
+        logger.info(f"Recognizing {len(paths)} documents with {self.max_workers} Tesseract "
+                    f"workers at {self.dpi} DPI")
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker
+        ) as executor:
+            pending = deque(
+                executor.submit(_recognize_pages, options, *task)
+                for task in islice(tasks, 2 * self.max_workers)
+            )
+            while pending:
+                responses = pending.popleft().result()
+                for task in islice(tasks, 1):
+                    pending.append(executor.submit(_recognize_pages, options, *task))
+                yield from responses
+
+    def process(self, file_path: str) -> str:
+        """Process a document using OCR."""
+        return _responses_to_text(list(self.stream_pages([file_path])))
+
+
+def _count_pages(path: Path) -> int:
+    if path.suffix.lower() == ".pdf":
+        pdf = pdfium.PdfDocument(str(path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    with Image.open(path) as image:
+        return getattr(image, "n_frames", 1)
+
+
+def _init_worker() -> None:
+    """Limit Tesseract to one thread; the pool provides the parallelism."""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _recognize_pages(
+    options: Dict[str, Any], path: Path, start: int, end: int
+) -> List[OCRResponse]:
+    """Worker entry point: render and recognize the pages in [start, end)."""
+    import pytesseract
+
+    if options["tesseract_cmd"]:
+        pytesseract.pytesseract.tesseract_cmd = options["tesseract_cmd"]
+
+    responses = []
+    if path.suffix.lower() == ".pdf":
+        pdf = pdfium.PdfDocument(str(path))
+        try:
+            for index in range(start, end):
+                page = pdf[index]
+                try:
+                    width, height = page.get_size()
+                    bitmap = page.render(scale=options["dpi"] / 72, grayscale=True)
+                    image = bitmap.to_pil()
+                finally:
+                    page.close()
+                # Geometry in inches, like Azure reports it for PDFs
+                response = _recognize_image(pytesseract, image, options, scale=1 / options["dpi"])
+                image.close()
+                response.page_number = index + 1
+                response.width, response.height, response.unit = width / 72, height / 72, "inch"
+                response.source = str(path)
+                responses.append(response)
+        finally:
+            pdf.close()
+    else:
+        with Image.open(path) as image:
+            # Seek straight to the task's frames instead of iterating from frame 0
+            for index in range(start, end):
+                image.seek(index)
+                response = _recognize_image(pytesseract, image.convert("L"), options, scale=1.0)
+                response.page_number = index + 1
+                response.width, response.height, response.unit = image.width, image.height, "pixel"
+                response.source = str(path)
+                responses.append(response)
+    return responses
+
+
+def _recognize_image(
+    pytesseract: Any, image: Image.Image, options: Dict[str, Any], scale: float
+) -> OCRResponse:
+    """Recognize one page image and group Tesseract's words into lines."""
+    data = pytesseract.image_to_data(
+        image, lang=options["lang"], config=options["config"], output_type=pytesseract.Output.DICT
+    )
+    lines: Dict[Tuple[int, int, int], List[int]] = {}
+    confidences = []
+    for i, word in enumerate(data["text"]):
+        confidence = float(data["conf"][i])
+        if not word.strip() or confidence < 0:
+            continue
+        line = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(line, []).append(i)
+        confidences.append(confidence / 100)
+
+    ocr_lines = []
+    for indexes in lines.values():
+        left = min(data["left"][i] for i in indexes)
+        top = min(data["top"][i] for i in indexes)
+        right = max(data["left"][i] + data["width"][i] for i in indexes)
+        bottom = max(data["top"][i] + data["height"][i] for i in indexes)
+        polygon = [left, top, right, top, right, bottom, left, bottom]
+        ocr_lines.append(OCRLine(
+            content=" ".join(data["text"][i].strip() for i in indexes),
+            polygon=[round(value * scale, 4) for value in polygon]
+        ))
+
+    return OCRResponse(
+        page_number=1,
+        text="\n".join(line.content for line in ocr_lines),
+        confidence=sum(confidences) / len(confidences) if confidences else 0.0,
+        lines=ocr_lines
+    )
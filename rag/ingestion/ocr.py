@@ -1,16 +1,26 @@
-from pathlib import Path
-from typing import List, Optional
-import time
+import asyncio
 import logging
-from azure.core.credentials import AzureKeyCredential
+import queue
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Union
+
+import pypdfium2 as pdfium
 from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.ai.documentintelligence.aio import (
+    DocumentIntelligenceClient as AsyncDocumentIntelligenceClient,
+)
+from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+from pydantic import BaseModel
 from rich.console import Console
 from rich.logging import RichHandler
-from pydantic import BaseModel
-
 
 from rag.core.config import Settings
 from rag.core.interfaces import IOCRProcessor
+from rag.ingestion.ocr_cache import OCRCache
 
 settings = Settings()
 
@@ -22,18 +32,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger("azure_ocr")
 
+class OCRLine(BaseModel):
+    """A recognized text line and its bounding polygon"""
+    content: str
+    polygon: List[float] = []
+
+
 class OCRResponse(BaseModel):
     """Model for OCR response data"""
     page_number: int
     text: str
-    confidence: float = 1.0  # Default to 1.0 since confidence is not provided by the API
+    confidence: float = 1.0  # Mean word confidence, 1.0 if the API provides none
+    source: str = ""
+    width: Optional[float] = None
+    height: Optional[float] = None
+    unit: Optional[str] = None
+    lines: List[OCRLine] = []
+
+
+def _page_to_response(page: Any, source: Union[str, Path] = "") -> OCRResponse:
+    """Convert a page of an AnalyzeResult to an OCRResponse."""
+    lines = [
+        OCRLine(content=line.content, polygon=[round(value, 4) for value in line.polygon or []])
+        for line in page.lines or []
+    ]
+    confidences = [word.confidence for word in page.words or [] if word.confidence is not None]
+    return OCRResponse(
+        page_number=page.page_number,
+        text="\n".join(line.content for line in lines),
+        confidence=sum(confidences) / len(confidences) if confidences else 1.0,
+        source=str(source),
+        width=page.width,
+        height=page.height,
+        unit=page.unit,
+        lines=lines
+    )
+
+
+def _response_to_cache(response: OCRResponse) -> Dict[str, Any]:
+    """Compact cache representation; the text is rebuilt from the lines."""
+    return response.model_dump(exclude={"source", "text"})
+
+
+def _response_from_cache(page: Dict[str, Any], source: Union[str, Path]) -> OCRResponse:
+    return OCRResponse(
+        **page,
+        text="\n".join(line["content"] for line in page["lines"]),
+        source=str(source)
+    )
+
+
+def _responses_to_text(responses: List[OCRResponse]) -> str:
+    """Join the pages of a document with page headers."""
+    return "\n".join(f"Page {response.page_number}\n\n{response.text}" for response in responses)
 
 
 class AzureOCRProcessor(IOCRProcessor):
     """Class for processing documents using Azure OCR"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[OCRCache] = None):
+        """
+        Args:
+            cache: Optional cache of OCR results for unchanged files
+        """
         super().__init__()
+        self.cache = cache
         self.max_retries = 3
         self.retry_delay = 1
         self.timeout = 30
@@ -73,16 +136,7 @@ class AzureOCRProcessor(IOCRProcessor):
     def _extract_text_from_result(self, result: dict) -> str:
         """Extract text and metadata from OCR result and return it as a text string"""
         
-        text = ""
-        text_lines = []        
-        # Process each page
-        for page_idx, page in enumerate(result.pages, 1):
-            text_lines.append(f"Page {page_idx}\n")
-            # Extract lines from the page
-            for line in page.lines:
-                text_lines.append(line.content)
-
-        text = "\n".join(text_lines)
+        text = _responses_to_text([_page_to_response(page) for page in result.pages])
 
         print(text)
 
@@ -106,9 +160,21 @@ class AzureOCRProcessor(IOCRProcessor):
             raise FileNotFoundError(f"File not found: {file_path}")
 
         logger.info(f"Processing document: {file_path}")
+
+        file_hash = None
+        if self.cache is not None:
+            file_hash = OCRCache.file_hash(file_path)
+            cached = self.cache.get(file_hash, "prebuilt-read")
+            if cached is not None:
+                logger.info(f"Using cached OCR result for {file_path}")
+                responses = [_response_from_cache(page, file_path) for page in cached]
+                return _responses_to_text(responses)
         
         try:
             result = self._process_document(file_path)        
+            if self.cache is not None:
+                pages = [_response_to_cache(_page_to_response(page)) for page in result.pages]
+                self.cache.put(file_hash, "prebuilt-read", None, pages)
             responses = self._extract_text_from_result(result)
             
             logger.info(f"Successfully processed document with {len(responses)} pages")
@@ -121,3 +187,259 @@ class AzureOCRProcessor(IOCRProcessor):
     def process(self, file_path: str) -> str:
         """Process a document using OCR."""
         return self.forward(file_path)
+
+
+# File types accepted by Azure Document Intelligence
+OCR_FILE_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp"}
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class AsyncAzureOCRProcessor(IOCRProcessor):
+    """Concurrent OCR of many documents with Azure Document Intelligence.
+
+    All documents are submitted at once, while a semaphore limits how many
+    analyze operations are in flight. Large PDFs are split into page ranges
+    that are analyzed as separate operations, and pages are yielded as soon as
+    the operation they belong to completes.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        pages_per_request: Optional[int] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        polling_interval: float = 1.0,
+        model_id: str = "prebuilt-read",
+        cache: Optional[OCRCache] = None
+    ):
+        """
+        Args:
+            endpoint: Document Intelligence endpoint, defaults to AZURE_OCR_ENDPOINT
+            api_key: API key, defaults to AZURE_OCR_KEY
+            max_concurrency: Maximum number of analyze operations in flight,
+                defaults to AZURE_OCR_MAX_CONCURRENCY
+            pages_per_request: PDFs with more pages are split into page ranges
+                of this size, defaults to AZURE_OCR_PAGES_PER_REQUEST. 0 disables splitting.
+            max_retries: Retries per page range on throttling and transient errors
+            retry_delay: Base delay in seconds for the exponential backoff
+            polling_interval: Seconds between status polls unless the service
+                asks for a different interval via Retry-After
+            model_id: Document Intelligence model
+            cache: Optional cache of OCR results. Cached page ranges of unchanged
+                files are yielded without calling the service.
+        """
+        super().__init__()
+        self.endpoint = endpoint or settings.AZURE_OCR_ENDPOINT
+        self.api_key = api_key or settings.AZURE_OCR_KEY
+        self.max_concurrency = max(1, max_concurrency or settings.AZURE_OCR_MAX_CONCURRENCY)
+        self.pages_per_request = (settings.AZURE_OCR_PAGES_PER_REQUEST
+                                  if pages_per_request is None else pages_per_request)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.polling_interval = polling_interval
+        self.model_id = model_id
+        self.cache = cache
+        self.failed: List[str] = []
+
+    def _create_client(self) -> AsyncDocumentIntelligenceClient:
+        """Create the async client. Retries are handled per page range."""
+        if not self.endpoint or not self.api_key:
+            raise ValueError("Azure OCR endpoint and API key must be configured")
+        return AsyncDocumentIntelligenceClient(
+            endpoint=self.endpoint,
+            credential=AzureKeyCredential(self.api_key),
+            retry_total=0
+        )
+
+    def page_ranges(self, file_path: Path) -> List[Optional[str]]:
+        """Split a document into the page ranges analyzed as separate requests.
+
+        Returns:
+            Page range strings like "1-50", or [None] to analyze the whole file
+        """
+        if file_path.suffix.lower() != ".pdf" or not self.pages_per_request:
+            return [None]
+        pdf = pdfium.PdfDocument(str(file_path))
+        try:
+            total_pages = len(pdf)
+        finally:
+            pdf.close()
+        if total_pages <= self.pages_per_request:
+            return [None]
+        return [
+            f"{start}-{min(start + self.pages_per_request - 1, total_pages)}"
+            for start in range(1, total_pages + 1, self.pages_per_request)
+        ]
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Whether an analyze failure is throttling or a transient error."""
+        if isinstance(error, HttpResponseError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (ServiceRequestError, ServiceResponseError, asyncio.TimeoutError))
+
+    async def _analyze(
+        self,
+        client: AsyncDocumentIntelligenceClient,
+        semaphore: asyncio.Semaphore,
+        file_path: Path,
+        pages: Optional[str]
+    ) -> List[OCRResponse]:
+        """Analyze one page range, retrying throttled and transient failures."""
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    # The file is streamed to the service instead of read into memory
+                    with open(file_path, "rb") as file:
+                        poller = await client.begin_analyze_document(
+                            self.model_id,
+                            file,
+                            pages=pages,
+                            content_type="application/octet-stream",
+                            polling_interval=self.polling_interval
+                        )
+                    result = await poller.result()
+                    break
+                except Exception as e:
+                    if attempt >= self.max_retries or not self._is_retryable(e):
+                        raise
+                    # Exponential backoff with jitter so throttled requests do not retry in lockstep
+                    delay = self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+                    logger.warning(f"Request for {file_path.name} (pages {pages or 'all'}) "
+                                   f"failed, retrying in {delay:.1f}s "
+                                   f"({attempt + 1}/{self.max_retries}): {str(e)}")
+                    await asyncio.sleep(delay)
+
+        return [_page_to_response(page, file_path) for page in result.pages or []]
+
+    async def iter_pages(
+        self, file_paths: Iterable[Union[str, Path]]
+    ) -> AsyncIterator[OCRResponse]:
+        """OCR documents concurrently and yield their pages as they complete.
+
+        Pages of one page range are yielded in order, page ranges and documents
+        in completion order. Page ranges that still fail after all retries are
+        logged, recorded in ``failed`` and skipped.
+
+        Args:
+            file_paths: Documents to process
+
+        Yields:
+            OCRResponse per page, with the document path as source
+        """
+        paths = [Path(file_path) for file_path in file_paths]
+        for path in paths:
+            if not path.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+
+        self.failed = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._create_client() as client:
+            requests = {}
+            cached = []
+            for path in paths:
+                file_hash = None
+                if self.cache is not None:
+                    # Hashing reads the whole file, keep it off the event loop
+                    file_hash = await asyncio.to_thread(OCRCache.file_hash, path)
+                for pages in self.page_ranges(path):
+                    if self.cache is not None:
+                        cached_pages = self.cache.get(file_hash, self.model_id, pages)
+                        if cached_pages is not None:
+                            cached.extend(_response_from_cache(page, path) for page in cached_pages)
+                            continue
+                    task = asyncio.ensure_future(self._analyze(client, semaphore, path, pages))
+                    requests[task] = (path, pages, file_hash)
+            logger.info(f"Submitted {len(requests)} OCR requests for {len(paths)} documents "
+                        f"({self.max_concurrency} concurrent, {len(cached)} pages cached)")
+            try:
+                for response in cached:
+                    yield response
+                pending = set(requests)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        path, pages, file_hash = requests[task]
+                        if task.exception() is not None:
+                            logger.error(f"OCR failed for {path} (pages {pages or 'all'}): "
+                                         f"{task.exception()}")
+                            self.failed.append(f"{path}" + (f" (pages {pages})" if pages else ""))
+                            continue
+                        if self.cache is not None:
+                            results = [_response_to_cache(response) for response in task.result()]
+                            self.cache.put(file_hash, self.model_id, pages, results)
+                        for response in task.result():
+                            yield response
+            finally:
+                for task in requests:
+                    task.cancel()
+                await asyncio.gather(*requests, return_exceptions=True)
+
+    def stream_pages(self, file_paths: Iterable[Union[str, Path]]) -> Iterator[OCRResponse]:
+        """Synchronous version of iter_pages for non-async callers.
+
+        The event loop runs in a background thread and pages are handed over
+        through a bounded queue, so the caller can process a page while other
+        operations are still polling. Once the caller stops iterating, no new
+        analyze requests are sent.
+        """
+        responses: queue.Queue = queue.Queue(maxsize=self.max_concurrency)
+        finished = object()
+        stopped = threading.Event()
+
+        def hand_over(item) -> bool:
+            while not stopped.is_set():
+                try:
+                    responses.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        async def produce():
+            pages = self.iter_pages(file_paths)
+            try:
+                async for response in pages:
+                    if not await asyncio.to_thread(hand_over, response):
+                        break
+            finally:
+                # Cancels the requests still in flight
+                await pages.aclose()
+
+        def run():
+            try:
+                asyncio.run(produce())
+            except BaseException as e:
+                hand_over(e)
+            finally:
+                hand_over(finished)
+
+        thread = threading.Thread(target=run, name="azure-ocr", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = responses.get()
+                if item is finished:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+        thread.join()
+
+    async def process_async(self, file_path: str) -> str:
+        """OCR a single document and return its text with page headers."""
+        responses = [response async for response in self.iter_pages([file_path])]
+        if self.failed:
+            raise Exception(f"Failed to process document: {', '.join(self.failed)}")
+        responses.sort(key=lambda response: response.page_number)
+        return _responses_to_text(responses)
+
+    def process(self, file_path: str) -> str:
+        """Process a document using OCR."""
+        return asyncio.run(self.process_async(file_path))
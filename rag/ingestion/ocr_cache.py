@@ -0,0 +1,161 @@
+"""Persistent, content-addressed cache for OCR results.
+
+Entries are keyed by the SHA-256 of the file content, the OCR model and the
+page range, so unchanged files are never sent to the OCR service twice, no
+matter where they are stored. Page data (line text and geometry) is stored as
+zlib-compressed JSON. The least recently used entries are evicted once the
+cache exceeds its size limit.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+
+class OCRCache:
+    """SQLite-backed LRU cache of OCR page results."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite file, defaults to data/ocr_cache.sqlite3 in the working directory
+            max_bytes: Upper bound on the compressed size of all entries
+        """
+        if path is None:
+            path = os.path.join(os.getcwd(), "data", "ocr_cache.sqlite3")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # The async OCR pipeline may run its event loop in a separate thread
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_results (key TEXT PRIMARY KEY, data BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS ocr_results_last_used ON ocr_results (last_used)"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def file_hash(file_path: Union[str, Path]) -> str:
+        """SHA-256 of a file, read in blocks."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _key(file_hash: str, model_id: str, pages: Optional[str]) -> str:
+        return f"{file_hash}:{model_id}:{pages or 'all'}"
+
+    def get(
+        self, file_hash: str, model_id: str, pages: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get the cached pages of a file and page range.
+
+        Returns:
+            Page dictionaries as passed to ``put``, or None on a cache miss
+        """
+        key = self._key(file_hash, model_id, pages)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT data FROM ocr_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute(
+                "UPDATE ocr_results SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self.connection.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def get_file(self, file_hash: str, model_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get all cached pages of a file, whatever page ranges they were stored under.
+
+        Returns:
+            Page dictionaries sorted by page number, or None if nothing is cached
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT data FROM ocr_results WHERE key LIKE ?", (f"{file_hash}:{model_id}:%",)
+            ).fetchall()
+        if not rows:
+            return None
+        # Overlapping page ranges (e.g. after changing the split size) hold the same pages
+        pages = {
+            page["page_number"]: page
+            for row in rows
+            for page in json.loads(zlib.decompress(row[0]))
+        }
+        return [pages[number] for number in sorted(pages)]
+
+    def put(
+        self, file_hash: str, model_id: str, pages: Optional[str], results: List[Dict[str, Any]]
+    ) -> None:
+        """Store the pages of a file and page range and evict old entries if needed."""
+        data = zlib.compress(json.dumps(results, separators=(",", ":")).encode("utf-8"), 6)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO ocr_results (key, data, size, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (self._key(file_hash, model_id, pages), data, len(data), time.time())
+            )
+            self._evict()
+            self.connection.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        excess = self._size_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        keys = []
+        rows = self.connection.execute("SELECT key, size FROM ocr_results ORDER BY last_used")
+        for key, size in rows:
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self.connection.executemany("DELETE FROM ocr_results WHERE key = ?", keys)
+
+    def _size_bytes(self) -> int:
+        return self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM ocr_results"
+        ).fetchone()[0]
+
+    def size_bytes(self) -> int:
+        """Compressed size of all entries."""
+        with self._lock:
+            return self._size_bytes()
+
+    def count(self) -> int:
+        """Number of cached page ranges."""
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM ocr_results").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self.connection.execute("DELETE FROM ocr_results")
+            self.connection.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
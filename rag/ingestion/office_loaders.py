@@ -0,0 +1,129 @@
+"""Loaders for Word and Excel files.
+
+Tables are converted to Markdown and flagged with ``has_tables`` so that the
+table-aware chunker keeps rows together with their header. Requires
+python-docx and openpyxl (``pip install rag-system[office]``).
+"""
+
+from pathlib import Path
+from typing import Any, Iterator, List, Union
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+
+def _format_cell(cell: Any) -> str:
+    """Format a table cell so that every table row stays on a single line."""
+    if cell is None:
+        return ""
+    return " ".join(str(cell).split()).replace("|", "\\|")
+
+def markdown_table(rows: List[List[Any]]) -> str:
+    """Format rows as a Markdown table with the first row as header."""
+    if not rows:
+        return ""
+    width = max(len(row) for row in rows)
+    lines = []
+    for index, row in enumerate(rows):
+        cells = [_format_cell(cell) for cell in row] + [""] * (width - len(row))
+        lines.append("| " + " | ".join(cells) + " |")
+        if index == 0:
+            lines.append("| " + " | ".join(["---"] * width) + " |")
+    return "\n".join(lines)
+
+class DocxLoader(BaseLoader):
+    """Load a Word document as one document with headings and tables as Markdown."""
+
+    def __init__(self, file_path: Union[str, Path]):
+        self.file_path = Path(file_path)
+
+    def lazy_load(self) -> Iterator[Document]:
+        from docx import Document as open_docx
+        from docx.table import Table
+
+        document = open_docx(str(self.file_path))
+        blocks = []
+        table_count = 0
+        # Paragraphs and tables in document order
+        for item in document.iter_inner_content():
+            if isinstance(item, Table):
+                rows = [[cell.text for cell in row.cells] for row in item.rows]
+                if rows:
+                    blocks.append(markdown_table(rows))
+                    table_count += 1
+                continue
+            text = item.text.strip()
+            if not text:
+                continue
+            style = item.style.name if item.style is not None else ""
+            if style.startswith("Heading") and style[len("Heading"):].strip().isdigit():
+                text = "#" * int(style[len("Heading"):]) + " " + text
+            elif style == "Title":
+                text = "# " + text
+            blocks.append(text)
+
+        yield Document(
+            page_content="\n\n".join(blocks),
+            metadata={
+                "source": str(self.file_path),
+                "file_name": self.file_path.name,
+                "has_tables": table_count > 0,
+                "table_count": table_count,
+            }
+        )
+
+class XlsxLoader(BaseLoader):
+    """Load an Excel workbook as Markdown tables, one document per block of rows.
+
+    Sheets are read in read-only mode, row by row, so large workbooks are not
+    loaded into memory at once. The first non-empty row of a sheet is used as
+    header and repeated in every block.
+    """
+
+    def __init__(self, file_path: Union[str, Path], rows_per_document: int = 200):
+        self.file_path = Path(file_path)
+        self.rows_per_document = max(1, rows_per_document)
+
+    def _document(
+        self, sheet_name: str, header: List[Any], rows: List[List[Any]], row_start: int,
+        row_end: int
+    ) -> Document:
+        return Document(
+            page_content=f"Sheet: {sheet_name}\n\n" + markdown_table([header] + rows),
+            metadata={
+                "source": str(self.file_path),
+                "file_name": self.file_path.name,
+                "sheet_name": sheet_name,
+                "row_start": row_start,
+                "row_end": row_end,
+                "has_tables": True,
+            }
+        )
+
+    def lazy_load(self) -> Iterator[Document]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(str(self.file_path), read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                header = None
+                rows: List[List[Any]] = []
+                row_start = row_end = 0
+                for row_number, values in enumerate(sheet.iter_rows(values_only=True), 1):
+                    if all(value is None for value in values):
+                        continue
+                    if header is None:
+                        header = list(values)
+                        continue
+                    if not rows:
+                        row_start = row_number
+                    rows.append(list(values))
+                    # Blank rows are skipped, so the block may span more rows
+                    row_end = row_number
+                    if len(rows) >= self.rows_per_document:
+                        yield self._document(sheet.title, header, rows, row_start, row_end)
+                        rows = []
+                if header is not None and rows:
+                    yield self._document(sheet.title, header, rows, row_start, row_end)
+        finally:
+            workbook.close()
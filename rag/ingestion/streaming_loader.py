@@ -0,0 +1,134 @@
+"""Streaming loaders for large text, log and Markdown files.
+
+Files are read line by line through a buffered reader and emitted as windows
+of at most ``window_size`` characters. A window is cut at the last section
+(Markdown heading) or paragraph boundary it contains, so memory stays bounded
+by the window size regardless of the file size. Every window records its
+character offset in the file as ``window_start``, which DocumentLoader adds to
+chunk offsets to keep them globally correct.
+"""
+
+from pathlib import Path
+from typing import Iterator, List, Union
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+# Boundary kinds, in order of preference for cutting a window
+_LINE = 0
+_PARAGRAPH = 1
+_SECTION = 2
+
+class StreamingTextLoader(BaseLoader):
+    """Load a text file as a sequence of windows cut at paragraph boundaries."""
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        window_size: int = 1_000_000,
+        encoding: str = "utf-8",
+        errors: str = "strict"
+    ):
+        """
+        Args:
+            file_path: Path to the file
+            window_size: Maximum number of characters per window
+            encoding: File encoding
+            errors: How decoding errors are handled, e.g. "replace" for logs
+                with invalid bytes
+        """
+        self.file_path = Path(file_path)
+        self.window_size = max(1, window_size)
+        self.encoding = encoding
+        self.errors = errors
+
+    def _boundary_kind(self, line: str, previous: str) -> int:
+        """How suitable the position before ``line`` is for starting a window."""
+        if not previous.strip() and line.strip():
+            return _PARAGRAPH
+        return _LINE
+
+    def _document(self, content: str, index: int, start: int) -> Document:
+        return Document(
+            page_content=content,
+            metadata={
+                "source": str(self.file_path),
+                "file_name": self.file_path.name,
+                "window_index": index,
+                "window_start": start,
+            }
+        )
+
+    def lazy_load(self) -> Iterator[Document]:
+        """Yield the windows of the file in order."""
+        lines: List[str] = []
+        kinds: List[int] = []
+        size = 0
+        start = 0
+        index = 0
+        previous = ""
+
+        # newline="" keeps line endings as they are, so offsets match the file
+        with open(self.file_path, encoding=self.encoding, errors=self.errors, newline="") as file:
+            for line in file:
+                kind = self._boundary_kind(line, previous)
+                previous = line
+                while lines and size + len(line) > self.window_size:
+                    cut = self._cut_position(kinds)
+                    content = "".join(lines[:cut])
+                    yield self._document(content, index, start)
+                    index += 1
+                    start += len(content)
+                    size -= len(content)
+                    del lines[:cut], kinds[:cut]
+
+                # Lines longer than a window (e.g. minified exports) are split
+                while len(line) > self.window_size:
+                    yield self._document(line[:self.window_size], index, start)
+                    index += 1
+                    start += self.window_size
+                    line = line[self.window_size:]
+                    kind = _LINE
+
+                lines.append(line)
+                kinds.append(kind)
+                size += len(line)
+
+        if lines:
+            yield self._document("".join(lines), index, start)
+
+    @staticmethod
+    def _cut_position(kinds: List[int]) -> int:
+        """Index of the line before which the current window is cut.
+
+        The latest section boundary is preferred, then the latest paragraph
+        boundary; without either the window ends after its last line.
+        """
+        for preferred in (_SECTION, _PARAGRAPH):
+            for position in range(len(kinds) - 1, 0, -1):
+                if kinds[position] == preferred:
+                    return position
+        return len(kinds)
+
+class StreamingMarkdownLoader(StreamingTextLoader):
+    """Load a Markdown file as windows cut before headings where possible."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._in_fence = False
+
+    def _boundary_kind(self, line: str, previous: str) -> int:
+        stripped = line.lstrip()
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            self._in_fence = not self._in_fence
+            # The opening fence line is still a valid cut position
+            return _LINE if not self._in_fence else super()._boundary_kind(line, previous)
+        if self._in_fence:
+            return _LINE
+        if stripped.startswith("#"):
+            return _SECTION
+        return super()._boundary_kind(line, previous)
+
+    def lazy_load(self) -> Iterator[Document]:
+        self._in_fence = False
+        yield from super().lazy_load()
@@ -1,9 +1,13 @@
-from typing import List, Dict, Any
 import os
+import time
+from typing import Any, Dict, List
 
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import Document
+from langchain_openai import ChatOpenAI
+
+from ..core import tracing
+
 
 class LLMClient:
     """Client for interacting with language models."""
@@ -32,26 +36,41 @@ class LLMClient:
             ("human", "Context:\n{context}\n\nQuestion: {question}\n\nAnswer:")
         ])
 
+    def _generate(self, prompt: List[Any]) -> str:
+        """Run the model on a prompt and return the answer text."""
+        if not tracing.enabled():
+            return self.model.invoke(prompt).content
+        # Streamed while tracing to time the first token
+        start = time.perf_counter()
+        parts = []
+        for chunk in self.model.stream(prompt):
+            if not parts:
+                tracing.record_span("llm.first_token", start)
+            parts.append(chunk.content)
+        return "".join(parts)
+
     def generate_answer(self, question: str, context_docs: List[Document]) -> Dict[str, Any]:
         """Generate an answer based on the question and context documents."""
         try:
-            # Format context from documents
-            context_text = "\n\n".join([
-                f"Document {i+1} (ID: {doc.metadata.get('source', 'unknown')}):\n{doc.page_content}"
-                for i, doc in enumerate(context_docs)
-            ])
-            
-            # Create the prompt
-            prompt = self.prompt_template.format_messages(
-                context=context_text,
-                question=question
-            )
+            with tracing.span("prompt_build", documents=len(context_docs)):
+                # Format context from documents
+                context_text = "\n\n".join([
+                    f"Document {i+1} (ID: {doc.metadata.get('source', 'unknown')}):\n"
+                    f"{doc.page_content}"
+                    for i, doc in enumerate(context_docs)
+                ])
+
+                # Create the prompt
+                prompt = self.prompt_template.format_messages(
+                    context=context_text,
+                    question=question
+                )
             
             # Generate response
-            response = self.model.invoke(prompt)
+            with tracing.span("llm.total", model=getattr(self.model, "model_name", None)):
+                answer = self._generate(prompt)
             
             # Extract answer and sources
-            answer = response.content
             sources = [doc.metadata.get('source', 'unknown') for doc in context_docs]
             
             return {
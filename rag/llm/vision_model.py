@@ -1,19 +1,75 @@
-from typing import Optional, Dict, Any
-from PIL import Image
 import base64
-from io import BytesIO
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import litellm
 from litellm import completion
+from PIL import Image
+
+
+class VisionMetrics:
+    """Thread-safe latency statistics of vision model calls.
+
+    Only the most recent ``max_samples`` latencies are kept for percentiles.
+    """
+
+    def __init__(self, max_samples: int = 10_000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=max_samples)
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+
+    def record(self, seconds: float, error: bool = False) -> None:
+        """Record the latency of one call."""
+        with self._lock:
+            self.calls += 1
+            self.errors += int(error)
+            self.total_seconds += seconds
+            self._latencies.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        """Call count, error count and latency percentiles in seconds."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            calls, errors, total = self.calls, self.errors, self.total_seconds
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(round(fraction * (len(latencies) - 1))))]
+
+        return {
+            "calls": calls,
+            "errors": errors,
+            "mean_seconds": total / calls if calls else 0.0,
+            "p50_seconds": percentile(0.5),
+            "p95_seconds": percentile(0.95),
+            "max_seconds": latencies[-1] if latencies else 0.0,
+        }
 
 class VisionModel:
-    """A vision model that uses OpenAI's GPT-4 Vision to describe images via litellm."""
+    """A vision model that uses OpenAI's GPT-4 Vision to describe images via litellm.
+
+    For OpenAI models all calls share one HTTP client with a keep-alive
+    connection pool, so only the first request pays for the TLS handshake.
+    Use ``get_vision_model`` to share one instance across a process.
+    """
     
     def __init__(
         self,
         api_key: Optional[str] = None,
         model_name: str = "gpt-4.1-mini",
         max_tokens: int = 500,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        max_image_size: int = 1536,
+        max_connections: int = 8,
+        timeout: float = 60.0
     ):
         """Initialize the vision model.
         
@@ -22,6 +78,11 @@ class VisionModel:
             model_name: Name of the OpenAI model to use
             max_tokens: Maximum number of tokens to generate
             temperature: Sampling temperature (0-1)
+            max_image_size: Longest image side sent to the model. Larger images
+                are downscaled before encoding since the API would do so anyway.
+            max_connections: Size of the connection pool, which also bounds
+                the number of concurrent requests of describe_images
+            timeout: Request timeout in seconds
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -31,6 +92,12 @@ class VisionModel:
         self.model_name = model_name
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.max_image_size = max_image_size
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self.metrics = VisionMetrics()
+        self._client = None
+        self._client_lock = threading.Lock()
         
         # Default system prompt for image description
         self.system_prompt = """
@@ -58,70 +125,177 @@ Keep your response clear, compact and structured but in plain text format.
 Provide the description in the same language as any text found in the image. If no text is present, default to German.
 """
 
-    def _image_to_base64(self, image: Image.Image) -> str:
-        """Convert PIL Image to base64 string."""
-        buffered = BytesIO()
+    def _prepare_image(self, image: Image.Image) -> Image.Image:
+        """Downscale an image to the resolution the model makes use of."""
+        size = (self.max_image_size, self.max_image_size)
+        # For JPEGs, let the decoder scale down while decoding instead of
+        # materializing the full resolution image first
+        if image.format == "JPEG":
+            image.draft("RGB", size)
+        if max(image.size) > self.max_image_size:
+            scale = self.max_image_size / max(image.size)
+            new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
         # Convert to RGB if necessary
         if image.mode != 'RGB':
             image = image.convert('RGB')
-        image.save(buffered, format="JPEG")
-        return base64.b64encode(buffered.getvalue()).decode('utf-8')
+        return image
 
-    def describe_image(self, image: Image.Image) -> str:
-        """Describe an image using the vision model.
-        
-        Args:
-            image: PIL Image object to describe
-            
-        Returns:
-            str: Description of the image
+    def _image_to_base64(self, image: Image.Image) -> str:
+        """Downscale and encode a PIL Image as a base64 JPEG string."""
+        buffered = BytesIO()
+        self._prepare_image(image).save(buffered, format="JPEG")
+        # Encode straight from the buffer without copying the JPEG bytes
+        return base64.b64encode(buffered.getbuffer()).decode('ascii')
+
+    def _get_client(self) -> Optional[Any]:
+        """Shared OpenAI client with a keep-alive connection pool.
+
+        Returns None for providers other than OpenAI, which then use litellm's
+        own client handling.
         """
+        with self._client_lock:
+            if self._client is None:
+                self._client = self._create_client() or False
+            return self._client or None
+
+    def _create_client(self) -> Optional[Any]:
         try:
-            # Convert image to base64
-            base64_image = self._image_to_base64(image)
-            
-            # Prepare the message for the API
-            messages = [
-                {
-                    "role": "system", 
-                    "content": self.system_prompt 
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Please describe this image in detail, following the structured format provided. Focus on text content and important visual elements."
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}"
-                            }
+            provider = litellm.get_llm_provider(self.model_name)[1]
+        except Exception:
+            return None
+        if provider != "openai":
+            return None
+
+        import httpx
+        from openai import OpenAI
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            timeout=self.timeout
+        )
+        return OpenAI(api_key=self.api_key, http_client=http_client)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        with self._client_lock:
+            if self._client:
+                self._client.close()
+            self._client = None
+
+    def __reduce__(self):
+        # Worker processes get their own process-wide instance and connection
+        # pool instead of a copy of this one
+        return (get_vision_model, self._pool_key())
+
+    def _pool_key(self) -> Tuple[Any, ...]:
+        return (self.api_key, self.model_name, self.max_tokens, self.temperature,
+                self.max_image_size, self.max_connections, self.timeout)
+
+    def _describe_base64(self, base64_image: str) -> str:
+        """Send an encoded image to the model and record the call latency."""
+        # Prepare the message for the API
+        messages = [
+            {
+                "role": "system",
+                "content": self.system_prompt
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": (
+                            "Please describe this image in detail, following the structured "
+                            "format provided. Focus on text content and important visual elements."
+                        )
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{base64_image}"
                         }
-                    ]
-                }
-            ]
-            
+                    }
+                ]
+            }
+        ]
+        kwargs = {}
+        client = self._get_client()
+        if client is not None:
+            kwargs["client"] = client
+
+        start = time.perf_counter()
+        try:
             # Call the API using litellm
             response = completion(
                 model=self.model_name,
                 messages=messages,
                 max_tokens=self.max_tokens,
-                temperature=self.temperature
+                temperature=self.temperature,
+                **kwargs
             )
+        except Exception:
+            self.metrics.record(time.perf_counter() - start, error=True)
+            raise
+        self.metrics.record(time.perf_counter() - start)
+        return response.choices[0].message.content
+
+    def describe_image(self, image: Image.Image) -> str:
+        """Describe an image using the vision model.
+
+        Args:
+            image: PIL Image object to describe
             
-            return response.choices[0].message.content
-            
+        Returns:
+            str: Description of the image
+        """
+        try:
+            return self._describe_base64(self._image_to_base64(image))
         except Exception as e:
             print(f"Error describing image: {e}")
             return ""
 
+    def describe_images(self, images: Iterable[Image.Image]) -> List[str]:
+        """Describe several images with concurrent requests.
+
+        The chat completions API takes one image description per request, so
+        the requests are issued concurrently over the shared connection pool
+        instead. Images are encoded one at a time as they are consumed from
+        ``images``, and each request starts as soon as its image is encoded.
+
+        Args:
+            images: PIL Image objects to describe
+
+        Returns:
+            Descriptions in the order of the images; empty for failed calls
+        """
+        def describe(base64_image: str) -> str:
+            try:
+                return self._describe_base64(base64_image)
+            except Exception as e:
+                print(f"Error describing image: {e}")
+                return ""
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            futures = []
+            for image in images:
+                try:
+                    futures.append(executor.submit(describe, self._image_to_base64(image)))
+                except Exception as e:
+                    print(f"Error encoding image: {e}")
+                    futures.append(None)
+            return [future.result() if future is not None else "" for future in futures]
+
 def create_vision_model(
     api_key: Optional[str] = None,
     model_name: str = "gpt-4.1-mini",
     max_tokens: int = 500,
-    temperature: float = 0.7
+    temperature: float = 0.7,
+    max_image_size: int = 1536,
+    max_connections: int = 8,
+    timeout: float = 60.0
 ) -> VisionModel:
     """Create a vision model instance.
     
@@ -130,6 +304,9 @@ def create_vision_model(
         model_name: Name of the OpenAI model to use
         max_tokens: Maximum number of tokens to generate
         temperature: Sampling temperature (0-1)
+        max_image_size: Longest image side sent to the model
+        max_connections: Size of the connection pool
+        timeout: Request timeout in seconds
         
     Returns:
         VisionModel instance
@@ -138,5 +315,51 @@ def create_vision_model(
         api_key=api_key,
         model_name=model_name,
         max_tokens=max_tokens,
-        temperature=temperature
+        temperature=temperature,
+        max_image_size=max_image_size,
+        max_connections=max_connections,
+        timeout=timeout
     )
+
+# Process-wide vision models by configuration, see get_vision_model
+_VISION_MODELS: Dict[Tuple[Any, ...], VisionModel] = {}
+_VISION_MODELS_LOCK = threading.Lock()
+
+def get_vision_model(
+    api_key: Optional[str] = None,
+    model_name: str = "gpt-4.1-mini",
+    max_tokens: int = 500,
+    temperature: float = 0.7,
+    max_image_size: int = 1536,
+    max_connections: int = 8,
+    timeout: float = 60.0
+) -> VisionModel:
+    """Get the process-wide vision model for a configuration.
+
+    Unlike create_vision_model, repeated calls return the same instance, so
+    all files of an ingestion run share one connection pool and one set of
+    latency metrics.
+
+    Args:
+        Same as create_vision_model
+
+    Returns:
+        Shared VisionModel instance
+    """
+    key = (api_key or os.getenv("OPENAI_API_KEY"), model_name, max_tokens, temperature,
+           max_image_size, max(1, max_connections), timeout)
+    with _VISION_MODELS_LOCK:
+        vision_model = _VISION_MODELS.get(key)
+        if vision_model is None:
+            vision_model = _VISION_MODELS[key] = create_vision_model(*key)
+        return vision_model
+
+def vision_metrics() -> List[Dict[str, Any]]:
+    """Latency summaries of the process-wide vision models that were used."""
+    with _VISION_MODELS_LOCK:
+        models = list(_VISION_MODELS.values())
+    return [
+        {"model": vision_model.model_name, **vision_model.metrics.summary()}
+        for vision_model in models
+        if vision_model.metrics.calls
+    ]
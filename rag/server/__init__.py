@@ -0,0 +1,25 @@
+"""
+Long-lived query service behind `rag serve` and its client.
+
+Components are imported on first access, so that the client does not load
+the store, embedding and LLM stacks.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "QueryService": ".service",
+    "ServiceBusy": ".service",
+    "create_server": ".server",
+    "ServerClient": ".client",
+    "ServerError": ".client",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,96 @@
+"""Thin client of the ``rag serve`` query API.
+
+Uses only the standard library, so ``rag query --server`` starts without
+importing the store, embedder or LLM stacks.
+"""
+
+import json
+import socket
+from http.client import HTTPConnection
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+class ServerError(Exception):
+    """Raised for error responses of the server."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Server returned {status}: {message}")
+        self.status = status
+
+
+class _UnixHTTPConnection(HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ServerClient:
+    """Client of a query server at http://host:port or unix:///path/to/socket."""
+
+    def __init__(self, url: str, timeout: float = 300.0):
+        """
+        Args:
+            url: Server URL as printed by ``rag serve``
+            timeout: Seconds to wait for a response
+        """
+        self.url = url
+        self.timeout = timeout
+        parts = urlsplit(url)
+        if parts.scheme == "unix":
+            self._socket_path = parts.netloc + parts.path
+        elif parts.scheme == "http":
+            self._socket_path = None
+            self._host = parts.hostname or "127.0.0.1"
+            self._port = parts.port or 80
+        else:
+            raise ValueError(f"Unsupported server URL: {url}. Use http://host:port or unix:///path")
+
+    def _connection(self) -> HTTPConnection:
+        if self._socket_path is not None:
+            return _UnixHTTPConnection(self._socket_path, self.timeout)
+        return HTTPConnection(self._host, self._port, timeout=self.timeout)
+
+    def _request(
+        self, method: str, path: str, body: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        connection = self._connection()
+        try:
+            payload = json.dumps(body).encode() if body is not None else None
+            headers = {"Content-Type": "application/json"} if payload is not None else {}
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            data = json.loads(response.read() or b"{}")
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise ServerError(response.status, data.get("error", response.reason))
+        return data
+
+    def query(self, text: str, top_k: int = 5, model: Optional[str] = None,
+              expand_parents: bool = False, rescore: bool = True) -> Dict[str, Any]:
+        """Answer a question; see QueryService.query."""
+        return self._request("POST", "/query", {
+            "text": text, "top_k": top_k, "model": model,
+            "expand_parents": expand_parents, "rescore": rescore,
+        })
+
+    def retrieve(self, text: str, top_k: int = 5, expand_parents: bool = False,
+                 rescore: bool = True) -> List[Dict[str, Any]]:
+        """Search chunks without generating an answer."""
+        return self._request("POST", "/retrieve", {
+            "text": text, "top_k": top_k, "expand_parents": expand_parents, "rescore": rescore,
+        })["results"]
+
+    def reload(self) -> Dict[str, Any]:
+        """Make the server reopen its collection."""
+        return self._request("POST", "/reload", {})
+
+    def health(self) -> Dict[str, Any]:
+        """Status and counters of the server."""
+        return self._request("GET", "/health")
@@ -0,0 +1,166 @@
+"""HTTP query API of ``rag serve``, on a TCP port or a Unix socket.
+
+Endpoints:
+    POST /query     {"text", "top_k", "model", "expand_parents", "rescore"}
+    POST /retrieve  the same without "model"; results without an answer
+    POST /reload    reopen the collection now
+    GET  /health    counters of the service
+    GET  /metrics   span latency histograms in the Prometheus text format
+
+A query that finds no free slot within the queue timeout is answered with
+503 and a Retry-After header.
+"""
+
+import json
+import logging
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Dict, Optional
+
+from ..core.tracing import LatencyHistograms
+from .service import QueryService, ServiceBusy
+
+logger = logging.getLogger("rag_server")
+
+# Largest accepted request body
+MAX_BODY_BYTES = 1 << 20
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the QueryService of the server."""
+
+    server_version = "rag-serve"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def _send_json(
+        self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self._send(status, json.dumps(body, default=str).encode(), "application/json", headers)
+
+    def _send(self, status: int, payload: bytes, content_type: str,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", **self.server.service.status()})
+        elif self.path == "/metrics" and self.server.metrics is not None:
+            self._send(200, self.server.metrics.render().encode(), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        service: QueryService = self.server.service
+        try:
+            body = self._read_json()
+            if self.path == "/reload":
+                reloaded = service.reload(force=True)
+                self._send_json(200, {"reloaded": reloaded, "generation": service.generation})
+                return
+            if self.path not in ("/query", "/retrieve"):
+                self._send_json(404, {"error": f"Not found: {self.path}"})
+                return
+            text = body.get("text")
+            if not isinstance(text, str) or not text.strip():
+                raise ValueError("'text' is required")
+            options = {
+                "top_k": int(body.get("top_k", 5)),
+                "expand_parents": bool(body.get("expand_parents", False)),
+                "rescore": bool(body.get("rescore", True)),
+            }
+            if self.path == "/retrieve":
+                self._send_json(200, {"results": service.retrieve(text, **options)})
+            else:
+                self._send_json(200, service.query(text, model=body.get("model"), **options))
+        except ServiceBusy as e:
+            self._send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            logger.exception(f"Request to {self.path} failed")
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+
+class QueryHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server on a TCP port."""
+
+    daemon_threads = True
+
+    def __init__(self, service: QueryService, host: str = "127.0.0.1", port: int = 8000,
+                 metrics: Optional[LatencyHistograms] = None):
+        self.service = service
+        self.metrics = metrics
+        super().__init__((host, port), QueryRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class UnixQueryHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """Threaded HTTP server on a Unix socket, reachable only on this machine."""
+
+    daemon_threads = True
+
+    def __init__(self, service: QueryService, socket_path: str,
+                 metrics: Optional[LatencyHistograms] = None):
+        self.service = service
+        self.metrics = metrics
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, QueryRequestHandler)
+
+    def server_bind(self) -> None:
+        # Created without group or other permissions, so no other user can connect
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, 0o600)
+
+    @property
+    def url(self) -> str:
+        return f"unix://{self.server_address}"
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def create_server(service: QueryService, host: str = "127.0.0.1", port: int = 8000,
+                  socket_path: Optional[str] = None, metrics: Optional[LatencyHistograms] = None):
+    """Create the query server, on a Unix socket if socket_path is given.
+
+    Call serve_forever() to serve and shutdown() from another thread to stop.
+    The metrics histograms, if any, must be added as a tracing exporter to
+    be filled.
+    """
+    if socket_path:
+        return UnixQueryHTTPServer(service, socket_path, metrics)
+    return QueryHTTPServer(service, host, port, metrics)
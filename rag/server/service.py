@@ -0,0 +1,299 @@
+"""Query path with the store, embedder and LLM client kept open.
+
+A ``rag query`` process opens the Chroma collection, loads the embedder and
+builds an LLM client before it can answer. ``QueryService`` holds them
+for many queries. The CLI uses it for one query; ``rag serve`` uses it for
+all queries of a long-lived process.
+
+Chroma keeps a collection's index in memory and does not see vectors that
+another process (e.g. ``rag ingest``) adds afterwards. The service therefore
+watches the files of the persist directory. When they change, it waits for
+running queries to finish and reopens the collection.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rag.core import tracing
+from rag.embedding.micro_batcher import QueryMicroBatcher
+from rag.store.chroma_store import ChromaStore
+from rag.store.parent_store import ParentStore
+from rag.store.reduced_store import ReducedVectorStore
+
+logger = logging.getLogger("query_service")
+
+
+class ServiceBusy(Exception):
+    """Raised when no query slot frees up within the queue timeout."""
+
+
+def collection_signature(persist_directory: str) -> Tuple[int, int]:
+    """Latest modification time and number of the files of a persist directory.
+
+    Queries do not write to these files, so the signature changes when
+    vectors, reducers or parent chunks were written.
+    """
+    latest = 0
+    count = 0
+    for root, _, files in os.walk(persist_directory):
+        for name in files:
+            try:
+                latest = max(latest, os.stat(os.path.join(root, name)).st_mtime_ns)
+            except FileNotFoundError:
+                continue
+            count += 1
+    return latest, count
+
+
+def expand_to_parents(results: List[dict], persist_directory: Optional[str] = None) -> List[dict]:
+    """Replace child chunk results by their deduplicated parent chunks.
+
+    Parents keep the rank of their best-ranked child. Results without a
+    parent (e.g. chunks ingested without --hierarchical) are kept as is.
+    """
+    parent_ids = []
+    for result in results:
+        parent_id = (result.get("metadata") or {}).get("parent_id")
+        if parent_id and parent_id not in parent_ids:
+            parent_ids.append(parent_id)
+
+    parent_store = ParentStore(persist_directory)
+    try:
+        parents = {parent["id"]: parent for parent in parent_store.get_parents(parent_ids)}
+    finally:
+        parent_store.close()
+
+    expanded = []
+    seen = set()
+    for result in results:
+        parent_id = (result.get("metadata") or {}).get("parent_id")
+        if parent_id in parents:
+            if parent_id not in seen:
+                seen.add(parent_id)
+                expanded.append(parents[parent_id])
+        else:
+            expanded.append(result)
+    return expanded
+
+
+class QueryService:
+    """Answer queries with an open store, embedder and LLM client."""
+
+    def __init__(
+        self,
+        embedding_model: Any,
+        persist_directory: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        max_concurrency: int = 8,
+        queue_timeout: float = 30.0,
+        reload_interval: Optional[float] = 2.0,
+        llm_factory: Optional[Callable[[str], Any]] = None
+    ):
+        """
+        Args:
+            embedding_model: Embedder with embed_documents, e.g. from
+                create_embedding_model or a RemoteEmbedder
+            persist_directory: Chroma persist directory, defaults to data/chroma
+            model: LLM used when a query does not name one
+            max_concurrency: Queries processed at the same time
+            queue_timeout: Seconds a query waits for a free slot before
+                ServiceBusy is raised
+            reload_interval: Minimum seconds between checks for changes of
+                the collection; None never reloads automatically
+            llm_factory: Creates the client of an LLM, defaults to LLMClient
+        """
+        # Concurrent queries are embedded together
+        self.embedder = QueryMicroBatcher(embedding_model)
+        self.persist_directory = persist_directory
+        self.default_model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.reload_interval = reload_interval
+        self.llm_factory = llm_factory or _create_llm_client
+        self._llm_clients: Dict[str, Any] = {}
+        self._llm_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._state = threading.Condition()
+        self._active = 0
+        self._reloading = False
+        self._last_check = time.monotonic()
+        # The full vector sidecar of reduced collections is one SQLite connection
+        self._reduced_lock = threading.Lock()
+        self.generation = 0
+        self.stats = {"queries": 0, "rejected": 0, "reloads": 0}
+        self._open()
+        self.llm_client(model)
+
+    def _open(self) -> None:
+        self.store = ChromaStore(self.persist_directory)
+        self.persist_directory = self.store.persist_directory
+        self.reduced_store = ReducedVectorStore.open(self.store, keep_full_vectors=False)
+        # Chroma brings the index files up to date with its log on first
+        # access; reading before taking the signature keeps those writes
+        # from looking like a change of the collection
+        self.store.collection.count()
+        self.signature = collection_signature(self.persist_directory)
+
+    def _close_stores(self) -> None:
+        if self.reduced_store is not None:
+            self.reduced_store.close()
+        self.store.close()
+
+    def llm_client(self, model: Optional[str] = None) -> Any:
+        """Client of an LLM, created once per model."""
+        model = model or self.default_model
+        with self._llm_lock:
+            if model not in self._llm_clients:
+                self._llm_clients[model] = self.llm_factory(model)
+            return self._llm_clients[model]
+
+    def reload(self, force: bool = False) -> bool:
+        """Reopen the collection if its files changed.
+
+        Running queries finish on the old collection; new ones wait until
+        the collection is reopened.
+
+        Args:
+            force: Reopen even if no change was detected
+
+        Returns:
+            Whether the collection was reopened
+        """
+        with self._state:
+            self._last_check = time.monotonic()
+            if self._reloading:
+                return False
+            signature = collection_signature(self.persist_directory)
+            if not force and signature == self.signature:
+                return False
+            self._reloading = True
+            self._state.wait_for(lambda: self._active == 0)
+        try:
+            self._close_stores()
+            # Chroma shares one client per path in a process; a new client is
+            # needed to read the index as it is on disk now
+            from chromadb.api.client import SharedSystemClient
+            SharedSystemClient.clear_system_cache()
+            self._open()
+            self.generation += 1
+            self.stats["reloads"] += 1
+            logger.info(f"Reopened the collection in {self.persist_directory} "
+                        f"(generation {self.generation})")
+        finally:
+            with self._state:
+                self._reloading = False
+                self._state.notify_all()
+        return True
+
+    def _maybe_reload(self) -> None:
+        if self.reload_interval is None:
+            return
+        if time.monotonic() - self._last_check < self.reload_interval:
+            return
+        self.reload()
+
+    def _enter(self) -> None:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self.stats["rejected"] += 1
+            raise ServiceBusy(f"All {self.max_concurrency} query slots are busy")
+        try:
+            self._maybe_reload()
+        except Exception as e:
+            logger.warning(f"Checking the collection for changes failed: {e}")
+        with self._state:
+            self._state.wait_for(lambda: not self._reloading)
+            self._active += 1
+
+    def _exit(self) -> None:
+        with self._state:
+            self._active -= 1
+            self._state.notify_all()
+        self._slots.release()
+
+    def _search(
+        self, text: str, top_k: int, expand_parents: bool, rescore: bool
+    ) -> List[Dict[str, Any]]:
+        with tracing.span("embed"):
+            query_vector = self.embedder.embed_query(text)
+        reduced = self.reduced_store is not None
+        with tracing.span("search", top_k=top_k, reduced=reduced) as search_span:
+            if self.reduced_store is not None:
+                with self._reduced_lock:
+                    results = self.reduced_store.search_vectors(
+                        query_vector, top_k=top_k, rescore=rescore
+                    )
+            else:
+                results = self.store.search_vectors(query_vector, top_k=top_k)
+            search_span.set_attribute("results", len(results))
+        if expand_parents and results:
+            with tracing.span("expand_parents"):
+                results = expand_to_parents(results, self.persist_directory)
+        return results
+
+    def retrieve(self, text: str, top_k: int = 5, expand_parents: bool = False,
+                 rescore: bool = True) -> List[Dict[str, Any]]:
+        """Search the chunks most similar to a query, without generating an answer.
+
+        Raises:
+            ServiceBusy: If no query slot frees up within the queue timeout
+        """
+        self._enter()
+        try:
+            with tracing.span("retrieve"):
+                return self._search(text, top_k, expand_parents, rescore)
+        finally:
+            self._exit()
+
+    def query(self, text: str, top_k: int = 5, model: Optional[str] = None,
+              expand_parents: bool = False, rescore: bool = True) -> Dict[str, Any]:
+        """Retrieve context for a question and answer it with the LLM.
+
+        Returns:
+            Dictionary with the answer (None without results), its sources
+            and the retrieved results
+
+        Raises:
+            ServiceBusy: If no query slot frees up within the queue timeout
+        """
+        from langchain.schema import Document
+
+        self._enter()
+        try:
+            with tracing.span("query", model=model or self.default_model):
+                results = self._search(text, top_k, expand_parents, rescore)
+                self.stats["queries"] += 1
+                if not results:
+                    return {"answer": None, "sources": [], "results": []}
+                context_docs = [
+                    Document(page_content=result["content"], metadata=result["metadata"] or {})
+                    for result in results
+                ]
+                response = self.llm_client(model).generate_answer(text, context_docs)
+        finally:
+            self._exit()
+        return {"answer": response["answer"], "sources": response["sources"], "results": results}
+
+    def status(self) -> Dict[str, Any]:
+        """Counters of the service, e.g. for a health endpoint."""
+        with self._state:
+            active = self._active
+        return {
+            "generation": self.generation,
+            "in_flight": active,
+            "max_concurrency": self.max_concurrency,
+            "persist_directory": self.persist_directory,
+            **self.stats,
+        }
+
+    def close(self) -> None:
+        """Stop the query batcher and close the stores."""
+        self.embedder.close()
+        self._close_stores()
+
+
+def _create_llm_client(model: str) -> Any:
+    from rag.llm.llm_client import LLMClient
+    return LLMClient(model_name=model)
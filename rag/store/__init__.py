@@ -1,6 +1,23 @@
-"""Store module for vector storage implementations."""
+"""Store module for vector storage implementations.
 
-from .vector_store import BaseVectorStore
-from .chroma_store import ChromaStore
+Stores are imported on first access, so that the SQLite stores can be used
+without importing chromadb.
+"""
 
-__all__ = ["BaseVectorStore", "ChromaStore"] 
\ No newline at end of file
+from importlib import import_module
+
+_EXPORTS = {
+    "BaseVectorStore": ".vector_store",
+    "ChromaStore": ".chroma_store",
+    "InMemoryVectorStore": ".memory_store",
+    "ParentStore": ".parent_store",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,9 +1,16 @@
-from typing import List, Dict, Any, Optional
 import os
+from typing import Any, Dict, List, Optional, Union
+
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
+
+from ..core.models import VectorBatch
 from .vector_store import BaseVectorStore
-from ..core.models import Vector
+
+# Embeddings may be passed as nested lists or as float32 arrays; arrays are
+# handed to Chroma as they are instead of being converted to Python floats
+Embeddings = Union[np.ndarray, List[List[float]]]
 
 class ChromaStore(BaseVectorStore):
     """ChromaDB-based vector storage implementation."""
@@ -17,6 +24,7 @@ class ChromaStore(BaseVectorStore):
             persist_directory = os.path.join(os.getcwd(), "data", "chroma")
             # Ensure directory exists
             os.makedirs(persist_directory, exist_ok=True)
+        self.persist_directory = persist_directory
         
         # Initialize ChromaDB client
         self.client = chromadb.Client(
@@ -32,7 +40,9 @@ class ChromaStore(BaseVectorStore):
         # Set embedding dimension (default for OpenAI embeddings)
         self.embedding_dimension = 1536
     
-    def store(self, vectors: List[List[float]], ids: List[str], metadatas: List[Dict[str, Any]] = None) -> None:
+    def store(
+        self, vectors: Embeddings, ids: List[str], metadatas: List[Dict[str, Any]] = None
+    ) -> None:
         """Store vectors in ChromaDB."""
         # Use upsert=True to update existing vectors with the same ID
         self.collection.upsert(
@@ -41,7 +51,9 @@ class ChromaStore(BaseVectorStore):
             metadatas=metadatas
         )
     
-    def search(self, query_vector: List[float], n_results: int = 5) -> List[Dict[str, Any]]:
+    def search(
+        self, query_vector: Union[np.ndarray, List[float]], n_results: int = 5
+    ) -> List[Dict[str, Any]]:
         """Search for similar vectors in ChromaDB."""
         # Perform similarity search
         results = self.collection.query(
@@ -76,7 +88,7 @@ class ChromaStore(BaseVectorStore):
     def store_vectors(
         self,
         ids: List[str],
-        embeddings: List[List[float]],
+        embeddings: Embeddings,
         metadatas: List[dict],
         documents: List[str],
     ) -> None:
@@ -91,7 +103,7 @@ class ChromaStore(BaseVectorStore):
     def store_vector(
         self,
         id: str,
-        vector: List[float],
+        vector: Union[np.ndarray, List[float]],
         content: str,
         metadata: Dict[str, Any],
     ) -> None:
@@ -105,7 +117,7 @@ class ChromaStore(BaseVectorStore):
 
     def search_vectors(
         self,
-        query_vector: List[float],
+        query_vector: Union[np.ndarray, List[float]],
         top_k: int = 5,
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors."""
@@ -129,6 +141,34 @@ class ChromaStore(BaseVectorStore):
         
         return formatted_results
 
+    def store_batch(self, batch: VectorBatch, documents: Optional[List[str]] = None) -> None:
+        """Store a batch of vectors with their contents.
+
+        The (n, d) float32 matrix of the batch is passed to Chroma without
+        converting it to lists.
+        """
+        if not len(batch):
+            return
+        self.collection.add(
+            ids=batch.ids,
+            embeddings=batch.values,
+            # Chroma rejects empty metadata dictionaries
+            metadatas=batch.metadatas if any(batch.metadatas) else None,
+            documents=documents,
+        )
+
+    def get_metadatas(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Metadata of stored vectors by id; unknown ids are left out."""
+        results = self.collection.get(ids=ids, include=["metadatas"])
+        return {
+            id: dict(metadata or {})
+            for id, metadata in zip(results["ids"], results["metadatas"])
+        }
+
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Replace the metadata of stored vectors."""
+        self.collection.update(ids=ids, metadatas=metadatas)
+
     def clear(self) -> None:
         """Clear all vectors from the collection."""
         self.collection.delete()
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class FullVectorStore:
+    """SQLite-backed sidecar with the full-dimension embeddings of a collection.
+
+    When the collection stores reduced vectors, the full vectors are kept here
+    to re-score the top candidates of a search at full precision and to
+    measure the recall loss of the reduction.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        # Keep full vectors next to the Chroma collection by default
+        if path is None:
+            path = os.path.join(os.getcwd(), "data", "chroma", "full_vectors.sqlite3")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS vectors (id TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self.connection.commit()
+
+    def store(self, ids: List[str], vectors: np.ndarray) -> None:
+        """Store (or replace) full vectors as raw float32 bytes."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO vectors (id, vector) VALUES (?, ?)",
+            [(id, vector.tobytes()) for id, vector in zip(ids, vectors)]
+        )
+        self.connection.commit()
+
+    def get(self, ids: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Get full vectors by id.
+
+        Returns:
+            The ids that were found, in the order of ``ids``, and their vectors
+            as an (n, d) float32 matrix
+        """
+        if not ids:
+            return [], np.empty((0, 0), dtype=np.float32)
+
+        placeholders = ", ".join("?" for _ in ids)
+        rows = dict(self.connection.execute(
+            f"SELECT id, vector FROM vectors WHERE id IN ({placeholders})", list(ids)
+        ).fetchall())
+        found = [id for id in ids if id in rows]
+        if not found:
+            return [], np.empty((0, 0), dtype=np.float32)
+        return found, np.stack([np.frombuffer(rows[id], dtype=np.float32) for id in found])
+
+    def iter_batches(self, batch_size: int = 4096) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """Iterate over all stored vectors in batches."""
+        cursor = self.connection.execute("SELECT id, vector FROM vectors ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            vectors = np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+            yield [row[0] for row in rows], vectors
+
+    def count(self) -> int:
+        """Number of stored vectors."""
+        return self.connection.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all vectors."""
+        self.connection.execute("DELETE FROM vectors")
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
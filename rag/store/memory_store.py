@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from ..core.models import VectorBatch
+from .vector_store import BaseVectorStore, cosine_similarities
+
+
+class InMemoryVectorStore(BaseVectorStore):
+    """Exact cosine search over vectors held in one float32 matrix.
+
+    Nothing is persisted. Serves as the brute-force reference in benchmarks
+    and as a store for tests that should not touch Chroma.
+    """
+
+    def __init__(self, collection_name: str = "rag_documents"):
+        super().__init__(collection_name)
+        self._batches: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+        self.ids: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.documents: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """All stored vectors as one (n, d) float32 matrix."""
+        if self._batches:
+            # Batches are concatenated once, on the first search after adding
+            parts = ([self._matrix] if self._matrix is not None else []) + self._batches
+            self._matrix = np.concatenate(parts)
+            self._batches = []
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix
+
+    def store_batch(self, batch: VectorBatch, documents: Optional[List[str]] = None) -> None:
+        """Store a batch of vectors with their contents."""
+        if not len(batch):
+            return
+        self._batches.append(np.asarray(batch.values, dtype=np.float32))
+        self.ids.extend(batch.ids)
+        self.metadatas.extend(batch.metadatas)
+        self.documents.extend(documents if documents is not None else [""] * len(batch))
+
+    def search_vectors(
+        self, query_vector: Union[np.ndarray, List[float]], top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Search for the most similar vectors.
+
+        Returns:
+            Results like ChromaStore.search_vectors, best first, with the
+            cosine distance (1 - similarity)
+        """
+        matrix = self.vectors
+        if not len(matrix) or top_k <= 0:
+            return []
+        similarities = cosine_similarities(query_vector, matrix)
+        top_k = min(top_k, len(similarities))
+        top = np.argpartition(-similarities, top_k - 1)[:top_k]
+        top = top[np.argsort(-similarities[top])]
+        return [
+            {
+                "id": self.ids[index],
+                "content": self.documents[index],
+                "metadata": self.metadatas[index],
+                "distance": float(1.0 - similarities[index]),
+            }
+            for index in top
+        ]
+
+    def clear(self) -> None:
+        """Remove all vectors."""
+        self._batches = []
+        self._matrix = None
+        self.ids = []
+        self.metadatas = []
+        self.documents = []
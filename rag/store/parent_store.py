@@ -0,0 +1,74 @@
+import json
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+
+class ParentStore:
+    """SQLite-backed store for parent chunks used in small-to-big retrieval.
+
+    Parent chunks are not embedded; they are looked up by id after the child
+    chunks pointing at them were found in the vector store.
+    """
+
+    def __init__(self, persist_directory: Optional[str] = None):
+        # Keep parents next to the Chroma collection by default
+        if persist_directory is None:
+            persist_directory = os.path.join(os.getcwd(), "data", "chroma")
+        os.makedirs(persist_directory, exist_ok=True)
+
+        self.path = os.path.join(persist_directory, "parents.sqlite3")
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS parents ("
+            "id TEXT PRIMARY KEY, content TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+        self.connection.commit()
+
+    def store_parents(
+        self, ids: List[str], contents: List[str], metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """Store (or replace) parent chunks."""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO parents (id, content, metadata) VALUES (?, ?, ?)",
+            [
+                (id, content, json.dumps(metadata, default=str))
+                for id, content, metadata in zip(ids, contents, metadatas)
+            ]
+        )
+        self.connection.commit()
+
+    def get_parents(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get parent chunks by id.
+
+        Returns:
+            Dictionaries with id, content and metadata, in the order of ``ids``.
+            Unknown ids are skipped.
+        """
+        if not ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in ids)
+        rows = self.connection.execute(
+            f"SELECT id, content, metadata FROM parents WHERE id IN ({placeholders})", list(ids)
+        ).fetchall()
+        by_id = {
+            row[0]: {"id": row[0], "content": row[1], "metadata": json.loads(row[2])}
+            for row in rows
+        }
+        return [by_id[id] for id in ids if id in by_id]
+
+    def count(self) -> int:
+        """Number of stored parent chunks."""
+        return self.connection.execute("SELECT COUNT(*) FROM parents").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all parent chunks."""
+        self.connection.execute("DELETE FROM parents")
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
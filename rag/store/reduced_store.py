@@ -0,0 +1,225 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core import tracing
+from ..core.models import VectorBatch
+from ..embedding.reduction import create_reducer, load_reducer
+from .chroma_store import ChromaStore
+from .full_vector_store import FullVectorStore
+from .vector_store import cosine_similarities
+
+
+class ReducedVectorStore:
+    """Chroma collection of reduced embeddings with a full-precision sidecar.
+
+    Vectors are reduced (see rag.embedding.reduction) before they reach
+    Chroma, while the full vectors go to a FullVectorStore. Searches run on
+    the reduced vectors and re-score a few times more candidates than
+    requested with the full vectors. The reducer is saved next to the
+    collection, so later ingest and query runs reduce consistently.
+
+    A PCA reducer is fitted on the first ``fit_samples`` vectors; until then
+    batches are held back, and ``flush`` must be called after the last batch.
+    """
+
+    def __init__(
+        self,
+        store: ChromaStore,
+        reducer: Any,
+        full_store: Optional[FullVectorStore] = None,
+        fit_samples: int = 2048,
+        rescore_factor: int = 4
+    ):
+        """
+        Args:
+            store: Chroma store holding the reduced vectors
+            reducer: MatryoshkaReducer or PCAReducer
+            full_store: Sidecar for the full vectors; without it searches are
+                not re-scored
+            fit_samples: Vectors collected before an unfitted reducer is fitted
+            rescore_factor: Candidates re-scored per requested result
+        """
+        self.store = store
+        self.reducer = reducer
+        self.full_store = full_store
+        self.fit_samples = max(2, fit_samples)
+        self.rescore_factor = max(1, rescore_factor)
+        self._pending: List[Tuple[VectorBatch, Optional[List[str]]]] = []
+        self._pending_ids = set()
+
+    @staticmethod
+    def reducer_path(store: ChromaStore) -> str:
+        """File with the reducer of a collection."""
+        return os.path.join(store.persist_directory, f"{store.collection_name}.reducer.npz")
+
+    @staticmethod
+    def full_store_path(store: ChromaStore) -> str:
+        """File with the full vectors of a collection."""
+        return os.path.join(
+            store.persist_directory, f"{store.collection_name}.full_vectors.sqlite3"
+        )
+
+    @classmethod
+    def open(
+        cls,
+        store: ChromaStore,
+        method: Optional[str] = None,
+        dimensions: Optional[int] = None,
+        keep_full_vectors: bool = True,
+        **kwargs: Any
+    ) -> Optional["ReducedVectorStore"]:
+        """Open the reduced storage of a collection.
+
+        Args:
+            store: Chroma store of the collection
+            method: Reduction method for a new collection; must match the
+                saved reducer of an existing one
+            dimensions: Reduced dimensions, required with method
+            keep_full_vectors: Keep full vectors for re-scoring
+            **kwargs: Further ReducedVectorStore arguments
+
+        Returns:
+            ReducedVectorStore, or None if the collection stores full vectors
+            and no reduction was requested
+        """
+        path = cls.reducer_path(store)
+        if os.path.exists(path):
+            reducer = load_reducer(path)
+            changed = method != reducer.method or dimensions != reducer.dimensions
+            if method is not None and changed:
+                raise ValueError(
+                    f"The collection stores {reducer.method} vectors with {reducer.dimensions} "
+                    "dimensions; clear it before ingesting with another reduction"
+                )
+        elif method is not None:
+            if not dimensions:
+                raise ValueError("dimensions are required for a reduced collection")
+            if store.collection.count():
+                raise ValueError(
+                    "The collection already stores full vectors; clear it before reducing them"
+                )
+            reducer = create_reducer(method, dimensions)
+        else:
+            return None
+
+        full_store_path = cls.full_store_path(store)
+        full_store = None
+        if keep_full_vectors or os.path.exists(full_store_path):
+            full_store = FullVectorStore(full_store_path)
+        return cls(store, reducer, full_store, **kwargs)
+
+    @classmethod
+    def remove_files(cls, store: ChromaStore) -> None:
+        """Delete the saved reducer and full vectors of a collection."""
+        for path in (cls.reducer_path(store), cls.full_store_path(store)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def store_batch(self, batch: VectorBatch, documents: Optional[List[str]] = None) -> None:
+        """Store a batch of full vectors, reduced in Chroma and full in the sidecar."""
+        if not len(batch):
+            return
+        if self.full_store is not None:
+            self.full_store.store(batch.ids, batch.values)
+        if self.reducer.is_fitted:
+            self._store_reduced(batch, documents)
+            return
+
+        self._pending.append((batch, documents))
+        self._pending_ids.update(batch.ids)
+        if len(self._pending_ids) >= self.fit_samples:
+            self.flush()
+
+    def flush(self) -> None:
+        """Fit the reducer on the held back vectors and store them."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._pending_ids = set()
+        if not self.reducer.is_fitted:
+            self.reducer.fit(np.concatenate([batch.values for batch, _ in pending]))
+        for batch, documents in pending:
+            self._store_reduced(batch, documents)
+
+    def _store_reduced(self, batch: VectorBatch, documents: Optional[List[str]]) -> None:
+        reduced_values = self.reducer.transform(batch.values)
+        path = self.reducer_path(self.store)
+        if not os.path.exists(path):
+            self.reducer.save(path)
+        reduced = VectorBatch(batch.ids, reduced_values, batch.metadatas)
+        self.store.store_batch(reduced, documents=documents)
+
+    def get_metadatas(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Metadata of stored and held back vectors by id.
+
+        Held back vectors return the dictionaries of their pending batch, so
+        changes to them are stored with the batch.
+        """
+        wanted = set(ids)
+        metadatas = {}
+        for batch, _ in self._pending:
+            for id, metadata in zip(batch.ids, batch.metadatas):
+                if id in wanted:
+                    metadatas[id] = metadata
+        stored = [id for id in ids if id not in metadatas]
+        if stored:
+            metadatas.update(self.store.get_metadatas(stored))
+        return metadatas
+
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Replace the metadata of stored vectors.
+
+        Held back vectors are skipped; their batches share the metadata
+        dictionaries of the chunks and are stored with the latest values.
+        """
+        stored = [
+            (id, metadata) for id, metadata in zip(ids, metadatas) if id not in self._pending_ids
+        ]
+        if stored:
+            self.store.update_metadatas(
+                [id for id, _ in stored], [metadata for _, metadata in stored]
+            )
+
+    def search_vectors(
+        self, query_vector: np.ndarray, top_k: int = 5, rescore: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Search with a full query vector.
+
+        Args:
+            query_vector: Full-dimension query embedding
+            top_k: Number of results
+            rescore: Re-rank ``rescore_factor * top_k`` candidates by their
+                full-precision cosine similarity
+
+        Returns:
+            Results as returned by ChromaStore.search_vectors. Re-scored
+            results carry the cosine distance (1 - similarity) instead.
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        rescore = rescore and self.full_store is not None
+        candidates = top_k * self.rescore_factor if rescore else top_k
+        results = self.store.search_vectors(self.reducer.transform(query), top_k=candidates)
+        if not rescore or not results:
+            return results[:top_k]
+
+        with tracing.span("rerank", candidates=len(results)):
+            ids, vectors = self.full_store.get([result["id"] for result in results])
+            by_id = {result["id"]: result for result in results}
+            rescored = []
+            if ids:
+                similarities = cosine_similarities(query, vectors)
+                for index in np.argsort(-similarities, kind="stable")[:top_k]:
+                    result = dict(by_id[ids[index]])
+                    result["distance"] = float(1.0 - similarities[index])
+                    rescored.append(result)
+        # Vectors without a full copy keep their approximate rank
+        found = set(ids)
+        rescored.extend(result for result in results if result["id"] not in found)
+        return rescored[:top_k]
+
+    def close(self) -> None:
+        """Close the full vector sidecar."""
+        if self.full_store is not None:
+            self.full_store.close()
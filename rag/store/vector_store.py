@@ -1,8 +1,25 @@
-from typing import List, Dict, Any
-from ..core.interfaces import IVectorStore
-from ..core.models import Vector
+from typing import List
+
 import numpy as np
 
+from ..core.interfaces import IVectorStore
+from ..core.models import Vector, VectorBatch
+
+
+def cosine_similarities(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine similarities between a query vector and every row of a matrix.
+
+    Args:
+        query: Vector of shape (d,)
+        matrix: Matrix of shape (n, d), e.g. VectorBatch.values
+
+    Returns:
+        float32 array of shape (n,)
+    """
+    query = np.asarray(query, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    return (matrix @ query) / np.maximum(norms, np.float32(1e-12))
+
 class BaseVectorStore(IVectorStore):
     """Base class for vector storage implementations."""
     
@@ -13,18 +30,23 @@ class BaseVectorStore(IVectorStore):
         """Store a vector in the database."""
         raise NotImplementedError("Subclasses must implement store()")
     
+    def store_batch(self, batch: VectorBatch, documents: List[str] = None) -> None:
+        """Store a batch of vectors."""
+        raise NotImplementedError("Subclasses must implement store_batch()")
+
     def search(self, query_vector: Vector, limit: int = 5) -> List[Vector]:
         """Search for similar vectors."""
         raise NotImplementedError("Subclasses must implement search()")
     
     def _calculate_similarity(self, vec1: Vector, vec2: Vector) -> float:
         """Calculate cosine similarity between two vectors."""
-        v1 = np.array(vec1.values)
-        v2 = np.array(vec2.values)
-        
-        # Normalize vectors
-        v1_norm = v1 / np.linalg.norm(v1)
-        v2_norm = v2 / np.linalg.norm(v2)
+        # Vector values already are float32 arrays, so nothing is copied here
+        v1 = vec1.values
+        v2 = vec2.values
         
         # Calculate cosine similarity
-        return float(np.dot(v1_norm, v2_norm)) 
\ No newline at end of file
+        return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
+
+    def _calculate_similarities(self, query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """Cosine similarities between a query vector and every row of a matrix."""
+        return cosine_similarities(query, matrix)
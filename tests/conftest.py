@@ -50,4 +50,100 @@ def sample_text():
     """Return a sample text for testing."""
     return """This is a sample text.
 It contains multiple lines.
-And some basic content for testing.""" 
\ No newline at end of file
+And some basic content for testing."""
+
+
+def _pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages, width: int = 612, height: int = 792) -> bytes:
+    """Build a minimal PDF.
+
+    Each page is a dict with optional keys:
+        lines: list of text lines
+        table: list of rows (list of cell strings), drawn with ruling lines
+        image: PIL image placed as (x, y, width, height) given by "image_box"
+    """
+    from io import BytesIO
+
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+
+    for page in pages:
+        ops = []
+        y = height - 72
+        for line in page.get("lines", []):
+            ops.append(f"BT /F1 11 Tf 72 {y} Td ({_pdf_text(line)}) Tj ET")
+            y -= 14
+        table = page.get("table")
+        if table:
+            cell_width, cell_height = 120, 18
+            top = y - 10
+            for row_index, row in enumerate(table):
+                row_y = top - (row_index + 1) * cell_height
+                for col_index, cell in enumerate(row):
+                    x = 72 + col_index * cell_width
+                    ops.append(f"{x} {row_y} {cell_width} {cell_height} re S")
+                    ops.append(f"BT /F1 10 Tf {x + 4} {row_y + 5} Td ({_pdf_text(cell)}) Tj ET")
+        resources = f"/Font << /F1 {font} 0 R >>"
+        image = page.get("image")
+        if image is not None:
+            buffer = BytesIO()
+            image.convert("RGB").save(buffer, format="JPEG")
+            data = buffer.getvalue()
+            image_obj = add(
+                f"<< /Type /XObject /Subtype /Image /Width {image.width} "
+                f"/Height {image.height} /ColorSpace /DeviceRGB /BitsPerComponent 8 "
+                f"/Filter /DCTDecode /Length {len(data)} >>\n"
+                .encode() + b"stream\n" + data + b"\nendstream"
+            )
+            x, y_pos, w, h = page.get("image_box", (0, 0, width, height))
+            ops.append(f"q {w} 0 0 {h} {x} {y_pos} cm /Im1 Do Q")
+            resources += f" /XObject << /Im1 {image_obj} 0 R >>"
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(
+            f"<< /Length {len(stream)} >>\n".encode() + b"stream\n" + stream + b"\nendstream"
+        )
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_obj} 0 R /MediaBox [0 0 {width} {height}] "
+            f"/Contents {content} 0 R /Resources << {resources} >> >>".encode()
+        ))
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode()
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[pages_obj - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    output = BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode())
+    output.write(
+        f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n".encode()
+    )
+    return output.getvalue()
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Factory fixture writing a PDF built by build_pdf to a temporary file."""
+    def _make_pdf(pages, name: str = "test.pdf") -> str:
+        path = tmp_path / name
+        path.write_bytes(build_pdf(pages))
+        return str(path)
+    return _make_pdf
@@ -0,0 +1,193 @@
+import pytest
+
+from rag.ingestion.advanced_pdf_loader import AdvancedPDFLoader
+
+
+def _text_page(number: int) -> dict:
+    words = " ".join(f"word{i}" for i in range(12))
+    return {"lines": [f"Page {number} heading"] + [f"{words} line {j}" for j in range(10)]}
+
+def test_advanced_pdf_loader_sequential(make_pdf):
+    """Test that every page becomes one document with its page number."""
+    path = make_pdf([_text_page(i) for i in range(1, 4)])
+    loader = AdvancedPDFLoader(path, include_images=False, include_tables=False)
+
+    documents = loader.load()
+
+    assert [doc.metadata["page_number"] for doc in documents] == [1, 2, 3]
+    assert documents[1].page_content.startswith("Page 2 heading")
+
+def test_advanced_pdf_loader_parallel_matches_sequential(make_pdf):
+    """Test that page-parallel extraction yields the same pages in order."""
+    path = make_pdf([_text_page(i) for i in range(1, 8)])
+
+    sequential = AdvancedPDFLoader(path, include_images=False, include_tables=False).load()
+    parallel = AdvancedPDFLoader(path, include_images=False, include_tables=False,
+                                 max_workers=2, pages_per_task=2).load()
+
+    assert [doc.page_content for doc in parallel] == [doc.page_content for doc in sequential]
+    assert [doc.metadata for doc in parallel] == [doc.metadata for doc in sequential]
+
+def test_advanced_pdf_loader_tables(make_pdf):
+    """Test that tables are appended as Markdown and flagged in metadata."""
+    page = _text_page(1)
+    page["table"] = [["Year", "Revenue"], ["2020", "100"], ["2021", "200"]]
+    path = make_pdf([page])
+    loader = AdvancedPDFLoader(path, include_images=False, include_tables=True)
+
+    documents = loader.load()
+
+    assert documents[0].metadata["has_tables"] is True
+    assert "| Year | Revenue |\n| --- | --- |\n| 2020 | 100 |" in documents[0].page_content
+
+def test_advanced_pdf_loader_tiered_skips_table_extraction(make_pdf, monkeypatch):
+    """Test that pages without ruling lines skip pdfplumber's table extraction."""
+    import pdfplumber.page
+
+    table_page = _text_page(2)
+    table_page["table"] = [["Year", "Revenue"], ["2020", "100"]]
+    path = make_pdf([_text_page(1), table_page, _text_page(3)])
+    calls = []
+    original = pdfplumber.page.Page.extract_tables
+
+    def extract_tables(page, *args, **kwargs):
+        calls.append(page.page_number)
+        return original(page, *args, **kwargs)
+
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_tables", extract_tables)
+
+    documents = AdvancedPDFLoader(path, include_images=True, include_tables=True,
+                                  extraction_mode="tiered").load()
+
+    assert calls == [2]
+    assert [doc.metadata["has_tables"] for doc in documents] == [False, True, False]
+    assert all(doc.metadata["extraction_mode"] == "tiered" for doc in documents)
+
+def test_advanced_pdf_loader_tiered_matches_full_text(make_pdf):
+    """Test that the fast text pass extracts the same words as the full pass."""
+    path = make_pdf([_text_page(1), _text_page(2)])
+
+    options = {"include_images": False, "include_tables": False}
+    tiered = AdvancedPDFLoader(path, extraction_mode="tiered", **options).load()
+    full = AdvancedPDFLoader(path, extraction_mode="full", **options).load()
+
+    assert [doc.page_content.split() for doc in tiered] == [
+        doc.page_content.split() for doc in full
+    ]
+
+def test_advanced_pdf_loader_rejects_unknown_mode(make_pdf):
+    """Test that unsupported extraction modes are rejected."""
+    path = make_pdf([_text_page(1)])
+    with pytest.raises(ValueError):
+        AdvancedPDFLoader(path, extraction_mode="fastest")
+
+class _RecordingVisionModel:
+    """Vision model stand-in that records the images it is asked to describe."""
+
+    def __init__(self):
+        self.sizes = []
+
+    def describe_image(self, image):
+        self.sizes.append(image.size)
+        return f"An image of {image.width}x{image.height} pixels"
+
+def _image_page(number: int, image_size=(400, 300)) -> dict:
+    from PIL import Image
+    page = _text_page(number)
+    page["image"] = Image.new("RGB", image_size, color=(200, 30, 30))
+    page["image_box"] = (100, 100, 200, 150)
+    return page
+
+def test_advanced_pdf_loader_describes_images_with_vision_model(make_pdf):
+    """Test that embedded images are described when a vision model is set."""
+    path = make_pdf([_image_page(1)])
+    vision_model = _RecordingVisionModel()
+
+    documents = AdvancedPDFLoader(path, vision_model=vision_model, include_tables=False).load()
+
+    assert vision_model.sizes == [(400, 300)]
+    assert documents[0].metadata["has_images"] is True
+    assert documents[0].metadata["image_count"] == 1
+    assert "An image of 400x300 pixels" in documents[0].page_content
+
+def test_advanced_pdf_loader_skips_images_without_vision_model(make_pdf, monkeypatch):
+    """Test that images are not decoded at all when nothing can describe them."""
+    path = make_pdf([_image_page(1)])
+    monkeypatch.setattr(AdvancedPDFLoader, "_iter_page_images",
+                        lambda *args: pytest.fail("images should not be opened"))
+
+    documents = AdvancedPDFLoader(path, include_tables=False).load()
+
+    assert documents[0].metadata["has_images"] is False
+
+def test_advanced_pdf_loader_image_pixel_cap(make_pdf):
+    """Test that images beyond the per-page pixel budget are skipped."""
+    path = make_pdf([_image_page(1, image_size=(400, 300))])
+    vision_model = _RecordingVisionModel()
+
+    documents = AdvancedPDFLoader(path, vision_model=vision_model, include_tables=False,
+                                  max_image_pixels_per_page=100_000).load()
+
+    assert vision_model.sizes == []
+    assert documents[0].metadata["has_images"] is False
+
+def test_vision_model_downscales_before_encoding():
+    """Test that large images are encoded at the model resolution."""
+    import base64
+    from io import BytesIO
+
+    from PIL import Image
+
+    from rag.llm.vision_model import VisionModel
+
+    vision_model = VisionModel(api_key="test", max_image_size=512)
+    image = Image.new("RGBA", (4000, 1000), color=(0, 0, 255, 255))
+
+    encoded = vision_model._image_to_base64(image)
+
+    decoded = Image.open(BytesIO(base64.b64decode(encoded)))
+    assert decoded.format == "JPEG"
+    assert decoded.size == (512, 128)
+    # The caller's image is left untouched
+    assert image.size == (4000, 1000)
+
+def test_advanced_pdf_loader_page_classes(make_pdf):
+    """Test that blank and cover pages are not sent to the vision model."""
+    from PIL import Image, ImageDraw
+    scan = Image.new("RGB", (600, 800), color="white")
+    draw = ImageDraw.Draw(scan)
+    for y in range(50, 750, 20):
+        draw.rectangle((50, y, 550, y + 8), fill="black")
+    path = make_pdf([{}, {"lines": ["Annual Report 2024"]}, {"image": scan}, _text_page(4)])
+    vision_model = _RecordingVisionModel()
+
+    documents = AdvancedPDFLoader(path, vision_model=vision_model, include_tables=False).load()
+
+    # Only the scanned page is rendered; the blank page produces no document
+    assert len(vision_model.sizes) == 1
+    assert [doc.metadata["page_number"] for doc in documents] == [2, 3, 4]
+    assert [doc.metadata["page_class"] for doc in documents] == ["sparse", "scan", "text"]
+    assert [doc.metadata["vision_decision"] for doc in documents] == ["skipped", "page", "skipped"]
+    assert "ink_coverage" not in documents[2].metadata
+
+class _BatchingVisionModel(_RecordingVisionModel):
+    """Vision model stand-in that describes all images of a page in one call."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = 0
+
+    def describe_images(self, images):
+        self.batches += 1
+        return [self.describe_image(image) for image in images]
+
+def test_advanced_pdf_loader_batches_page_images(make_pdf):
+    """Test that vision models with describe_images get all images of a page at once."""
+    path = make_pdf([_image_page(1), _image_page(2, image_size=(200, 100))])
+    vision_model = _BatchingVisionModel()
+
+    documents = AdvancedPDFLoader(path, vision_model=vision_model, include_tables=False).load()
+
+    assert vision_model.batches == 2
+    assert vision_model.sizes == [(400, 300), (200, 100)]
+    assert [doc.metadata["image_count"] for doc in documents] == [1, 1]
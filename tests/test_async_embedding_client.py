@@ -0,0 +1,249 @@
+import asyncio
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from rag.embedding.async_client import AdaptiveBatchSizer, AsyncEmbeddingClient, TokenBucket
+
+
+class _FakeEmbeddingsAPI(ThreadingHTTPServer):
+    """Local stand-in for the OpenAI embeddings API.
+
+    The embedding of a text is [len(text), number of words], base64 encoded as
+    float32. The first ``throttle`` requests get a 429, the next ``failures``
+    a 500.
+    """
+
+    def __init__(self, throttle: int = 0, failures: int = 0, retry_after: str = "0"):
+        super().__init__(("127.0.0.1", 0), _FakeHandler)
+        self.throttle = throttle
+        self.failures = failures
+        self.retry_after = retry_after
+        self.batch_sizes = []
+        self.payloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            if server.throttle:
+                server.throttle -= 1
+                self._send_json(429, {"error": {"message": "Rate limit reached"}},
+                                {"Retry-After": server.retry_after})
+                return
+            if server.failures:
+                server.failures -= 1
+                self._send_json(500, {"error": {"message": "Server error"}})
+                return
+            if self.headers.get("Authorization") != "Bearer test" or self.path != "/v1/embeddings":
+                self._send_json(401, {"error": {"message": "Unauthorized"}})
+                return
+            server.payloads.append(body)
+            server.batch_sizes.append(len(body["input"]))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(0.02)
+        data = []
+        for index, text in enumerate(body["input"]):
+            vector = np.array([len(text), len(text.split())], dtype="<f4")
+            embedding = base64.b64encode(vector.tobytes()).decode()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        with server.lock:
+            server.in_flight -= 1
+        self._send_json(200, {"object": "list", "data": data[::-1], "model": body["model"]})
+
+@pytest.fixture
+def embeddings_api():
+    servers = []
+
+    def start(**kwargs):
+        server = _FakeEmbeddingsAPI(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def _texts(n):
+    return [" ".join(["word"] * (i % 7 + 1)) for i in range(n)]
+
+def test_async_client_embeds_in_order_with_concurrency(embeddings_api):
+    """Test that batches run concurrently and results keep the input order."""
+    server = embeddings_api()
+    client = AsyncEmbeddingClient(api_key="test", base_url=server.base_url, max_in_flight=3,
+                                  initial_batch_size=10, max_batch_size=10)
+    texts = _texts(95)
+
+    embeddings = client.embed_documents(texts)
+
+    assert embeddings.dtype == np.float32
+    assert embeddings.shape == (95, 2)
+    np.testing.assert_array_equal(embeddings[:, 0], [len(text) for text in texts])
+    assert sum(server.batch_sizes) == 95 and max(server.batch_sizes) == 10
+    assert 1 < server.max_in_flight <= 3
+    assert server.payloads[0]["encoding_format"] == "base64"
+    assert client.stats["requests"] == 10
+
+def test_async_client_retries_rate_limits(embeddings_api):
+    """Test that 429 and 5xx responses are retried and shrink the batches."""
+    server = embeddings_api(throttle=2, failures=1)
+    client = AsyncEmbeddingClient(api_key="test", base_url=server.base_url, max_in_flight=1,
+                                  initial_batch_size=32, retry_delay=0.01)
+
+    embeddings = client.embed_documents(_texts(80))
+
+    assert embeddings.shape == (80, 2)
+    assert client.stats["throttled"] == 2
+    assert client.stats["retries"] == 3
+    # The throttled batch is retried as is, the following ones are smaller
+    assert server.batch_sizes[0] == 32
+    assert server.batch_sizes[1] < 32
+
+def test_async_client_honours_retry_after(embeddings_api):
+    """Test that the client waits as long as the server asks."""
+    server = embeddings_api(throttle=1, retry_after="0.3")
+    client = AsyncEmbeddingClient(api_key="test", base_url=server.base_url, retry_delay=0.01)
+
+    start = time.monotonic()
+    client.embed_documents(_texts(5))
+
+    assert time.monotonic() - start >= 0.3
+
+def test_async_client_gives_up(embeddings_api):
+    """Test that persistent failures and client errors are raised."""
+    server = embeddings_api(failures=10)
+    client = AsyncEmbeddingClient(
+        api_key="test", base_url=server.base_url, max_retries=2, retry_delay=0.01
+    )
+    with pytest.raises(RuntimeError):
+        client.embed_documents(_texts(3))
+
+    unauthorized = AsyncEmbeddingClient(api_key="wrong", base_url=server.base_url)
+    server.failures = 0
+    with pytest.raises(Exception, match="401"):
+        unauthorized.embed_documents(_texts(3))
+
+def test_async_client_recovers_from_failed_calls(embeddings_api):
+    """Test that failed calls give back all their slots, also those of unstarted batches."""
+    server = embeddings_api()
+    client = AsyncEmbeddingClient(api_key="test", base_url=server.base_url, max_in_flight=2,
+                                  initial_batch_size=1, max_batch_size=1, max_retries=0)
+    errors, results = [], []
+
+    def embed():
+        for _ in range(4):
+            server.failures = 1
+            try:
+                client.embed_documents(_texts(8))
+            except RuntimeError as e:
+                errors.append(e)
+        server.failures = 0
+        results.append(client.embed_documents(_texts(4)))
+
+    # A leaked slot blocks later calls forever, so they run in a daemon thread
+    thread = threading.Thread(target=embed, daemon=True)
+    thread.start()
+    thread.join(10)
+
+    assert len(errors) == 4
+    assert len(results) == 1 and results[0].shape == (4, 2)
+    client.close()
+
+def test_adaptive_batch_sizer():
+    """Test additive increase below and multiplicative decrease above the target latency."""
+    sizer = AdaptiveBatchSizer(initial=64, target_latency=1.0, increase=16, maximum=100)
+
+    sizer.record(0.5, 64)
+    assert sizer.size == 80
+    sizer.record(0.5, 10)  # Small batches say nothing about larger ones
+    assert sizer.size == 80
+    sizer.record(0.5, 80)
+    sizer.record(0.5, 96)
+    assert sizer.size == 100
+    sizer.record(2.0, 100)
+    assert sizer.size == 50
+    sizer.throttled()
+    assert sizer.size == 25
+
+def test_token_bucket_limits_rate():
+    """Test that tokens beyond the burst wait for the refill."""
+    async def acquire():
+        bucket = TokenBucket(tokens_per_minute=6000, capacity=100)
+        start = time.monotonic()
+        await bucket.acquire(100)
+        await bucket.acquire(30)
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire()) == pytest.approx(0.3, abs=0.1)
+
+def test_async_client_limits_tokens_across_calls(embeddings_api):
+    """Test that a later call waits for tokens used up by an earlier one."""
+    server = embeddings_api()
+    client = AsyncEmbeddingClient(api_key="test", base_url=server.base_url, tokens_per_minute=6000)
+    fresh = AsyncEmbeddingClient(api_key="test", base_url=server.base_url, tokens_per_minute=6000)
+    try:
+        # 16 texts of about 400 tokens drain the bucket of 6000 tokens
+        client.embed_documents(["word " * 320] * 16)
+
+        start = time.monotonic()
+        fresh.embed_documents(["word " * 32])
+        unthrottled = time.monotonic() - start
+        start = time.monotonic()
+        client.embed_documents(["word " * 32])
+        throttled = time.monotonic() - start
+    finally:
+        client.close()
+        fresh.close()
+
+    # 41 tokens refill at 100 tokens per second
+    assert unthrottled < 0.15
+    assert throttled >= 0.3
+
+def test_async_client_shares_limits_with_other_event_loops(embeddings_api):
+    """Test concurrent embed_documents_async calls from separate event loops."""
+    server = embeddings_api()
+    client = AsyncEmbeddingClient(api_key="test", base_url=server.base_url, max_in_flight=2,
+                                  initial_batch_size=5, max_batch_size=5)
+    results = []
+
+    def run():
+        results.append(asyncio.run(client.embed_documents_async(_texts(20))))
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    client.close()
+
+    assert [result.shape for result in results] == [(20, 2)] * 3
+    assert server.max_in_flight <= 2
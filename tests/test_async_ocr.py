@@ -0,0 +1,238 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from rag.ingestion.ocr import AsyncAzureOCRProcessor
+
+
+class _FakeDocumentIntelligence(ThreadingHTTPServer):
+    """Local stand-in for the Document Intelligence analyze API.
+
+    Every page of the requested range contains a single line "<file size> page <n>".
+    """
+
+    def __init__(self, total_pages: int = 1, failures: int = 0, polls: int = 1):
+        super().__init__(("127.0.0.1", 0), _FakeHandler)
+        self.total_pages = total_pages
+        self.failures = failures
+        self.polls = polls
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.operations = {}
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, body=None, headers=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        pages = parse_qs(url.query).get("pages", [None])[0]
+        with server.lock:
+            server.requests.append(pages)
+            if server.failures:
+                server.failures -= 1
+                self._send_json(429, {"error": {"code": "429", "message": "Rate limit"}},
+                                {"Retry-After": "0"})
+                return
+            operation_id = str(len(server.operations))
+            server.operations[operation_id] = {"pages": pages, "size": len(body), "polls": 0}
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        location = (f"{server.endpoint}/documentintelligence/documentModels/prebuilt-read/"
+                    f"analyzeResults/{operation_id}?api-version=2024-11-30")
+        self._send_json(202, headers={"Operation-Location": location, "Retry-After": "0"})
+
+    def do_GET(self):
+        server = self.server
+        operation_id = urlparse(self.path).path.rsplit("/", 1)[-1]
+        with server.lock:
+            operation = server.operations[operation_id]
+            operation["polls"] += 1
+            running = operation["polls"] <= server.polls
+            if not running and not operation.get("done"):
+                operation["done"] = True
+                server.in_flight -= 1
+        if running:
+            self._send_json(200, {"status": "running"}, {"Retry-After": "0"})
+            return
+        if operation["pages"]:
+            first, last = (int(number) for number in operation["pages"].split("-"))
+        else:
+            first, last = 1, server.total_pages
+        pages = [
+            {
+                "pageNumber": number,
+                "width": 8.5,
+                "height": 11.0,
+                "unit": "inch",
+                "lines": [{"content": f"{operation['size']} page {number}",
+                           "polygon": [1.0, 1.0, 3.25, 1.0, 3.25, 1.2, 1.0, 1.2]}],
+                "words": [{"content": "page", "confidence": 0.9}],
+            }
+            for number in range(first, last + 1)
+        ]
+        self._send_json(200, {
+            "status": "succeeded",
+            "analyzeResult": {
+                "apiVersion": "2024-11-30",
+                "modelId": "prebuilt-read",
+                "content": "",
+                "pages": pages,
+            },
+        })
+
+@pytest.fixture
+def fake_ocr_server():
+    servers = []
+
+    def _start(**kwargs):
+        server = _FakeDocumentIntelligence(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def _processor(server, **kwargs) -> AsyncAzureOCRProcessor:
+    return AsyncAzureOCRProcessor(endpoint=server.endpoint, api_key="test-key",
+                                  polling_interval=0, retry_delay=0.01, **kwargs)
+
+def test_async_ocr_processes_documents_concurrently(fake_ocr_server, tmp_path):
+    """Test that many documents are analyzed in parallel up to the concurrency limit."""
+    server = fake_ocr_server(total_pages=2, polls=3)
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"scan{i}.png"
+        path.write_bytes(b"x" * (i + 1))
+        paths.append(path)
+    processor = _processor(server, max_concurrency=3)
+
+    async def collect():
+        return [response async for response in processor.iter_pages(paths)]
+
+    responses = asyncio.run(collect())
+
+    assert len(responses) == 12
+    assert {(response.source, response.page_number) for response in responses} == {
+        (str(path), number) for path in paths for number in (1, 2)
+    }
+    # The content of each file was uploaded
+    assert all(response.text.startswith(f"{len(open(response.source, 'rb').read())} page")
+               for response in responses)
+    assert responses[0].confidence == pytest.approx(0.9)
+    assert 1 < server.max_in_flight <= 3
+
+def test_async_ocr_splits_large_pdfs(fake_ocr_server, make_pdf):
+    """Test that large PDFs are analyzed as separate page ranges."""
+    server = fake_ocr_server()
+    path = make_pdf([{"lines": [f"Page {i}"]} for i in range(1, 6)])
+    processor = _processor(server, pages_per_request=2)
+
+    responses = list(processor.stream_pages([path]))
+
+    assert sorted(server.requests) == ["1-2", "3-4", "5-5"]
+    assert sorted(response.page_number for response in responses) == [1, 2, 3, 4, 5]
+
+def test_async_ocr_retries_throttled_requests(fake_ocr_server, tmp_path):
+    """Test that throttled requests are retried and the text is assembled in page order."""
+    server = fake_ocr_server(total_pages=3, failures=2)
+    path = tmp_path / "scan.tiff"
+    path.write_bytes(b"tiff")
+
+    text = _processor(server).process(str(path))
+
+    assert len(server.requests) == 3
+    assert text == "Page 1\n\n4 page 1\nPage 2\n\n4 page 2\nPage 3\n\n4 page 3"
+
+def test_async_ocr_skips_failed_documents(fake_ocr_server, tmp_path):
+    """Test that a document failing after all retries does not stop the batch."""
+    server = fake_ocr_server(failures=1)
+    path = tmp_path / "scan.png"
+    path.write_bytes(b"png")
+    processor = _processor(server, max_retries=0)
+
+    responses = list(processor.stream_pages([path, path]))
+
+    assert len(responses) == 1
+    assert processor.failed == [str(path)]
+
+def test_async_ocr_stream_stops_with_consumer(fake_ocr_server, tmp_path):
+    """Test that no more requests are sent once the caller stops reading pages."""
+    server = fake_ocr_server()
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"scan{i}.png"
+        path.write_bytes(b"png")
+        paths.append(path)
+    processor = _processor(server, max_concurrency=1)
+
+    stream = processor.stream_pages(paths)
+    next(stream)
+    stream.close()
+
+    deadline = time.monotonic() + 5
+    while any(thread.name == "azure-ocr" for thread in threading.enumerate()):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert len(server.requests) < len(paths)
+
+def test_document_loader_ocr_documents(fake_ocr_server, tmp_path):
+    """Test that OCR pages become page documents ready for chunking."""
+    from rag.ingestion.document_loader import DocumentLoader
+
+    server = fake_ocr_server(total_pages=2)
+    (tmp_path / "scan.png").write_bytes(b"png")
+    (tmp_path / "notes.txt").write_text("not scanned")
+    loader = DocumentLoader()
+
+    documents = list(loader.load_ocr_documents(tmp_path, _processor(server)))
+
+    assert sorted(doc.metadata["page_number"] for doc in documents) == [1, 2]
+    assert all(doc.metadata["file_name"] == "scan.png" for doc in documents)
+    assert all(doc.metadata["content_type"] == "ocr" for doc in documents)
+    assert len(server.requests) == 1
+
+def test_async_ocr_uses_cache_for_unchanged_files(fake_ocr_server, make_pdf, tmp_path):
+    """Test that cached page ranges are not sent to the service again."""
+    from rag.ingestion.ocr_cache import OCRCache
+
+    server = fake_ocr_server()
+    path = make_pdf([{"lines": [f"Page {i}"]} for i in range(1, 4)])
+    cache = OCRCache(str(tmp_path / "ocr_cache.sqlite3"))
+    processor = _processor(server, pages_per_request=2, cache=cache)
+
+    first = sorted(processor.stream_pages([path]), key=lambda response: response.page_number)
+    second = sorted(processor.stream_pages([path]), key=lambda response: response.page_number)
+
+    assert len(server.requests) == 2
+    assert cache.hits == 2
+    assert [response.text for response in second] == [response.text for response in first]
+    assert second[0].lines[0].polygon == [1.0, 1.0, 3.25, 1.0, 3.25, 1.2, 1.0, 1.2]
+    assert second[0].unit == "inch"
+    assert second[0].source == path
@@ -87,4 +87,20 @@ def test_chroma_store_duplicate_ids(chroma_store):
     
     assert len(results) == 1
     assert results[0]["id"] == "doc1"
-    assert results[0]["metadata"]["source"] == "test2" 
\ No newline at end of file
+    assert results[0]["metadata"]["source"] == "test2"
+
+def test_chroma_store_store_batch(chroma_store):
+    """Test storing a float32 batch and searching with an array query."""
+    from rag.core.models import VectorBatch
+
+    batch = VectorBatch(
+        ids=["doc1", "doc2"],
+        values=np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], dtype=np.float32),
+        metadatas=[{"source": "test1"}, {"source": "test2"}]
+    )
+    chroma_store.store_batch(batch, documents=["first", "second"])
+
+    results = chroma_store.search_vectors(np.array([0.1, 0.9, 0.0], dtype=np.float32), top_k=1)
+
+    assert results[0]["id"] == "doc2"
+    assert results[0]["content"] == "second"
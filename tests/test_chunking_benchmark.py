@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from rag.bench import chunking
+from rag.bench.corpora import CORPORA
+
+
+@pytest.mark.parametrize("corpus", sorted(CORPORA))
+def test_corpora_are_deterministic(corpus):
+    """Test that corpora have the requested size and depend only on the seed."""
+    generate = CORPORA[corpus]
+    text = generate(5000, seed=1)
+
+    assert len(text) >= 5000
+    assert text == generate(5000, seed=1)
+    assert text != generate(5000, seed=2)
+
+def test_chunking_benchmark_report():
+    """Test that every chunker strategy is measured on every size."""
+    report = chunking.run(sizes=[2000, 8000], repeat=1)
+
+    assert set(report["chunkers"]) == set(chunking.CHUNKER_CONFIGS)
+    for entry in report["chunkers"].values():
+        assert all(r["characters"] >= size for r, size in zip(entry["results"], [2000, 8000]))
+        for result in entry["results"]:
+            assert result["chunk_sizes"]["count"] > 0
+            assert result["peak_memory_bytes"] > 0
+            assert result["chars_per_second"] > 0
+    json.dumps(report)
+
+def test_chunking_benchmark_main_writes_json(tmp_path):
+    """Test the standalone runner output file."""
+    output = tmp_path / "chunking.json"
+
+    exit_code = chunking.main(["--chunkers", "token", "page", "--sizes", "2000", "4000",
+                               "--repeat", "1", "--output", str(output)])
+
+    assert exit_code == 0
+    report = json.loads(output.read_text())
+    assert set(report["chunkers"]) == {"token", "page"}
+
+def test_scaling_exponent_flags_quadratic_growth():
+    """Test that quadratic timings are reported as regressions."""
+    small = {"characters": 1000, "best_seconds": 0.01}
+    linear = [small, {"characters": 10000, "best_seconds": 0.1}]
+    quadratic = [small, {"characters": 10000, "best_seconds": 1.0}]
+    report = {"chunkers": {
+        "linear": {"scaling_exponent": chunking.scaling_exponent(linear)},
+        "quadratic": {"scaling_exponent": chunking.scaling_exponent(quadratic)},
+    }}
+
+    assert report["chunkers"]["linear"]["scaling_exponent"] == pytest.approx(1.0)
+    assert report["chunkers"]["quadratic"]["scaling_exponent"] == pytest.approx(2.0)
+    assert chunking.check_scaling(report, max_exponent=1.5) == ["quadratic"]
+
+def test_chunk_size_distribution():
+    """Test the chunk size summary."""
+    distribution = chunking.chunk_size_distribution([10, 20, 30, 40, 50])
+
+    assert distribution["count"] == 5
+    assert distribution["min"] == 10
+    assert distribution["p50"] == 30
+    assert distribution["max"] == 50
+    assert distribution["mean"] == 30
@@ -0,0 +1,25 @@
+from rag.bench import importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |       2500 | typer
+import time:      2080 |       2080 |   click
+import time:        50 |        900 |     chromadb.api
+"""
+
+def test_parse_importtime():
+    """Test that modules, times and nesting are read from -X importtime output."""
+    entries = importtime.parse_importtime(SAMPLE)
+
+    assert [entry["module"] for entry in entries] == ["_io", "typer", "click", "chromadb.api"]
+    assert entries[1] == {"module": "typer", "self_us": 300, "cumulative_us": 2500, "depth": 0}
+    assert [entry["depth"] for entry in entries] == [1, 0, 1, 2]
+    assert importtime.heavy_imports(entries) == ["chromadb"]
+
+def test_cli_import_skips_heavy_subsystems():
+    """Test that importing the CLI, as `rag --help` does, loads no heavy subsystem."""
+    result = importtime.measure("rag.cli.main", repeat=1)
+
+    assert result["heavy_imports"] == []
+    assert result["total_seconds"] > 0
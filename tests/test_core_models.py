@@ -75,4 +75,48 @@ def test_final_answer_creation():
     assert answer.content == "Final answer"
     assert len(answer.sources) == 1
     assert answer.confidence == 0.95
-    assert answer.metadata["processed"] is True 
\ No newline at end of file
+    assert answer.metadata["processed"] is True
+
+def test_vector_batch_shares_memory():
+    """Test that a VectorBatch keeps float32 input without copies."""
+    import numpy as np
+
+    from rag.core.models import VectorBatch
+
+    values = np.arange(6, dtype=np.float32).reshape(2, 3)
+    batch = VectorBatch(ids=["a", "b"], values=values, metadatas=[{"n": 0}, {"n": 1}])
+
+    assert batch.values is values
+    assert len(batch) == 2 and batch.dimension == 3
+    assert np.shares_memory(batch[1].values, values)
+    assert batch[1].id == "b" and batch[1].metadata == {"n": 1}
+    np.testing.assert_allclose(np.linalg.norm(batch.normalized(), axis=1), 1.0, rtol=1e-6)
+
+def test_vector_batch_from_vectors():
+    """Test stacking single vectors and validating shapes."""
+    from rag.core.models import VectorBatch
+
+    batch = VectorBatch.from_vectors(
+        [Vector(id="a", values=[1.0, 2.0]), Vector(id="b", values=[3.0, 4.0])]
+    )
+
+    assert batch.values.dtype.name == "float32"
+    assert batch.values.shape == (2, 2)
+    assert [vector.id for vector in batch] == ["a", "b"]
+    with pytest.raises(ValueError):
+        VectorBatch(ids=["a"], values=[[1.0], [2.0]])
+
+def test_vector_store_similarities():
+    """Test the vectorized cosine similarity."""
+    import numpy as np
+
+    from rag.store.vector_store import BaseVectorStore
+
+    store = BaseVectorStore("test")
+    matrix = np.array([[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]], dtype=np.float32)
+
+    similarities = store._calculate_similarities(np.array([2.0, 0.0]), matrix)
+
+    np.testing.assert_allclose(similarities, [1.0, 0.0, 2 ** -0.5], rtol=1e-6)
+    similarity = store._calculate_similarity(Vector("a", matrix[2]), Vector("b", [1.0, 1.0]))
+    assert similarity == pytest.approx(1.0)
@@ -0,0 +1,141 @@
+import pytest
+from langchain.schema import Document
+
+from rag.ingestion.dedup import ChunkDeduplicator, DuplicateReferences
+
+DISCLAIMER = (
+    "This letter contains confidential information intended only for the addressee. "
+    "If you have received it in error please notify the sender immediately and delete "
+    "all copies. Any unauthorised use, disclosure or distribution is prohibited and "
+    "may be unlawful under the applicable data protection regulations."
+)
+
+def _chunk(text: str, source: str, page: int = 1) -> Document:
+    return Document(page_content=text, metadata={"source": source, "page_number": page})
+
+def test_dedup_drops_exact_duplicates():
+    """Test that identical chunks are stored once with back-references."""
+    deduplicator = ChunkDeduplicator()
+    chunks = [
+        _chunk(DISCLAIMER, "a.pdf"), _chunk(DISCLAIMER, "b.pdf", 3), _chunk(DISCLAIMER, "c.pdf")
+    ]
+
+    unique = deduplicator.deduplicate(chunks)
+
+    assert len(unique) == 1
+    assert unique[0].metadata["duplicate_count"] == 2
+    assert unique[0].metadata["duplicate_sources"] == "b.pdf#page=3; c.pdf#page=1"
+    assert deduplicator.stats.exact_duplicates == 2
+    assert deduplicator.stats.saved_embeddings == 2
+    assert deduplicator.stats.saved_characters == 2 * len(DISCLAIMER)
+
+def test_dedup_drops_near_duplicates():
+    """Test that chunks differing only slightly are treated as duplicates."""
+    deduplicator = ChunkDeduplicator(threshold=0.7)
+    variant = DISCLAIMER.replace("immediately", "without delay")
+
+    unique = deduplicator.deduplicate([_chunk(DISCLAIMER, "a.pdf"), _chunk(variant, "b.pdf")])
+
+    assert len(unique) == 1
+    assert deduplicator.stats.near_duplicates == 1
+
+def test_dedup_keeps_distinct_chunks():
+    """Test that unrelated chunks are all kept."""
+    deduplicator = ChunkDeduplicator()
+    chunks = [
+        _chunk(DISCLAIMER, "a.pdf"),
+        _chunk("Revenue grew by twelve percent compared to the previous fiscal year "
+               "driven by strong demand in the consulting segment.", "b.pdf"),
+        _chunk("The balance sheet shows total assets of four million euros and "
+               "liabilities of one point two million euros at year end.", "c.pdf"),
+    ]
+
+    unique = deduplicator.deduplicate(chunks)
+
+    assert len(unique) == 3
+    assert deduplicator.stats.duplicate_chunks == 0
+    assert "duplicate_count" not in unique[0].metadata
+
+def test_dedup_matches_across_batches():
+    """Test that the index persists between deduplicate calls."""
+    deduplicator = ChunkDeduplicator()
+
+    first = deduplicator.deduplicate([_chunk(DISCLAIMER, "a.pdf")])
+    second = deduplicator.deduplicate([_chunk(DISCLAIMER, "b.pdf")])
+
+    assert len(first) == 1
+    assert second == []
+    assert deduplicator.pop_updated()["0"].count == 1
+
+def test_dedup_signature_similarity():
+    """Test that signature agreement approximates Jaccard similarity."""
+    deduplicator = ChunkDeduplicator()
+
+    same = deduplicator.signature(DISCLAIMER) == deduplicator.signature(DISCLAIMER)
+    unrelated = deduplicator.signature("completely unrelated text here")
+    different = deduplicator.signature(DISCLAIMER) == unrelated
+
+    assert same.all()
+    assert different.mean() < 0.2
+
+def test_dedup_rejects_invalid_bands():
+    """Test that bands must divide the number of permutations."""
+    with pytest.raises(ValueError):
+        ChunkDeduplicator(num_perm=128, bands=7)
+
+def test_deduplicator_reports_updated_canonicals_of_earlier_batches():
+    """Test that stored canonical chunks are reported when later batches duplicate them."""
+    text = "Quarterly revenue grew by twelve percent compared with the previous year."
+    deduplicator = ChunkDeduplicator()
+    canonical = _chunk(text, "a.pdf", 1)
+    canonical.metadata["chunk_id"] = "a-1"
+    deduplicator.deduplicate([canonical])
+    assert deduplicator.pop_updated() == {}
+
+    second = deduplicator.deduplicate(
+        [_chunk(text, "b.pdf", 4), _chunk("Something else entirely.", "b.pdf", 5)]
+    )
+
+    assert len(second) == 1
+    assert deduplicator.pop_updated() == {"a-1": DuplicateReferences(1, ["b.pdf#page=4"])}
+    # The chunk of the earlier batch is not kept, so its metadata is left alone
+    assert "duplicate_count" not in canonical.metadata
+    assert deduplicator.pop_updated() == {}
+
+def test_deduplicator_updates_stored_canonicals(tmp_path):
+    """Test that duplicates of chunks from earlier batches reach their stored metadata."""
+    from rag.core.models import VectorBatch
+    from rag.store.chroma_store import ChromaStore
+
+    store = ChromaStore(str(tmp_path))
+    deduplicator = ChunkDeduplicator()
+    canonical = _chunk(DISCLAIMER, "a.pdf")
+    canonical.metadata["chunk_id"] = "a-1"
+    stored = deduplicator.deduplicate([canonical])
+    store.store_batch(VectorBatch(["a-1"], [[1.0, 0.0]], [chunk.metadata for chunk in stored]),
+                      documents=[DISCLAIMER])
+
+    deduplicator.deduplicate([_chunk(DISCLAIMER, "b.pdf", 2), _chunk(DISCLAIMER, "c.pdf", 3)])
+
+    assert deduplicator.update_stored(store) == 1
+    metadata = store.get_metadatas(["a-1", "missing"])
+    assert list(metadata) == ["a-1"]
+    assert metadata["a-1"]["duplicate_count"] == 2
+    assert metadata["a-1"]["duplicate_sources"] == "b.pdf#page=2; c.pdf#page=3"
+    assert deduplicator.update_stored(store) == 0
+
+def test_dedup_caps_recorded_sources():
+    """Test that a chunk repeated many times keeps its full count but few sources."""
+    deduplicator = ChunkDeduplicator(max_references=3)
+
+    unique = deduplicator.deduplicate([_chunk(DISCLAIMER, f"letter_{i}.pdf") for i in range(500)])
+    unique += deduplicator.deduplicate([_chunk(DISCLAIMER, f"later_{i}.pdf") for i in range(500)])
+
+    assert len(unique) == 1
+    assert unique[0].metadata["duplicate_count"] == 499
+    sources = "; ".join(f"letter_{i}.pdf#page=1" for i in (1, 2, 3))
+    assert unique[0].metadata["duplicate_sources"] == sources
+    later = deduplicator.pop_updated()["0"]
+    later.apply(unique[0].metadata, deduplicator.max_references)
+    assert unique[0].metadata["duplicate_count"] == 999
+    assert len(unique[0].metadata["duplicate_sources"].split("; ")) == 3
@@ -0,0 +1,128 @@
+import os
+import stat
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+from rag.embedding.worker import EmbeddingWorker, RemoteEmbedder, default_authkey
+
+
+class _CountingEmbedder:
+    """Embeds a text as [len(text), number of words] and counts the calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return np.array([[len(text), len(text.split())] for text in texts], dtype=np.float32)
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+@pytest.fixture
+def worker(tmp_path):
+    address = str(tmp_path / "worker.sock")
+    worker = EmbeddingWorker(_CountingEmbedder(), "fake", address=address, authkey=b"test")
+    thread = threading.Thread(target=worker.serve_forever, daemon=True)
+    thread.start()
+    assert worker.ready.wait(5)
+    yield worker
+    worker.close()
+    thread.join(5)
+
+def _fallback(loaded):
+    def create():
+        embedder = _CountingEmbedder()
+        loaded.append(embedder)
+        return embedder
+    return create
+
+def test_remote_embedder_uses_worker(worker):
+    """Test that requests are served by the worker without loading a model."""
+    loaded = []
+    client = RemoteEmbedder("fake", _fallback(loaded), address=worker.address, authkey=b"test")
+
+    np.testing.assert_array_equal(client.embed_query("two words"), [9, 2])
+    embeddings = client.embed_documents(["a", "b c"])
+    assert embeddings.dtype == np.float32 and embeddings.shape == (2, 2)
+    assert client.uses_worker
+    assert loaded == []
+    client.close()
+
+def test_remote_embedder_falls_back_without_worker(tmp_path, worker):
+    """Test in-process loading without a worker or for another embedder."""
+    loaded = []
+    missing_address = str(tmp_path / "missing.sock")
+    missing = RemoteEmbedder("fake", _fallback(loaded), address=missing_address, authkey=b"test")
+    other = RemoteEmbedder("other", _fallback(loaded), address=worker.address, authkey=b"test")
+    wrong_key = RemoteEmbedder("fake", _fallback(loaded), address=worker.address, authkey=b"wrong")
+
+    for client in (missing, other, wrong_key):
+        np.testing.assert_array_equal(client.embed_query("abc"), [3, 1])
+        assert not client.uses_worker
+    assert len(loaded) == 3
+    # The worker keeps serving after rejecting a client
+    client = RemoteEmbedder("fake", _fallback(loaded), address=worker.address, authkey=b"test")
+    assert client.uses_worker
+
+def test_remote_embedder_falls_back_when_worker_stops(worker):
+    """Test that a worker shutting down between queries does not fail them."""
+    loaded = []
+    client = RemoteEmbedder("fake", _fallback(loaded), address=worker.address, authkey=b"test")
+    client.embed_query("first")
+
+    worker.close()
+
+    np.testing.assert_array_equal(client.embed_query("second"), [6, 1])
+    assert len(loaded) == 1
+
+def test_worker_replaces_stale_socket(tmp_path):
+    """Test that a socket left by a crashed worker is removed, a live one is not."""
+    address = tmp_path / "worker.sock"
+    address.write_text("")
+    worker = EmbeddingWorker(_CountingEmbedder(), "fake", address=str(address), authkey=b"test")
+    thread = threading.Thread(target=worker.serve_forever, daemon=True)
+    thread.start()
+    assert worker.ready.wait(5)
+
+    with pytest.raises(RuntimeError):
+        second = EmbeddingWorker(_CountingEmbedder(), "fake", address=str(address), authkey=b"test")
+        second.serve_forever()
+    worker.close()
+    thread.join(5)
+
+def test_authkey_is_random_and_private(tmp_path, monkeypatch):
+    """Test that the first worker start writes a random key only the user can read."""
+    path = tmp_path / "home" / "embed-worker.key"
+    monkeypatch.delenv("RAG_EMBED_WORKER_AUTHKEY", raising=False)
+    monkeypatch.setenv("RAG_EMBED_WORKER_AUTHKEY_FILE", str(path))
+
+    assert default_authkey() is None
+    key = default_authkey(create=True)
+
+    assert len(key) == 64 and path.read_bytes() == key
+    assert default_authkey() == key and default_authkey(create=True) == key
+    if sys.platform != "win32":
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    monkeypatch.setenv("RAG_EMBED_WORKER_AUTHKEY", "from-env")
+    assert default_authkey() == b"from-env"
+
+@pytest.mark.skipif(sys.platform == "win32", reason="named pipes have no file mode")
+def test_worker_socket_is_private(worker):
+    """Test that other users cannot connect to the worker socket."""
+    assert stat.S_IMODE(os.stat(worker.address).st_mode) == 0o600
+
+def test_remote_embedder_without_key_uses_fallback(worker, tmp_path, monkeypatch):
+    """Test that a client falls back when no worker key was ever generated."""
+    monkeypatch.delenv("RAG_EMBED_WORKER_AUTHKEY", raising=False)
+    monkeypatch.setenv("RAG_EMBED_WORKER_AUTHKEY_FILE", str(tmp_path / "missing.key"))
+    loaded = []
+
+    client = RemoteEmbedder("fake", _fallback(loaded), address=worker.address)
+
+    assert not client.uses_worker
+    client.embed_documents(["local"])
+    assert len(loaded) == 1 and worker.batcher.embedder.calls == 0
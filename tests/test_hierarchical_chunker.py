@@ -0,0 +1,61 @@
+from rag.chunking.hierarchical_chunker import HierarchicalChunker
+from rag.core.models import Document
+from rag.store.parent_store import ParentStore
+
+CONTENT = "\n\n".join(
+    f"Section {i}. " + " ".join(f"sentence {i}-{j} about quarterly revenue." for j in range(20))
+    for i in range(5)
+)
+
+def test_hierarchical_chunker_builds_two_levels():
+    """Test that every child references an existing parent."""
+    chunker = HierarchicalChunker(chunk_size=200, chunk_overlap=20, parent_chunk_size=1000)
+    doc = Document(id="doc", content=CONTENT, metadata={"source": "report.txt"})
+
+    parents, children = chunker.chunk_hierarchy(doc)
+
+    parent_ids = {parent.id for parent in parents}
+    assert len(children) > len(parents) > 1
+    assert all(parent.metadata["hierarchy_level"] == "parent" for parent in parents)
+    assert all(child.metadata["parent_id"] in parent_ids for child in children)
+    assert all(len(child.content) <= 200 for child in children)
+
+def test_hierarchical_chunker_child_offsets():
+    """Test that child offsets point into the original document."""
+    chunker = HierarchicalChunker(chunk_size=200, chunk_overlap=0, parent_chunk_size=1000)
+    doc = Document(id="doc", content=CONTENT, metadata={})
+
+    _, children = chunker.chunk_hierarchy(doc)
+
+    for child in children:
+        start, end = child.metadata["start_index"], child.metadata["end_index"]
+        assert doc.content[start:end] == child.content
+
+def test_hierarchical_chunker_chunk_returns_both_levels():
+    """Test that chunk() returns parents followed by children."""
+    chunker = HierarchicalChunker(chunk_size=200, chunk_overlap=0, parent_chunk_size=1000)
+    doc = Document(id="doc", content=CONTENT, metadata={})
+
+    chunks = chunker.chunk(doc)
+    levels = [chunk.metadata["hierarchy_level"] for chunk in chunks]
+
+    assert levels == sorted(levels, reverse=True)
+
+def test_parent_store_roundtrip(tmp_path):
+    """Test storing and fetching parent chunks by id."""
+    store = ParentStore(persist_directory=str(tmp_path))
+    store.store_parents(
+        ids=["p1", "p2"],
+        contents=["parent one", "parent two"],
+        metadatas=[{"source": "a.pdf", "page_number": 1}, {"source": "b.pdf"}]
+    )
+
+    parents = store.get_parents(["p2", "missing", "p1"])
+
+    assert [parent["id"] for parent in parents] == ["p2", "p1"]
+    assert parents[1]["metadata"]["page_number"] == 1
+    assert store.count() == 2
+
+    store.clear()
+    assert store.count() == 0
+    store.close()
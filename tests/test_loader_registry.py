@@ -0,0 +1,99 @@
+import subprocess
+import sys
+
+import pytest
+
+from rag.ingestion.document_loader import DocumentLoader
+from rag.ingestion.loader_registry import LoaderRegistry, create_default_registry
+
+
+def test_loader_registry_imports_factories_lazily():
+    """Test that factories are only imported when a file of their type is loaded."""
+    registry = LoaderRegistry()
+    registry.register("rag_missing_plugin.loaders:make_loader", [".eml"], ["message/rfc822"])
+    registry.register(lambda path, **options: ("loader", path.name, options), [".note"])
+
+    assert registry.get_factory("mail.txt") is None
+    assert registry.get_loader("a.note", window=3) == ("loader", "a.note", {"window": 3})
+    with pytest.raises(ModuleNotFoundError):
+        registry.get_factory("mail.eml")
+
+def test_loader_registry_falls_back_to_mime_type():
+    """Test that files without a known extension are matched by MIME type."""
+    registry = create_default_registry()
+
+    assert registry.get_factory("export", mime_type="text/csv").__name__ == "csv_loader"
+    assert registry.get_factory("page.xhtml", mime_type="text/html").__name__ == "html_loader"
+    assert registry.get_factory("archive.zip") is None
+    assert {".pdf", ".docx", ".xlsx", ".csv", ".html"} <= set(registry.extensions)
+
+def test_document_loader_import_is_light():
+    """Test that importing the loader does not import the PDF, OCR and vision stacks."""
+    heavy = ["pdfplumber", "pypdfium2", "PIL", "litellm", "azure", "docx", "openpyxl",
+             "rag.llm.vision_model"]
+    code = ("import sys, rag.ingestion, rag.ingestion.document_loader; "
+            f"print([m for m in {heavy!r} if m in sys.modules])")
+
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "[]"
+
+def test_csv_loader(tmp_path):
+    """Test that CSV rows become documents."""
+    path = tmp_path / "customers.csv"
+    path.write_text("name,city\nAda,London\nGrace,Arlington\n", encoding="utf-8")
+
+    documents = DocumentLoader().load_documents(path)
+
+    assert [doc.page_content for doc in documents] == [
+        "name: Ada\ncity: London", "name: Grace\ncity: Arlington"
+    ]
+
+def test_docx_loader(tmp_path):
+    """Test that headings and tables of Word documents are kept as Markdown."""
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_heading("Annual Report", level=1)
+    document.add_paragraph("Revenue grew.")
+    table = document.add_table(rows=2, cols=2)
+    for row, values in zip(table.rows, [["Year", "Revenue"], ["2024", "100"]]):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    path = tmp_path / "report.docx"
+    document.save(path)
+
+    documents = DocumentLoader().load_documents(path)
+
+    assert len(documents) == 1
+    assert documents[0].page_content == (
+        "# Annual Report\n\nRevenue grew.\n\n| Year | Revenue |\n| --- | --- |\n| 2024 | 100 |"
+    )
+    assert documents[0].metadata["has_tables"] is True
+
+def test_xlsx_loader_chunks_rows_with_header(tmp_path):
+    """Test that worksheets are loaded in row blocks and chunked as tables."""
+    openpyxl = pytest.importorskip("openpyxl")
+    from rag.ingestion.office_loaders import XlsxLoader
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Sales"
+    sheet.append(["Region", "Amount"])
+    for i in range(1, 6):
+        sheet.append([f"Region {i}", i * 10])
+        if i == 3:
+            sheet.append([None, None])
+    path = tmp_path / "sales.xlsx"
+    workbook.save(path)
+
+    documents = list(XlsxLoader(path, rows_per_document=2).lazy_load())
+
+    rows = [(doc.metadata["row_start"], doc.metadata["row_end"]) for doc in documents]
+    assert rows == [(2, 3), (4, 6), (7, 7)]
+    assert documents[0].page_content == (
+        "Sheet: Sales\n\n| Region | Amount |\n| --- | --- |\n| Region 1 | 10 |\n| Region 2 | 20 |"
+    )
+    chunks = DocumentLoader().chunk_document(documents[1], chunk_size=1000, chunk_overlap=0)
+    assert chunks[0].metadata["chunker_type"] == "TableChunker"
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
+from rag.embedding.embeddings import create_embedding_model
+from rag.embedding.local_embedder import LocalEmbeddingEngine
+
+VOCAB = ["[PAD]", "[UNK]", "alpha", "beta", "gamma", "delta", "epsilon"]
+
+class _OneHotSession:
+    """ONNX Runtime session stand-in whose token states are one-hot vectors."""
+
+    def __init__(self):
+        self.batch_shapes = []
+        self.feeds = []
+
+    def get_inputs(self):
+        names = ("input_ids", "attention_mask", "token_type_ids")
+        return [SimpleNamespace(name=name) for name in names]
+
+    def run(self, output_names, feeds):
+        self.batch_shapes.append(feeds["input_ids"].shape)
+        self.feeds.append(feeds)
+        return [np.eye(len(VOCAB), dtype=np.float64)[feeds["input_ids"]]]
+
+def _tokenizer():
+    tokenizer = Tokenizer(WordLevel({word: i for i, word in enumerate(VOCAB)}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    return tokenizer
+
+def _engine(session, **kwargs):
+    return LocalEmbeddingEngine(session=session, tokenizer=_tokenizer(), **kwargs)
+
+def test_local_embedder_mean_pools_without_padding():
+    """Test that padding tokens do not contribute to the embeddings."""
+    engine = _engine(_OneHotSession(), normalize=False)
+
+    embeddings = engine.embed_documents(["alpha", "beta beta gamma"])
+
+    assert embeddings.dtype == np.float32
+    assert embeddings.flags["C_CONTIGUOUS"]
+    assert embeddings.shape == (2, len(VOCAB))
+    np.testing.assert_allclose(embeddings[0], np.eye(len(VOCAB))[2])
+    np.testing.assert_allclose(embeddings[1, 3:5], [2 / 3, 1 / 3], rtol=1e-6)
+
+def test_local_embedder_buckets_by_length():
+    """Test that batches hold texts of similar length and results keep input order."""
+    texts = ["alpha " * 8, "beta", "gamma " * 7, "delta", "epsilon " * 6, "alpha beta"]
+    session = _OneHotSession()
+    engine = _engine(session, batch_size=3)
+
+    bucketed = engine.embed_documents(texts)
+
+    assert session.batch_shapes == [(3, 2), (3, 8)]
+    assert "token_type_ids" in session.feeds[0]
+    one_by_one = np.stack([_engine(_OneHotSession()).embed_query(text) for text in texts])
+    np.testing.assert_allclose(bucketed, one_by_one, rtol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(bucketed, axis=1), 1.0, rtol=1e-6)
+
+def test_local_embedder_truncates_long_texts():
+    """Test that texts are cut to max_length tokens."""
+    session = _OneHotSession()
+    engine = _engine(session, max_length=4)
+
+    engine.embed_documents(["alpha " * 100])
+
+    assert session.batch_shapes == [(1, 4)]
+
+def test_local_embedder_empty_input():
+    """Test that no texts give an empty matrix of the model dimension."""
+    engine = _engine(_OneHotSession())
+
+    assert engine.embed_documents([]).shape == (0, len(VOCAB))
+
+def test_create_embedding_model_rejects_unknown_backend():
+    """Test the embedder selection."""
+    with pytest.raises(ValueError):
+        create_embedding_model("word2vec")
+
+def test_ingest_batch_embeds_in_one_call():
+    """Test that the CLI embeds and stores a batch of chunks with one call each."""
+    from langchain_core.documents import Document
+
+    from rag.cli.main import _ingest_batch
+
+    calls = []
+    store = SimpleNamespace(store_batch=lambda batch, documents: calls.append((batch, documents)))
+    chunks = [Document(page_content=text, metadata={"chunk_id": f"c{i}"})
+              for i, text in enumerate(["alpha beta", "gamma", "delta epsilon alpha"])]
+
+    stored = _ingest_batch(chunks, store, _engine(_OneHotSession()))
+
+    assert stored == chunks
+    assert len(calls) == 1
+    batch, documents = calls[0]
+    assert batch.ids == ["c0", "c1", "c2"]
+    assert batch.values.shape == (3, len(VOCAB))
+    assert documents == ["alpha beta", "gamma", "delta epsilon alpha"]
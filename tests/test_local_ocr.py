@@ -0,0 +1,95 @@
+import shutil
+
+import pytest
+
+from rag.bench import ocr as ocr_bench
+from rag.ingestion.ocr_cache import OCRCache
+
+
+def test_edit_distance():
+    """Test the bit-parallel edit distance on characters and words."""
+    assert ocr_bench.edit_distance("kitten", "sitting") == 3
+    assert ocr_bench.edit_distance("", "abc") == 3
+    assert ocr_bench.edit_distance("abc", "abc") == 0
+    assert ocr_bench.edit_distance("the quick fox".split(), "the quack fox jumps".split()) == 2
+    assert ocr_bench.edit_distance("a" * 500 + "b", "a" * 500 + "c") == 1
+
+def test_error_rates_ignore_whitespace_layout():
+    """Test that line breaks and spacing differences are not counted as errors."""
+    rates = ocr_bench.error_rates("Invoice  No. 42\nTotal: 100", "Invoice No. 42 Total: 10O")
+
+    assert rates == {"char_errors": 1, "chars": 25, "word_errors": 1, "words": 5}
+
+def test_load_reference_from_ocr_cache(tmp_path):
+    """Test that recorded Azure page ranges are merged into one reference per file."""
+    scan = tmp_path / "scan.pdf"
+    scan.write_bytes(b"%PDF scan")
+    cache = OCRCache(str(tmp_path / "cache.sqlite3"))
+    file_hash = OCRCache.file_hash(scan)
+    third = {"page_number": 3, "lines": [{"content": "third"}]}
+    first = {"page_number": 1, "lines": [{"content": "first"}]}
+    second = {"page_number": 2, "lines": [{"content": "a"}, {"content": "b"}]}
+    cache.put(file_hash, "prebuilt-read", "3-3", [third])
+    cache.put(file_hash, "prebuilt-read", "1-2", [first, second])
+
+    assert ocr_bench.load_reference(cache, scan) == {1: "first", 2: "a\nb", 3: "third"}
+    assert ocr_bench.load_reference(cache, scan, model_id="prebuilt-layout") is None
+    cache.close()
+
+def test_tesseract_processor_requires_pytesseract(monkeypatch):
+    """Test that a missing optional dependency is reported on construction."""
+    import importlib.util
+
+    from rag.ingestion.local_ocr import TesseractOCRProcessor
+
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(ImportError, match="pytesseract"):
+        TesseractOCRProcessor()
+
+def test_tesseract_processor_recognizes_pdf_pages(make_pdf):
+    """Test local OCR of a rendered PDF in worker processes."""
+    pytest.importorskip("pytesseract")
+    if shutil.which("tesseract") is None:
+        pytest.skip("Tesseract binary not installed")
+    from rag.ingestion.local_ocr import TesseractOCRProcessor
+
+    path = make_pdf([{"lines": [f"Invoice number {i}"]} for i in range(1, 4)])
+    processor = TesseractOCRProcessor(dpi=200, max_workers=2, pages_per_task=1)
+
+    responses = list(processor.stream_pages([path]))
+
+    assert [response.page_number for response in responses] == [1, 2, 3]
+    assert "Invoice" in responses[0].text
+    assert responses[0].unit == "inch"
+    assert processor.process(path).startswith("Page 1\n\n")
+
+def _image_to_data(image, **kwargs):
+    """Tesseract output for two words on one line, one on the next and an empty box."""
+    return {
+        "text": ["Invoice", f"{image.getpixel((0, 0))}", "", "Total"],
+        "conf": ["90", "70", "-1", "80"],
+        "block_num": [1, 1, 1, 1], "par_num": [1, 1, 1, 1], "line_num": [1, 1, 1, 2],
+        "left": [10, 60, 0, 10], "top": [20, 22, 0, 50],
+        "width": [40, 20, 0, 30], "height": [10, 10, 0, 12],
+    }
+
+def test_tesseract_frames_are_grouped_into_lines(tmp_path, monkeypatch):
+    """Test line grouping, confidences and frame seeking of a multi-page TIFF without Tesseract."""
+    pytesseract = pytest.importorskip("pytesseract")
+    from PIL import Image
+
+    from rag.ingestion.local_ocr import _recognize_pages
+
+    monkeypatch.setattr(pytesseract, "image_to_data", _image_to_data)
+    path = tmp_path / "scan.tif"
+    frames = [Image.new("L", (100, 80), color=shade) for shade in (0, 1, 2, 3)]
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    options = {"dpi": 300, "lang": "eng", "config": "", "tesseract_cmd": None}
+
+    responses = _recognize_pages(options, path, 2, 4)
+
+    assert [response.page_number for response in responses] == [3, 4]
+    assert [response.text for response in responses] == ["Invoice 2\nTotal", "Invoice 3\nTotal"]
+    assert responses[0].confidence == pytest.approx(0.8)
+    assert responses[0].lines[0].polygon == [10, 20, 80, 20, 80, 32, 10, 32]
+    assert (responses[0].width, responses[0].height, responses[0].unit) == (100, 80, "pixel")
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from rag.embedding.micro_batcher import QueryMicroBatcher
+
+
+class _SlowEmbedder:
+    """Embedder stand-in with a fixed cost per call, which records its batches."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return [[float(len(text)), float(text.count(" "))] for text in texts]
+
+def test_micro_batcher_coalesces_concurrent_queries():
+    """Test that concurrent callers share embedding calls and get their own rows."""
+    embedder = _SlowEmbedder()
+    texts = [f"question {'x' * i}" for i in range(32)]
+
+    with QueryMicroBatcher(embedder, max_batch_size=8, max_wait=0.01) as batcher:
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            embeddings = list(executor.map(batcher.embed_query, texts))
+
+    assert [embedding[0] for embedding in embeddings] == [len(text) for text in texts]
+    assert all(embedding.dtype == np.float32 for embedding in embeddings)
+    assert len(embedder.batches) < len(texts)
+    assert max(len(batch) for batch in embedder.batches) <= 8
+    assert batcher.stats["queries"] == 32
+
+def test_micro_batcher_single_query_waits_at_most_max_wait():
+    """Test that a lone query is not held back longer than max_wait."""
+    embedder = _SlowEmbedder(delay=0.0)
+    with QueryMicroBatcher(embedder, max_wait=0.005) as batcher:
+        start = time.monotonic()
+        batcher.embed_query("alone")
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.1
+    assert embedder.batches == [["alone"]]
+
+def test_micro_batcher_deduplicates_and_serves_async_callers():
+    """Test identical questions are embedded once and coroutines can await results."""
+    embedder = _SlowEmbedder(delay=0.01)
+
+    async def ask(batcher):
+        texts = ["a b", "a b", "c"]
+        return await asyncio.gather(*(batcher.embed_query_async(text) for text in texts))
+
+    with QueryMicroBatcher(embedder, max_wait=0.02) as batcher:
+        results = asyncio.run(ask(batcher))
+
+    assert [result[0] for result in results] == [3.0, 3.0, 1.0]
+    assert embedder.batches == [["a b", "c"]]
+
+def test_micro_batcher_propagates_errors():
+    """Test that a failing embedding call fails every waiting caller."""
+    class _FailingEmbedder:
+        def embed_documents(self, texts):
+            raise RuntimeError("embedding service down")
+
+    with QueryMicroBatcher(_FailingEmbedder()) as batcher:
+        with pytest.raises(RuntimeError, match="service down"):
+            batcher.embed_query("question")
+
+    with pytest.raises(RuntimeError):
+        batcher.submit("after close")
+
+def test_micro_batcher_survives_malformed_embeddings():
+    """Test that a bad embedder result fails its batch and later queries are still served."""
+    class _ShortEmbedder:
+        def __init__(self):
+            self.calls = 0
+
+        def embed_documents(self, texts):
+            self.calls += 1
+            if self.calls == 1:
+                return []
+            if self.calls == 2:
+                return [["not", "a", "number"] for _ in texts]
+            return [[1.0, 2.0] for _ in texts]
+
+    with QueryMicroBatcher(_ShortEmbedder()) as batcher:
+        with pytest.raises(ValueError, match="0 embeddings for 1 queries"):
+            batcher.embed_query("first", timeout=5)
+        with pytest.raises(ValueError):
+            batcher.embed_query("second", timeout=5)
+
+        np.testing.assert_array_equal(batcher.embed_query("third", timeout=5), [1.0, 2.0])
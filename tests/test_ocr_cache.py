@@ -0,0 +1,46 @@
+import json
+import zlib
+
+from rag.ingestion.ocr_cache import OCRCache
+
+
+def _pages(count: int, text: str = "line"):
+    return [{"page_number": i, "lines": [{"content": f"{text} {i}", "polygon": [0.5, 1.0]}]}
+            for i in range(1, count + 1)]
+
+def test_ocr_cache_round_trip(tmp_path):
+    """Test that entries are keyed by file content, model and page range."""
+    cache = OCRCache(str(tmp_path / "cache.sqlite3"))
+    first = tmp_path / "a.pdf"
+    copy = tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF scanned")
+    copy.write_bytes(b"%PDF scanned")
+
+    cache.put(OCRCache.file_hash(first), "prebuilt-read", "1-2", _pages(2))
+
+    assert cache.get(OCRCache.file_hash(copy), "prebuilt-read", "1-2") == _pages(2)
+    assert cache.get(OCRCache.file_hash(copy), "prebuilt-read", "3-4") is None
+    assert cache.get(OCRCache.file_hash(copy), "prebuilt-layout", "1-2") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+
+    reopened = OCRCache(str(tmp_path / "cache.sqlite3"))
+    assert reopened.count() == 1
+    reopened.close()
+
+def test_ocr_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache stays within its size limit by dropping old entries."""
+    entry_size = len(zlib.compress(json.dumps(_pages(20, "a"), separators=(",", ":")).encode(), 6))
+    cache = OCRCache(str(tmp_path / "cache.sqlite3"), max_bytes=int(entry_size * 2.5))
+
+    cache.put("a", "prebuilt-read", None, _pages(20, "a"))
+    cache.put("b", "prebuilt-read", None, _pages(20, "b"))
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a", "prebuilt-read") is not None
+    cache.put("c", "prebuilt-read", None, _pages(20, "c"))
+
+    assert cache.get("b", "prebuilt-read") is None
+    assert cache.get("a", "prebuilt-read") is not None
+    assert cache.get("c", "prebuilt-read") is not None
+    assert cache.size_bytes() <= cache.max_bytes
+    cache.close()
@@ -0,0 +1,65 @@
+from rag.bench.corpora import generate_paged_document
+from rag.chunking.page_wise_chunker import PageWiseChunker
+from rag.core.models import Document
+
+
+def test_page_wise_chunker_detects_all_marker_types():
+    """Test that every marker type is found regardless of its order in the text."""
+    pages = ["A" * 20, "B" * 20, "C" * 20, "D" * 20]
+    content = pages[0] + "\n\nPage " + pages[1] + "\f" + pages[2] + "\n\n---\n\n" + pages[3]
+    chunker = PageWiseChunker(min_page_size=10)
+
+    chunks = chunker.chunk(Document(id="doc", content=content, metadata={}))
+
+    assert len(chunks) == 4
+    assert [c.metadata["page_number"] for c in chunks] == [1, 2, 3, 4]
+    assert "C" * 20 in chunks[2].content
+
+def test_page_wise_chunker_does_not_mutate_metadata():
+    """Test that explicit page markers are used without modifying the document."""
+    metadata = {"page_markers": [30]}
+    content = "x" * 30 + "y" * 30
+    chunker = PageWiseChunker(min_page_size=10)
+
+    chunks = chunker.chunk(Document(id="doc", content=content, metadata=metadata))
+
+    assert [c.content for c in chunks] == ["x" * 30, "y" * 30]
+    assert metadata == {"page_markers": [30]}
+
+def test_page_wise_chunker_merges_small_pages():
+    """Test that small pages are merged with the next page instead of dropped."""
+    content = "tiny\fanother tiny\f" + "z" * 200 + "\f" + "w" * 200 + "\fend"
+    chunker = PageWiseChunker(min_page_size=100)
+
+    chunks = chunker.chunk(Document(id="doc", content=content, metadata={}))
+
+    assert len(chunks) == 2
+    assert chunks[0].content.startswith("tiny")
+    assert chunks[0].metadata["page_number"] == 1
+    assert chunks[0].metadata["page_end_number"] == 3
+    # The trailing small page joins the preceding one
+    assert chunks[1].content.endswith("end")
+    assert chunks[1].metadata["page_end_number"] == 5
+    assert "".join(c.content for c in chunks).replace("\f", "") == content.replace("\f", "")
+
+def test_page_wise_chunker_uses_loader_page_number():
+    """Test that page numbers from a page-wise loader are propagated."""
+    doc = Document(id="doc", content="Short page.\fStill the same PDF page.",
+                   metadata={"page_number": 7, "source": "report.pdf"})
+    chunker = PageWiseChunker(min_page_size=200)
+
+    chunks = chunker.chunk(doc)
+
+    assert len(chunks) == 1
+    assert chunks[0].metadata["page_number"] == 7
+    assert chunks[0].content == doc.content
+
+def test_page_wise_chunker_large_document():
+    """Test chunking a generated 1,000-page document."""
+    doc = generate_paged_document(pages=1000, words_per_page=50)
+    chunker = PageWiseChunker(min_page_size=100)
+
+    chunks = chunker.chunk(doc)
+
+    assert len(chunks) == 1000
+    assert chunks[-1].metadata["page_number"] == 1000
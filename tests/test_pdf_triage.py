@@ -0,0 +1,46 @@
+import pypdfium2 as pdfium
+
+from rag.ingestion.pdf_triage import PageProfile, classify_page, measure_ink_coverage, profile_page
+
+
+def _profile(**overrides) -> PageProfile:
+    values = dict(page_number=1, text="", word_count=0, char_count=0, path_count=0,
+                  image_count=0, image_area_ratio=0.0, ink_coverage=0.0)
+    values.update(overrides)
+    return PageProfile(**values)
+
+def test_measure_ink_coverage(make_pdf):
+    """Test that ink coverage separates blank, title and dense pages."""
+    dense_lines = [" ".join(["word"] * 15)] * 50
+    pages = [{}, {"lines": ["Annual Report 2024"]}, {"lines": dense_lines}]
+    pdf = pdfium.PdfDocument(make_pdf(pages))
+    try:
+        coverages = [measure_ink_coverage(page) for page in pdf]
+    finally:
+        pdf.close()
+
+    assert coverages[0] == 0.0
+    assert 0.0 < coverages[1] < 0.01
+    assert coverages[2] > 0.1
+
+def test_classify_page():
+    """Test the page classes used to decide on full-page vision calls."""
+    assert classify_page(_profile(word_count=150, ink_coverage=None)) == "text"
+    assert classify_page(_profile()) == "blank"
+    # A scanned separator sheet: a full-page image without ink
+    separator = _profile(image_count=1, image_area_ratio=1.0, ink_coverage=0.0002)
+    assert classify_page(separator) == "blank"
+    assert classify_page(_profile(image_count=1, image_area_ratio=0.9, ink_coverage=0.2)) == "scan"
+    assert classify_page(_profile(word_count=5, path_count=40, ink_coverage=0.03)) == "graphic"
+    assert classify_page(_profile(word_count=3, ink_coverage=0.002)) == "sparse"
+
+def test_profile_page_without_render(make_pdf):
+    """Test that profiling alone leaves the ink coverage unmeasured."""
+    pdf = pdfium.PdfDocument(make_pdf([{"lines": ["Title"]}]))
+    try:
+        profile = profile_page(pdf[0], 1)
+    finally:
+        pdf.close()
+
+    assert profile.ink_coverage is None
+    assert classify_page(profile) == "sparse"
@@ -0,0 +1,167 @@
+import stat
+import threading
+import urllib.request
+
+import numpy as np
+import pytest
+
+from rag.core import tracing
+from rag.core.models import VectorBatch
+from rag.server.client import ServerClient, ServerError
+from rag.server.server import create_server
+from rag.server.service import QueryService
+from rag.store.chroma_store import ChromaStore
+
+TOPICS = ["cats", "dogs", "fish", "birds"]
+
+class _TopicEmbedder:
+    """One-hot embedding of the first topic word in a text."""
+
+    def embed_documents(self, texts):
+        vectors = np.full((len(texts), len(TOPICS)), 0.01, dtype=np.float32)
+        for row, text in enumerate(texts):
+            for column, topic in enumerate(TOPICS):
+                if topic in text:
+                    vectors[row, column] = 1.0
+                    break
+        return vectors
+
+class _EchoLLM:
+    """Answers with the contents it was given; can be held to keep a query busy."""
+
+    def __init__(self, model):
+        self.model = model
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def generate_answer(self, question, context_docs):
+        self.started.set()
+        self.release.wait(5)
+        return {"answer": f"{self.model}: " + " | ".join(doc.page_content for doc in context_docs),
+                "sources": [doc.metadata.get("source", "unknown") for doc in context_docs]}
+
+def _ingest(persist_directory, topics):
+    store = ChromaStore(str(persist_directory))
+    texts = [f"All about {topic}" for topic in topics]
+    store.store_batch(
+        VectorBatch(ids=topics, values=_TopicEmbedder().embed_documents(texts),
+                    metadatas=[{"source": f"{topic}.md"} for topic in topics]),
+        documents=texts
+    )
+
+@pytest.fixture
+def service(tmp_path):
+    _ingest(tmp_path, ["cats", "dogs"])
+    service = QueryService(_TopicEmbedder(), persist_directory=str(tmp_path), model="fake",
+                           llm_factory=_EchoLLM, reload_interval=0)
+    yield service
+    service.close()
+
+@pytest.fixture
+def serve(service):
+    servers = []
+
+    def start(**kwargs):
+        server = create_server(service, port=0, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return ServerClient(server.url, timeout=10)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def test_service_answers_from_retrieved_chunks(service):
+    """Test retrieval and generation with the kept-open components."""
+    response = service.query("Tell me about dogs", top_k=1)
+
+    assert response["answer"] == "fake: All about dogs"
+    assert response["sources"] == ["dogs.md"]
+    assert service.query("cats", top_k=1, model="other")["answer"].startswith("other:")
+    assert service.stats["queries"] == 2
+
+@pytest.mark.parametrize("unix_socket", [False, True])
+def test_server_query_api(serve, tmp_path, unix_socket):
+    """Test the query, retrieve and health endpoints over TCP and a Unix socket."""
+    client = serve(socket_path=str(tmp_path / "rag.sock") if unix_socket else None)
+
+    response = client.query("What do cats eat?", top_k=1)
+    assert response["answer"] == "fake: All about cats"
+    results = client.retrieve("dogs", top_k=2)
+    assert [result["id"] for result in results] == ["dogs", "cats"]
+    assert client.health()["status"] == "ok"
+    with pytest.raises(ServerError) as error:
+        client.query(" ")
+    assert error.value.status == 400
+
+def test_server_unix_socket_is_private(serve, tmp_path):
+    """Test that only the owner can connect to the Unix socket."""
+    socket_path = tmp_path / "rag.sock"
+    serve(socket_path=str(socket_path))
+
+    assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+
+def test_service_reloads_changed_collection(service, tmp_path):
+    """Test that vectors ingested after start-up are found after a reload."""
+    assert service.retrieve("fish", top_k=1)[0]["id"] != "fish"
+
+    _ingest(tmp_path, ["fish"])
+    results = service.retrieve("fish", top_k=1)
+
+    assert results[0]["id"] == "fish"
+    assert service.generation == 1
+    # Unchanged files do not reopen the collection
+    service.retrieve("fish", top_k=1)
+    assert service.generation == 1
+
+def test_server_rejects_queries_beyond_concurrency_limit(tmp_path, serve):
+    """Test that a query waiting longer than the queue timeout gets a 503."""
+    _ingest(tmp_path, ["cats"])
+    service = QueryService(_TopicEmbedder(), persist_directory=str(tmp_path), model="fake",
+                           llm_factory=_EchoLLM, max_concurrency=1, queue_timeout=0.05)
+    llm = service.llm_client()
+    llm.release.clear()
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = ServerClient(server.url, timeout=10)
+    try:
+        first = threading.Thread(target=client.query, args=("cats",))
+        first.start()
+        assert llm.started.wait(5)
+
+        with pytest.raises(ServerError) as error:
+            client.query("cats")
+        assert error.value.status == 503
+
+        llm.release.set()
+        first.join(5)
+        assert service.stats["rejected"] == 1
+    finally:
+        llm.release.set()
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+def test_server_exposes_query_span_metrics(tmp_path):
+    """Test that served queries are traced by phase and exposed at /metrics."""
+    _ingest(tmp_path, ["cats", "dogs"])
+    histograms = tracing.add_exporter(tracing.LatencyHistograms())
+    service = QueryService(
+        _TopicEmbedder(), persist_directory=str(tmp_path), model="fake", llm_factory=_EchoLLM
+    )
+    server = create_server(service, port=0, metrics=histograms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        service.query("cats", top_k=1)
+        with urllib.request.urlopen(f"{server.url}/metrics", timeout=10) as response:
+            text = response.read().decode()
+    finally:
+        tracing.shutdown()
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    for name in ("query", "embed", "search"):
+        assert f'rag_span_duration_seconds_count{{span="{name}"}} 1' in text
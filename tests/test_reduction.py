@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from rag.bench import reduction as reduction_bench
+from rag.core.models import VectorBatch
+from rag.embedding.reduction import MatryoshkaReducer, PCAReducer, load_reducer
+from rag.store.chroma_store import ChromaStore
+from rag.store.reduced_store import ReducedVectorStore
+
+
+def _low_rank_vectors(n=400, dimensions=64, rank=8, seed=0):
+    """Embeddings that live close to a low-dimensional subspace."""
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(n, rank))
+    vectors = latent @ rng.normal(size=(rank, dimensions)) + 0.05 * rng.normal(size=(n, dimensions))
+    return vectors.astype(np.float32)
+
+def test_matryoshka_truncates_and_normalizes():
+    """Test that truncation keeps the leading dimensions at unit length."""
+    reducer = MatryoshkaReducer(2)
+
+    reduced = reducer.transform(np.array([[3.0, 4.0, 12.0], [1.0, 0.0, 5.0]]))
+
+    np.testing.assert_allclose(reduced, [[0.6, 0.8], [1.0, 0.0]], rtol=1e-6)
+    assert reduced.dtype == np.float32
+    with pytest.raises(ValueError):
+        MatryoshkaReducer(8).transform(np.ones(4))
+
+def test_pca_reducer_save_and_load(tmp_path):
+    """Test that a fitted projection is restored from disk."""
+    vectors = _low_rank_vectors()
+    reducer = PCAReducer(8).fit(vectors)
+    path = tmp_path / "reducer.npz"
+
+    reducer.save(path)
+    loaded = load_reducer(path)
+
+    assert isinstance(loaded, PCAReducer) and loaded.dimensions == 8
+    np.testing.assert_allclose(
+        loaded.transform(vectors[:5]), reducer.transform(vectors[:5]), rtol=1e-5
+    )
+
+def test_reduction_recall_report():
+    """Test that PCA keeps recall on low-rank data and re-scoring recovers truncation losses."""
+    vectors = _low_rank_vectors()
+
+    report = reduction_bench.run(vectors, dimensions=[4, 8], k=10, queries=50)
+
+    results = {(r["method"], r["dimensions"]): r for r in report["results"]}
+    assert results[("pca", 8)]["recall_at_k"] > 0.9
+    assert results[("pca", 8)]["bytes_per_vector"] == 32
+    truncated = results[("matryoshka", 4)]
+    assert truncated["recall_at_k"] < 0.9
+    assert truncated["recall_at_k_rescored"] > truncated["recall_at_k"]
+
+def test_reduced_store_fits_pca_and_rescores(tmp_path):
+    """Test ingesting into a reduced collection and searching it with re-scoring."""
+    vectors = _low_rank_vectors(n=60)
+    ids = [f"v{i}" for i in range(60)]
+    store = ChromaStore(persist_directory=str(tmp_path))
+    reduced = ReducedVectorStore.open(store, method="pca", dimensions=8, fit_samples=50)
+
+    reduced.store_batch(VectorBatch(ids[:30], vectors[:30]), documents=ids[:30])
+    # Vectors are held back until the reducer is fitted
+    assert store.collection.count() == 0
+    reduced.store_batch(VectorBatch(ids[30:], vectors[30:]), documents=ids[30:])
+    reduced.close()
+
+    assert store.collection.count() == 60
+    reopened = ReducedVectorStore.open(store)
+    assert reopened.reducer.is_fitted and reopened.reducer.dimensions == 8
+    results = reopened.search_vectors(vectors[17], top_k=3)
+    assert results[0]["id"] == "v17"
+    assert results[0]["distance"] == pytest.approx(0.0, abs=1e-5)
+    with pytest.raises(ValueError):
+        ReducedVectorStore.open(store, method="matryoshka", dimensions=8)
+    reopened.close()
+
+def test_reduced_store_not_used_for_full_collections(tmp_path):
+    """Test that collections without a saved reducer are searched as before."""
+    store = ChromaStore(persist_directory=str(tmp_path))
+
+    assert ReducedVectorStore.open(store) is None
+
+def test_reduced_store_metadata_of_held_back_vectors(tmp_path):
+    """Test that metadata changes of held back vectors are stored with their batch."""
+    store = ChromaStore(persist_directory=str(tmp_path))
+    reduced = ReducedVectorStore.open(store, method="pca", dimensions=8, fit_samples=50)
+    vectors = _low_rank_vectors(n=60, dimensions=32)
+    ids = [f"v{i}" for i in range(60)]
+    reduced.store_batch(VectorBatch(ids[:30], vectors[:30], [{"n": i} for i in range(30)]))
+
+    reduced.get_metadatas(["v3"])["v3"]["duplicate_count"] = 2
+    reduced.store_batch(VectorBatch(ids[30:], vectors[30:], [{"n": i} for i in range(30, 60)]))
+
+    assert store.get_metadatas(["v3", "v40"]) == {
+        "v3": {"n": 3, "duplicate_count": 2}, "v40": {"n": 40}
+    }
+    assert reduced.get_metadatas(["v40"]) == {"v40": {"n": 40}}
+    reduced.close()
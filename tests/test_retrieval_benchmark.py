@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+
+from rag.bench import retrieval
+from rag.bench.corpora import generate_labelled_corpus
+from rag.core.models import VectorBatch
+from rag.embedding.embeddings import create_embedding_model
+from rag.embedding.hashing_embedder import HashingEmbedder
+from rag.store.memory_store import InMemoryVectorStore
+
+
+def test_labelled_corpus_answers_every_question_on_its_page():
+    """Test that generated questions point at the one page holding their fact."""
+    pages, questions = generate_labelled_corpus(
+        documents=2, pages=3, facts_per_page=2, words_per_page=50, seed=1
+    )
+
+    assert len(pages) == 6 and len(questions) == 12
+    by_page = {
+        (page.metadata["source"], page.metadata["page_number"]): page.content for page in pages
+    }
+    for question in questions:
+        entity = question["question"].rstrip("?").split()[-1]
+        holding = [key for key, content in by_page.items() if f" of {entity} is " in content]
+        assert holding == [(question["source"], question["page"])]
+    assert generate_labelled_corpus(2, 3, 2, 50, seed=1)[1] == questions
+
+def test_hashing_embedder_is_deterministic_and_lexical():
+    """Test unit-length float32 vectors that are closer for shared words."""
+    embedder = create_embedding_model("hashing", dimension=256)
+    assert isinstance(embedder, HashingEmbedder)
+
+    vectors = embedder.embed_documents(["cash flow forecast", "forecast of cash flow", "tax audit"])
+
+    assert vectors.shape == (3, 256) and vectors.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_array_equal(embedder.embed_query("cash flow forecast"), vectors[0])
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+def test_memory_store_returns_best_matches_first():
+    """Test exact cosine search with Chroma-like results."""
+    store = InMemoryVectorStore()
+    first = VectorBatch(ids=["a", "b"], values=[[1.0, 0.0], [0.6, 0.8]],
+                        metadatas=[{"source": "a.md"}, {"source": "b.md"}])
+    store.store_batch(first, documents=["A", "B"])
+    store.store_batch(VectorBatch(ids=["c"], values=[[0.0, 1.0]], metadatas=[{"source": "c.md"}]))
+
+    results = store.search_vectors(np.array([0.0, 2.0]), top_k=2)
+
+    assert [result["id"] for result in results] == ["c", "b"]
+    assert results[1]["content"] == "B" and results[1]["metadata"] == {"source": "b.md"}
+    assert abs(results[0]["distance"]) < 1e-6
+    assert len(store.search_vectors(np.array([1.0, 0.0]), top_k=10)) == 3
+
+def test_retrieval_benchmark_report():
+    """Test recall, MRR, latency and memory for every store and chunk size."""
+    pages, queries = generate_labelled_corpus(documents=2, pages=4, words_per_page=120)
+
+    report = retrieval.run(pages, queries, HashingEmbedder(), chunk_sizes=[200, 800],
+                           top_k=[1, 5], stores=["memory", "chroma"])
+
+    assert [(r["store"], r["chunk_size"]) for r in report["results"]] == [
+        ("memory", 200), ("memory", 800), ("chroma", 200), ("chroma", 800)]
+    for result in report["results"]:
+        assert result["recall_at_k"]["1"] <= result["recall_at_k"]["5"]
+        assert result["recall_at_k"]["5"] >= 0.8
+        assert result["recall_at_k"]["1"] <= result["mrr"] <= 1.0
+        assert 0 < result["latency_ms"]["p50"] <= result["latency_ms"]["p95"]
+        assert result["queries_per_second"] > 0
+        assert result["memory"]["vector_bytes"] == result["chunks"] * 1024 * 4
+    # The exact search is the reference for Chroma
+    memory, chroma = report["results"][0], report["results"][2]
+    assert chroma["recall_at_k"]["5"] == memory["recall_at_k"]["5"]
+    json.dumps(report)
+
+def test_retrieval_benchmark_main_with_query_set(tmp_path):
+    """Test a labelled query set on loaded files and the recall gate."""
+    documents = tmp_path / "docs"
+    documents.mkdir()
+    (documents / "cats.txt").write_text("Cats sleep sixteen hours a day and hunt mice at night.")
+    (documents / "dogs.txt").write_text("Dogs were domesticated from wolves and love to fetch.")
+    queries = tmp_path / "queries.jsonl"
+    labelled = [
+        {"question": "How long do cats sleep?", "source": "cats.txt"},
+        {"question": "Where do dogs come from? wolves", "source": "docs/dogs.txt"},
+    ]
+    queries.write_text("".join(json.dumps(query) + "\n" for query in labelled))
+    output = tmp_path / "retrieval.json"
+
+    code = retrieval.main(["--queries", str(queries), "--documents", str(documents),
+                           "--chunk-sizes", "100", "--top-k", "1", "--min-recall", "1.0",
+                           "--output", str(output)])
+
+    assert code == 0
+    report = json.loads(output.read_text())
+    assert report["queries"] == 2 and report["embedder"] == "hashing"
+    assert report["results"][0]["recall_at_k"] == {"1": 1.0}
+    assert retrieval.main(["--queries", str(queries)]) == 1
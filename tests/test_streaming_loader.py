@@ -0,0 +1,80 @@
+from rag.bench.corpora import generate_markdown, generate_text
+from rag.ingestion.document_loader import DocumentLoader
+from rag.ingestion.streaming_loader import StreamingMarkdownLoader, StreamingTextLoader
+
+
+def test_streaming_text_loader_windows(tmp_path):
+    """Test that windows cover the file exactly and end at paragraph boundaries."""
+    content = generate_text(50_000, seed=3)
+    path = tmp_path / "export.txt"
+    path.write_text(content, encoding="utf-8")
+
+    windows = list(StreamingTextLoader(path, window_size=4000).lazy_load())
+
+    assert len(windows) > 10
+    assert "".join(window.page_content for window in windows) == content
+    for window in windows:
+        start = window.metadata["window_start"]
+        assert len(window.page_content) <= 4000
+        assert content[start:start + len(window.page_content)] == window.page_content
+    assert all(window.page_content.endswith("\n\n") for window in windows[:-1])
+
+def test_streaming_markdown_loader_cuts_before_headings(tmp_path):
+    """Test that Markdown windows start at headings outside code blocks."""
+    content = generate_markdown(30_000, seed=4)
+    content = content.replace("\n\n", "\n\n```\n# not a heading\n```\n\n", 5)
+    path = tmp_path / "notes.md"
+    path.write_text(content, encoding="utf-8")
+
+    windows = list(StreamingMarkdownLoader(path, window_size=3000).lazy_load())
+
+    assert "".join(window.page_content for window in windows) == content
+    assert all(window.page_content.startswith("#") for window in windows[1:])
+    assert not any(window.page_content.startswith("# not a heading") for window in windows)
+
+def test_streaming_loader_splits_long_lines(tmp_path):
+    """Test that a single line longer than a window is split with correct offsets."""
+    content = "header\n" + "x" * 2500 + "\nfooter\n"
+    path = tmp_path / "minified.log"
+    path.write_text(content, encoding="utf-8")
+
+    windows = list(StreamingTextLoader(path, window_size=1000).lazy_load())
+
+    assert [len(window.page_content) for window in windows] == [7, 1000, 1000, 508]
+    assert [window.metadata["window_start"] for window in windows] == [0, 7, 1007, 2007]
+
+def test_document_loader_chunk_offsets_are_global(tmp_path):
+    """Test that chunk offsets of windowed documents point into the whole file."""
+    content = generate_text(20_000, seed=5)
+    path = tmp_path / "large.txt"
+    path.write_text(content, encoding="utf-8")
+    loader = DocumentLoader(text_window_size=5000)
+
+    documents = list(loader.iter_documents(path))
+    chunks = [chunk for document in documents for chunk in loader.chunk_document(document, 500, 50)]
+
+    assert len(documents) > 1
+    assert chunks[-1].metadata["end_index"] > 15_000
+    for chunk in chunks:
+        start, end = chunk.metadata["start_index"], chunk.metadata["end_index"]
+        assert content[start:end] == chunk.page_content
+
+def test_streaming_loader_memory_is_bounded_by_window(tmp_path):
+    """Test that peak memory depends on the window size, not the file size."""
+    import tracemalloc
+
+    path = tmp_path / "big.txt"
+    with open(path, "w", encoding="utf-8") as file:
+        for seed in range(40):
+            file.write(generate_text(100_000, seed=seed))
+
+    tracemalloc.start()
+    try:
+        windows = StreamingTextLoader(path, window_size=32_000).lazy_load()
+        total = sum(len(window.page_content) for window in windows)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert total >= 4_000_000
+    assert peak < 1_000_000
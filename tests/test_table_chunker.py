@@ -0,0 +1,74 @@
+from rag.chunking.chunker_factory import ChunkerFactory
+from rag.chunking.table_chunker import TableChunker
+from rag.core.models import Chunk, Document
+
+TABLE = "\n".join(
+    ["| Year | Revenue |", "| --- | --- |"]
+    + [f"| {2000 + i} | {i * 100} |" for i in range(20)]
+)
+
+def _make_document(content: str) -> Document:
+    return Document(id="doc-id", content=content, metadata={"source": "report.pdf"})
+
+def test_table_chunker_registered():
+    """Test that the factory knows the table chunker."""
+    chunker = ChunkerFactory.get_chunker("table", chunk_size=100, chunk_overlap=0)
+    assert isinstance(chunker, TableChunker)
+
+def test_table_chunker_keeps_small_table_together():
+    """Test that a table fitting into one chunk is not split."""
+    chunker = TableChunker(chunk_size=2000, chunk_overlap=0)
+    doc = _make_document("Annual figures below.\n\nTables:\n" + TABLE + "\n\nEnd of report.")
+
+    chunks = chunker.chunk(doc)
+    table_chunks = [c for c in chunks if c.metadata["chunk_type"] == "table"]
+
+    assert len(table_chunks) == 1
+    assert table_chunks[0].content == "Tables:\n" + TABLE
+    assert table_chunks[0].metadata["table_caption"] == "Tables:"
+    assert table_chunks[0].metadata["table_row_count"] == 20
+    assert all(isinstance(chunk, Chunk) for chunk in chunks)
+    assert [c.metadata["chunk_index"] for c in chunks] == list(range(len(chunks)))
+
+def test_table_chunker_repeats_header_in_row_groups():
+    """Test that large tables are split by rows with the header repeated."""
+    chunker = TableChunker(chunk_size=80, chunk_overlap=0)
+    doc = _make_document(TABLE)
+
+    chunks = chunker.chunk(doc)
+
+    assert len(chunks) > 1
+    rows = []
+    for chunk in chunks:
+        lines = chunk.content.splitlines()
+        assert lines[0] == "| Year | Revenue |"
+        assert lines[1] == "| --- | --- |"
+        assert len(lines) > 2
+        rows.extend(lines[2:])
+        assert chunk.metadata["table_parts"] == len(chunks)
+    assert rows == TABLE.splitlines()[2:]
+    assert chunks[0].metadata["table_row_start"] == 1
+    assert chunks[-1].metadata["table_row_end"] == 20
+
+def test_table_chunker_offsets_point_into_document():
+    """Test that text and table chunk offsets map back to the source content."""
+    text = "Some introduction text. " * 5
+    doc = _make_document(text + "\n" + TABLE + "\n" + text)
+    chunker = TableChunker(chunk_size=1000, chunk_overlap=0)
+
+    chunks = chunker.chunk(doc)
+
+    assert [c.metadata["chunk_type"] for c in chunks] == ["text", "table", "text"]
+    for chunk in chunks:
+        start, end = chunk.metadata["start_index"], chunk.metadata["end_index"]
+        assert doc.content[start:end].strip() == chunk.content.strip()
+
+def test_table_chunker_without_tables():
+    """Test that documents without tables fall back to the text chunker."""
+    chunker = TableChunker(chunk_size=50, chunk_overlap=0)
+    doc = _make_document("No tables | here, just a pipe in text. " * 4)
+
+    chunks = chunker.chunk(doc)
+
+    assert len(chunks) > 1
+    assert all(c.metadata["chunk_type"] == "text" for c in chunks)
@@ -0,0 +1,130 @@
+import io
+import json
+
+import pytest
+
+from rag.core import tracing
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    yield
+    tracing.shutdown()
+
+class _Collector:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+def test_disabled_tracing_is_a_shared_noop():
+    """Test that spans cost no allocation while no exporter is configured."""
+    assert not tracing.enabled()
+    first = tracing.span("embed", top_k=5)
+    with first as span:
+        span.set_attribute("results", 3)
+
+    assert tracing.span("search") is first
+    tracing.record_span("llm.first_token", 0.0)
+
+def test_spans_nest_and_export():
+    """Test parent links, attributes, errors and caller-measured spans."""
+    collector = tracing.add_exporter(_Collector())
+
+    with tracing.span("query", model="fake") as root:
+        with tracing.span("embed"):
+            pass
+        with pytest.raises(ValueError):
+            with tracing.span("search"):
+                raise ValueError("no index")
+        tracing.record_span("llm.first_token", 0.0, 0.25)
+
+    spans = {span.name: span for span in collector.spans}
+    names = [span.name for span in collector.spans]
+    assert names == ["embed", "search", "llm.first_token", "query"]
+    assert all(span.parent_id == root.span_id for name, span in spans.items() if name != "query")
+    assert {span.trace_id for span in collector.spans} == {root.span_id}
+    assert spans["search"].attributes == {"error": "ValueError"}
+    assert spans["llm.first_token"].duration == pytest.approx(0.25)
+    assert spans["query"].duration >= spans["embed"].duration
+
+def test_console_and_json_exporters(tmp_path):
+    """Test the tree printed per trace and the JSON lines per span."""
+    stream = io.StringIO()
+    tracing.add_exporter(tracing.ConsoleExporter(stream))
+    path = tmp_path / "trace.jsonl"
+    tracing.configure(f"json:{path}")
+
+    with tracing.span("query"):
+        with tracing.span("search", top_k=3):
+            pass
+    tracing.shutdown()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith("query") and lines[1].startswith("  search")
+    assert "top_k=3" in lines[1]
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["name"] for record in records] == ["search", "query"]
+    assert records[0]["parent_id"] == records[1]["span_id"]
+    with pytest.raises(ValueError):
+        tracing.configure("zipkin")
+
+def test_opentelemetry_exporter():
+    """Test that traces are re-created with OpenTelemetry parents and timestamps."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    memory = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    tracing.add_exporter(tracing.OpenTelemetryExporter(provider.get_tracer("test")))
+
+    with tracing.span("query"):
+        with tracing.span("embed", texts=1):
+            pass
+
+    spans = {span.name: span for span in memory.get_finished_spans()}
+    assert set(spans) == {"query", "embed"}
+    assert spans["embed"].parent.span_id == spans["query"].context.span_id
+    assert spans["embed"].attributes["texts"] == 1
+    embed, query = spans["embed"], spans["query"]
+    assert query.start_time <= embed.start_time <= embed.end_time <= query.end_time
+
+def test_latency_histograms_render_prometheus():
+    """Test cumulative buckets, sums and counts per span name."""
+    histograms = tracing.LatencyHistograms(buckets=[0.1, 1.0])
+    for seconds in (0.05, 0.5, 5.0):
+        histograms.observe("llm.total", seconds)
+
+    text = histograms.render()
+
+    assert 'rag_span_duration_seconds_bucket{span="llm.total",le="0.1"} 1' in text
+    assert 'rag_span_duration_seconds_bucket{span="llm.total",le="1"} 2' in text
+    assert 'rag_span_duration_seconds_bucket{span="llm.total",le="+Inf"} 3' in text
+    assert 'rag_span_duration_seconds_count{span="llm.total"} 3' in text
+    assert histograms.snapshot()["llm.total"]["sum"] == pytest.approx(5.55)
+
+def test_llm_client_traces_prompt_and_first_token(monkeypatch):
+    """Test that a traced answer is streamed to time its first token."""
+    from langchain.schema import Document
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    from rag.llm.llm_client import LLMClient
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    client = LLMClient(model_name="gpt-4o-mini")
+    client.model = FakeListChatModel(responses=["Cats eat fish."])
+    docs = [Document(page_content="Cats like fish.", metadata={"source": "cats.md"})]
+    assert client.generate_answer("What do cats eat?", docs)["answer"] == "Cats eat fish."
+
+    collector = tracing.add_exporter(_Collector())
+    response = client.generate_answer("What do cats eat?", docs)
+
+    assert response == {"answer": "Cats eat fish.", "sources": ["cats.md"]}
+    spans = {span.name: span for span in collector.spans}
+    assert set(spans) == {"prompt_build", "llm.first_token", "llm.total"}
+    assert spans["llm.first_token"].parent_id == spans["llm.total"].span_id
+    assert spans["llm.first_token"].duration <= spans["llm.total"].duration
@@ -0,0 +1,107 @@
+import pickle
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from rag.llm import vision_model as vision_module
+from rag.llm.vision_model import VisionMetrics, VisionModel, get_vision_model
+
+
+class _FakeCompletion:
+    """Stand-in for litellm.completion that records clients and concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.clients = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, model, messages, max_tokens, temperature, client=None):
+        with self._lock:
+            self.clients.append(client)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        url = messages[1]["content"][1]["image_url"]["url"]
+        message = SimpleNamespace(content=f"description of {len(url)} bytes")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+@pytest.fixture
+def fake_completion(monkeypatch):
+    fake = _FakeCompletion()
+    monkeypatch.setattr(vision_module, "completion", fake)
+    monkeypatch.setattr(vision_module, "_VISION_MODELS", {})
+    return fake
+
+def test_vision_model_reuses_pooled_client(fake_completion):
+    """Test that every call goes through the same pooled OpenAI client."""
+    vision_model = VisionModel(api_key="test", model_name="gpt-4.1-nano", max_connections=3)
+
+    vision_model.describe_image(Image.new("RGB", (64, 64)))
+    vision_model.describe_image(Image.new("RGB", (32, 32)))
+
+    first, second = fake_completion.clients
+    assert first is not None and first is second
+    assert first._client._transport._pool._max_connections == 3
+    vision_model.close()
+
+def test_vision_model_without_pool_for_other_providers(fake_completion):
+    """Test that non-OpenAI models leave client handling to litellm."""
+    vision_model = VisionModel(api_key="test", model_name="anthropic/claude-3-haiku-20240307")
+
+    vision_model.describe_image(Image.new("RGB", (64, 64)))
+
+    assert fake_completion.clients == [None]
+
+def test_describe_images_concurrent_and_ordered(fake_completion):
+    """Test that image requests run concurrently, bounded by the pool size."""
+    vision_model = VisionModel(api_key="test", model_name="gpt-4.1-nano", max_connections=2)
+    images = [Image.new("RGB", (size, size)) for size in (16, 32, 64, 128, 256)]
+
+    descriptions = vision_model.describe_images(images)
+
+    assert descriptions == [vision_model.describe_image(image) for image in images]
+    assert fake_completion.max_active == 2
+    summary = vision_model.metrics.summary()
+    assert summary["calls"] == 10
+    assert summary["errors"] == 0
+    assert summary["p50_seconds"] >= fake_completion.delay
+
+def test_describe_images_records_failures(fake_completion, monkeypatch):
+    """Test that failed calls yield empty descriptions and count as errors."""
+    vision_model = VisionModel(api_key="test", model_name="gpt-4.1-nano")
+    monkeypatch.setattr(vision_module, "completion", lambda **kwargs: 1 / 0)
+
+    assert vision_model.describe_images([Image.new("RGB", (8, 8))]) == [""]
+    assert vision_model.metrics.summary()["errors"] == 1
+
+def test_get_vision_model_is_process_wide(fake_completion):
+    """Test that the pool returns one instance per configuration, also when unpickled."""
+    options = {"api_key": "test", "model_name": "gpt-4.1-nano"}
+    vision_model = get_vision_model(max_tokens=300, **options)
+
+    assert get_vision_model(max_tokens=300, **options) is vision_model
+    assert get_vision_model(max_tokens=100, **options) is not vision_model
+    # Worker processes receive the pooled instance of their own process
+    vision_model._get_client()
+    assert pickle.loads(pickle.dumps(vision_model)) is vision_model
+
+def test_vision_metrics_summary():
+    """Test the latency percentiles."""
+    metrics = VisionMetrics()
+    for seconds in (0.1, 0.2, 0.3, 0.4, 1.0):
+        metrics.record(seconds)
+    metrics.record(2.0, error=True)
+
+    summary = metrics.summary()
+
+    assert summary["calls"] == 6
+    assert summary["errors"] == 1
+    assert summary["p50_seconds"] == 0.3
+    assert summary["max_seconds"] == 2.0